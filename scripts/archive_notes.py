@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Move finished notes to 99_Archive/<year>/ as 99_Archive/_archive-workflow.md describes."""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import fill_empty_files as fill
+from frontmatter_index import FrontmatterIndex, header_lines
+from link_graph import LinkIndex, relink, tree_of, vault_trees
+
+ARCHIVE_DIR = '99_Archive'
+# Notes under any of these folders never move: archived ones already sit where they belong,
+# system notes document the workflow and templates show `done` as an example. Matched per
+# path segment, so Sample2025YK/99_Archive/ counts as well.
+EXCLUDED_DIRS = frozenset({ARCHIVE_DIR, '07_System', '06_Templates'})
+DONE_TAG = 'done'
+
+
+@dataclass
+class ArchiveMove:
+    source: str
+    target: str
+
+
+def find_candidates(index: FrontmatterIndex) -> List[str]:
+    # Tagged done, or marked status: done, and outside the archive, system and template folders.
+    rows = index.equals('tags', DONE_TAG) | index.equals('status', DONE_TAG)
+    return sorted(
+        path for path in (index.paths[row] for row in rows) if EXCLUDED_DIRS.isdisjoint(path.split('/')[:-1])
+    )
+
+
+def plan_moves(
+    candidates: List[str],
+    today: date,
+    root: Path = fill.BASE_DIR,
+    trees: Optional[Set[str]] = None,
+) -> Tuple[List[ArchiveMove], List[str]]:
+    # A note in a nested vault (trees, from link_graph.vault_trees) goes to that vault's archive.
+    trees = trees or set()
+    moves: List[ArchiveMove] = []
+    conflicts: List[str] = []
+    taken = set()
+    for rel in candidates:
+        target = f'{tree_of(rel, trees)}{ARCHIVE_DIR}/{today:%Y}/{rel.rpartition("/")[2]}'
+        if target in taken or (root / target).exists():
+            conflicts.append(f"Failed {rel}: {target} already exists")
+            continue
+        taken.add(target)
+        moves.append(ArchiveMove(rel, target))
+    return moves, conflicts
+
+
+def patch_header(path: Path, fields: Dict[str, str]) -> bool:
+    """Add frontmatter fields the note does not set yet, copying the body bytes through untouched.
+
+    Existing values win, so a resumed run keeps the original archive date. Returns False when
+    there was nothing to add and the file was left alone.
+    """
+    with open(path, 'rb') as source:
+        lines = header_lines(source)
+        body_start = source.tell() if lines else 0
+        newline = b'\r\n' if lines and lines[0].endswith(b'\r\n') else b'\n'
+        if not lines:
+            lines = [b'---' + newline, b'---' + newline]
+        present = {line.split(b':', 1)[0].strip() for line in lines[1:-1] if b':' in line and not line[:1].isspace()}
+        pending = {key: value for key, value in fields.items() if key.encode('utf-8') not in present}
+        if not pending:
+            return False
+        header = lines[:-1] + [f'{key}: {value}'.encode('utf-8') + newline for key, value in pending.items()]
+        header.append(lines[-1])
+        mode = stat.S_IMODE(os.fstat(source.fileno()).st_mode)
+        fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.writelines(header)
+                source.seek(body_start)
+                shutil.copyfileobj(source, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+    return True
+
+
+def archive(
+    today: date,
+    writer: fill.NoteWriter,
+    notes: Optional[List[fill.NoteStat]] = None,
+    root: Path = fill.BASE_DIR,
+    dry_run: bool = False,
+) -> Tuple[List[ArchiveMove], List[str], List[str]]:
+    """Archive every candidate in one pass: patch, move, then fix links vault-wide.
+
+    Returns the moves made (or planned, with dry_run), the notes whose links were rewritten
+    and failures.
+    """
+    if notes is None:
+        notes = list(fill.iter_notes(root))
+    headers = FrontmatterIndex(root)
+    headers.update(notes)
+    moves, failures = plan_moves(find_candidates(headers), today, root, vault_trees(headers.paths))
+    if dry_run or not moves:
+        headers.save()
+        return moves, [], failures
+    links = LinkIndex(root)
+    links.update(notes)
+    fill.make_dirs({(root / move.target).parent for move in moves}, root)
+    fields = {'archived': 'true', 'archived_on': today.isoformat()}
+    done: List[ArchiveMove] = []
+    for move in moves:
+        # Patched where it is first: a crash in between leaves an archived note that the
+        # next run still finds (it is outside 99_Archive) and only moves.
+        try:
+            patch_header(root / move.source, fields)
+            writer.rename(root / move.source, root / move.target)
+        except OSError as exc:
+            failures.append(f"Failed {move.source}: {exc}")
+            continue
+        done.append(move)
+    moved = {move.source: move.target for move in done}
+    rewritten = relink(links, moved, writer)
+    # Sources that failed to move may still have been patched, so they are re-statted too.
+    changed = [move.source for move in moves] + list(moved.values()) + rewritten
+    listing = fill.update_listing(notes, changed, moved, root)
+    links.update(listing)
+    links.save()
+    headers.update(listing)
+    headers.save()
+    return done, rewritten, failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--today',
+        type=date.fromisoformat,
+        default=date.today(),
+        metavar='YYYY-MM-DD',
+        help='archive date recorded in the notes and year of the archive folder (default: today)',
+    )
+    parser.add_argument('--dry-run', action='store_true', help='list the notes that would move without moving them')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per note')
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    writer = fill.NoteWriter(batch_fsync=True)
+    moves, rewritten, failures = archive(args.today, writer, dry_run=args.dry_run)
+    writer.flush()
+    elapsed = (time.perf_counter() - started) * 1000
+    for move in moves:
+        if args.json:
+            print(json.dumps(move.__dict__, ensure_ascii=False))
+        else:
+            print(f"{'Would archive' if args.dry_run else 'Archived'} {move.source} -> {move.target}")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    print(
+        f"Archived {0 if args.dry_run else len(moves)} notes, rewrote links in {len(rewritten)} notes, "
+        f"{len(failures)} failed ({elapsed:.1f} ms)",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
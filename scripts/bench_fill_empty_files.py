@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Benchmark fill_empty_files.py stage by stage over synthetic vaults of increasing size."""
+from __future__ import annotations
+
+import argparse
+import compileall
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import fill_empty_files as fill
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_BASELINE = fill.BASE_DIR / '.cache' / 'bench_fill_empty_files.json'
+STAGES = ('scan', 'route', 'render', 'write')
+IMPORT_STAGES = ('import', 'catalog')
+MEMORY_STAGES = ('legacy_kib', 'current_kib')
+STAGE_GROUPS = {'startup': IMPORT_STAGES, 'memory': MEMORY_STAGES}
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+started = time.perf_counter()
+import fill_empty_files
+imported = time.perf_counter()
+fill_empty_files.load_token_catalog()
+loaded = time.perf_counter()
+print(imported - started, loaded - imported)
+"""
+MEMORY_PROBE = """
+import sys
+sys.path.insert(0, sys.argv[1])
+import bench_fill_empty_files as bench
+print(bench._retained_kib(bench.CATALOG_LAYOUTS[sys.argv[2]]))
+"""
+MEMORY_SUBFOLDERS = ('Concepts', 'Tools', 'Techniques', 'Notes')
+NOISE_NOTE = '# note\n\n- [ ] task\n'
+
+
+def _fixed_notes() -> List[str]:
+    # Generators backed by fixed tables only accept their known paths, so each appears once.
+    rels = [f'06_Templates/{key}' for key in fill.TEMPLATES]
+    rels += [f'05_Output/Projects/{key}' for key in fill.PROJECT_NOTES]
+    rels += [f'05_Output/Areas/Personal/{key}' for key in fill.AREA_PERSONAL_NOTES]
+    rels += [f'05_Output/Areas/Content-Creation/{key}' for key in fill.AREA_CONTENT_CREATION_NOTES]
+    rels += [f'05_Output/Areas/Business/{key}' for key in fill.AREA_BUSINESS_NOTES]
+    rels += [
+        f'07_System/Dashboards/{name}.md'
+        for name in ('🏠-HOME', '📊-Weekly-Dashboard', '📈-Analytics-Dashboard', '🎯-Projects-Dashboard', '🔥-Active-Focus')
+    ]
+    rels += ['99_Archive/_archive-workflow.md', '04_Memory/_Master-Index.md']
+    rels += [f'04_Memory/{category}/_{category}-MOC.md' for category in fill.MEMORY_BASE_POINTS]
+    return rels
+
+
+def _weekly_reviews(count: int) -> List[str]:
+    return [
+        f'02_Daily/Weekly-Reviews/{2000 + idx // 52}/{2000 + idx // 52}-W{idx % 52 + 1:02d}.md'
+        for idx in range(count)
+    ]
+
+
+def _monthly_reviews(count: int) -> List[str]:
+    return [
+        f'02_Daily/Monthly-Reviews/{2000 + idx // 12}/{2000 + idx // 12}-{idx % 12 + 1:02d}.md'
+        for idx in range(count)
+    ]
+
+
+def _memory_notes(count: int) -> List[str]:
+    tokens = sorted(fill.TOKEN_INFO)
+    categories = list(fill.MEMORY_BASE_POINTS)
+    rels = []
+    for idx in range(count):
+        category = categories[idx % len(categories)]
+        folder = MEMORY_SUBFOLDERS[(idx // len(categories)) % len(MEMORY_SUBFOLDERS)]
+        slug = f'{tokens[idx % len(tokens)]}-{tokens[(idx * 7) % len(tokens)]}-{idx}'
+        rels.append(f'04_Memory/{category}/{folder}/{slug}.md')
+    return rels
+
+
+def synthetic_layout(size: int) -> List[str]:
+    fixed = _fixed_notes()[: size // 10]
+    weekly = _weekly_reviews(size * 3 // 10)
+    monthly = _monthly_reviews(size // 10)
+    memory = _memory_notes(size - len(fixed) - len(weekly) - len(monthly))
+    return fixed + weekly + monthly + memory
+
+
+def build_vault(root: Path, size: int) -> None:
+    created = set()
+    for rel in synthetic_layout(size):
+        path = root / rel
+        if path.parent not in created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created.add(path.parent)
+        path.touch()
+    # Non-candidates the scanner has to walk past or prune: filled daily notes and plugin bundles.
+    day = date(2025, 1, 1)
+    for idx in range(size // 2):
+        current = day + timedelta(days=idx // 2)
+        folder = root / '02_Daily' / f'{current:%Y}' / f'{current:%Y-%m}' / f'{current:%Y-%m-%d}'
+        folder.mkdir(parents=True, exist_ok=True)
+        kind = 'Daily' if idx % 2 == 0 else 'TODO'
+        (folder / f'{current:%Y-%m-%d}-{kind}.md').write_text(NOISE_NOTE, encoding='utf-8')
+    plugins = root / '.obsidian' / 'plugins'
+    for idx in range(max(1, size // 100)):
+        plugin = plugins / f'plugin-{idx}'
+        plugin.mkdir(parents=True, exist_ok=True)
+        (plugin / 'main.js').write_text('', encoding='utf-8')
+
+
+def run_size(size: int, batch_fsync: bool) -> Dict[str, float]:
+    timings = dict.fromkeys(STAGES, 0.0)
+    original_base = fill.BASE_DIR
+    with tempfile.TemporaryDirectory(prefix='fill-bench-') as tmp:
+        root = Path(tmp)
+        build_vault(root, size)
+        fill.BASE_DIR = root  # generators resolve paths relative to the vault root
+        try:
+            started = time.perf_counter()
+            paths = list(fill.iter_empty_files(root))
+            timings['scan'] = time.perf_counter() - started
+            writer = fill.NoteWriter(batch_fsync=batch_fsync)
+            for path in paths:
+                started = time.perf_counter()
+                generator = fill.ROUTER.resolve(path.relative_to(root).as_posix())
+                routed = time.perf_counter()
+                content = generator(path)
+                rendered = time.perf_counter()
+                writer.write(path, content)
+                written = time.perf_counter()
+                timings['route'] += routed - started
+                timings['render'] += rendered - routed
+                timings['write'] += written - rendered
+            started = time.perf_counter()
+            writer.flush()
+            timings['write'] += time.perf_counter() - started
+        finally:
+            fill.BASE_DIR = original_base
+    timings['files'] = len(paths)
+    return timings
+
+
+def measure_import(runs: int) -> Dict[str, float]:
+    # Cold start as cron and editor hooks see it: a fresh interpreter with bytecode already compiled.
+    scripts_dir = Path(fill.__file__).parent
+    compileall.compile_dir(scripts_dir, quiet=1)
+    env = {key: value for key, value in os.environ.items() if key != 'PYTHONDONTWRITEBYTECODE'}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE, os.fspath(scripts_dir)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+        samples.append([float(value) for value in output.split()])
+    return {
+        'import': statistics.median(sample[0] for sample in samples),
+        'catalog': statistics.median(sample[1] for sample in samples),
+    }
+
+
+@dataclass
+class LegacyTokenInfo:
+    # The pre-slots TokenInfo layout, kept only as the memory baseline.
+    summary: str
+    points: List[str]
+    actions: List[str]
+
+
+def _legacy_catalog(raw: Dict) -> tuple:
+    return raw['translations'], {token: LegacyTokenInfo(**entry) for token, entry in raw['info'].items()}
+
+
+def _retained_kib(build) -> float:
+    # Bytes still allocated once the catalog is built and the parsed JSON is garbage.
+    source = fill.CATALOG_PATH.read_bytes()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        catalog = build(json.loads(source))
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del catalog
+    return retained / 1024
+
+
+CATALOG_LAYOUTS = {'legacy_kib': _legacy_catalog, 'current_kib': fill._build_token_catalog}
+
+
+def measure_catalog_memory() -> Dict[str, float]:
+    # One fresh interpreter per layout: interning in this process would hide the strings' cost.
+    scripts_dir = os.fspath(Path(fill.__file__).parent)
+    return {
+        stage: float(subprocess.run(
+            [sys.executable, '-c', MEMORY_PROBE, scripts_dir, stage],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout)
+        for stage in MEMORY_STAGES
+    }
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> int:
+    regressions = 0
+    print(f"{'size':>8} {'stage':<11} {'value':>10} {'baseline':>10} {'change':>8}")
+    for size, timings in current.items():
+        previous = baseline.get(size)
+        for stage in STAGE_GROUPS.get(size, STAGES):
+            if previous is None or not previous.get(stage):
+                print(f"{size:>8} {stage:<11} {timings[stage]:>10.4f} {'-':>10} {'-':>8}")
+                continue
+            change = timings[stage] / previous[stage] - 1
+            flag = '  REGRESSION' if change > tolerance else ''
+            regressions += bool(flag)
+            print(f"{size:>8} {stage:<11} {timings[stage]:>10.4f} {previous[stage]:>10.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='comma-separated zero-length file counts, up to 100000 (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help='baseline JSON to compare against (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='overwrite the baseline with the results of this run',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='relative slowdown per stage reported as a regression (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--batch-fsync',
+        action='store_true',
+        help='write with per-directory batched fsyncs, as fill_empty_files.py --batch-fsync does',
+    )
+    parser.add_argument(
+        '--import-runs',
+        type=int,
+        default=10,
+        metavar='N',
+        help='fresh interpreters used to time module import and catalog load; 0 skips (default: %(default)s)',
+    )
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = {str(size): run_size(size, args.batch_fsync) for size in sizes}
+    if args.import_runs:
+        results['startup'] = measure_import(args.import_runs)
+    results['memory'] = measure_catalog_memory()
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))['sizes']
+    except FileNotFoundError:
+        baseline = {}
+    regressions = compare(results, baseline, args.tolerance)
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'python': platform.python_version(), 'sizes': results}
+        args.baseline.write_text(json.dumps(payload, indent=2) + '\n', encoding='utf-8')
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -2,28 +2,46 @@
 """Populate all zero-length markdown files with Japanese content appropriate to their role."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+from bisect import insort
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
+import errno
 from pathlib import Path
+import hashlib
+import json
+import marshal
+import math
+import os
 import re
+import stat
+import sys
+import tempfile
 from textwrap import dedent
-from typing import Callable, Dict, List
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 
 
-@dataclass
+@dataclass(frozen=True)
 class TokenInfo:
+    # Slotted and immutable: the catalog lives for the whole process in long-running watchers.
+    __slots__ = ('summary', 'points', 'actions')
     summary: str
-    points: List[str]
-    actions: List[str]
+    points: Tuple[str, ...]
+    actions: Tuple[str, ...]
 
 
 def slug_to_title(slug: str) -> str:
     tokens = [t for t in slug.replace('_', '-').split('-') if t]
+    translations = token_translations()
     mapped: List[str] = []
     for token in tokens:
-        mapped.append(TOKEN_TRANSLATIONS.get(token.lower(), token.capitalize()))
+        mapped.append(translations.get(token.lower(), token.capitalize()))
     return ''.join(mapped) if mapped else slug
 
 
@@ -35,1119 +53,1483 @@ def format_block(text: str) -> str:
     return dedent(text).strip() + '\n'
 
 
-TOKEN_TRANSLATIONS: Dict[str, str] = {
-    '2025': '2025',
-    '00': '00',
-    '01': '01',
-    '02': '02',
-    '03': '03',
-    '04': '04',
-    '05': '05',
-    'w01': 'W01',
-    'w02': 'W02',
-    'home': 'HOME',
-    'weekly': 'Weekly',
-    'analytics': 'Analytics',
-    'projects': 'Projects',
-    'focus': 'Focus',
-    'master': 'Master',
-    'index': 'Index',
-    'personal': 'Personal',
-    'health': 'Health',
-    'stress': 'ストレス',
-    'management': 'マネジメント',
-    'exercise': 'エクササイズ',
-    'routines': 'ルーティン',
-    'parenting': '子育て',
-    'philosophy': '方針',
-    'child': '子ども',
-    'development': '成長',
-    'balance': 'バランス',
-    'work': 'ワーク',
-    'family': 'ファミリー',
-    'productivity': '生産性',
-    'wave': '波',
-    'pattern': 'パターン',
-    'optimization': '最適化',
-    'energy': 'エネルギー',
-    'focus': '集中',
-    'time': 'タイム',
-    'education': 'Education',
-    'pedagogy': '教育学',
-    'active': 'アクティブ',
-    'learning': 'ラーニング',
-    'feedback': 'フィードバック',
-    'adult': '成人',
-    'curriculum': 'カリキュラム',
-    'design': 'デザイン',
-    'assessment': '評価',
-    'teaching': 'Teaching',
-    'techniques': 'Techniques',
-    'storytelling': 'ストーリーテリング',
-    'metaphor': 'メタファー',
-    'usage': '活用',
-    'live': 'ライブ',
-    'coding': 'コーディング',
-    'business': 'Business',
-    'sales': 'Sales',
-    'pricing': 'プライシング',
-    'strategy': '戦略',
-    'consultative': 'コンサルティブ',
-    'community': 'コミュニティ',
-    'building': '構築',
-    'member': 'メンバー',
-    'retention': '維持',
-    'event': 'イベント',
-    'operations': 'Operations',
-    'workflow': 'ワークフロー',
-    'automation': '自動化',
-    'marketing': 'Marketing',
-    'social': 'ソーシャル',
-    'media': 'メディア',
-    'positioning': 'ポジショニング',
-    'funnel': 'ファネル',
-    'content': 'コンテンツ',
-    'ai': 'AI',
-    'tools': 'Tools',
-    'cursor': 'Cursor',
-    'shortcuts': 'ショートカット',
-    'basics': '基礎',
-    'advanced': '上級',
-    'tips': 'Tips',
-    'troubleshooting': 'トラブルシュート',
-    'claude': 'Claude',
-    'api': 'API',
-    'guide': 'ガイド',
-    'projects': 'Projects',
-    'prompting': 'プロンプト',
-    'windsurf': 'Windsurf',
-    'bolt': 'Bolt',
-    'new': 'New',
-    'v0': 'v0',
-    'dev': 'Dev',
-    'dify': 'Dify',
-    'concepts': 'Concepts',
-    'llm': 'LLM',
-    'fundamentals': '基礎',
-    'transformer': 'Transformer',
-    'architecture': 'アーキテクチャ',
-    'safety': 'セーフティ',
-    'prompt': 'Prompt',
-    'examples': 'Examples',
-    'explanation': 'Explanation',
-    'debugging': 'Debugging',
-    'code': 'コード',
-    'generation': '生成',
-    'patterns': 'パターン',
-    'promptops': 'PromptOps',
-    'rag': 'RAG',
-    'vector': 'ベクター',
-    'database': 'データベース',
-    'chunking': 'チャンク化',
-    'multi': 'マルチ',
-    'agent': 'エージェント',
-    'systems': 'システム',
-    'devops': 'DevOps',
-    'deployment': 'デプロイ',
-    'docker': 'Docker',
-    'ci': 'CI',
-    'cd': 'CD',
-    'scalability': 'スケーラビリティ',
-    'system': 'システム',
-    'patterns': 'パターン',
-    'programming': 'Programming',
-    'python': 'Python',
-    'data': 'データ',
-    'structures': '構造',
-    'best': 'ベスト',
-    'practices': 'プラクティス',
-    'typescript': 'TypeScript',
-    'next.js': 'Next.js',
-    'javascript': 'JavaScript',
-    'async': '非同期',
-    'modern': 'モダン',
-    'react': 'React',
-    'input': 'Input',
-    'reference': 'リファレンス',
-    'templates': 'テンプレート',
-    'meeting': 'Meeting',
-    'knowledge': 'Knowledge',
-    'archive': 'Archive',
-    'areas': 'Areas',
-    'projects': 'Projects',
-}
-
-
-TOKEN_INFO: Dict[str, TokenInfo] = {
-    'stress': TokenInfo(
-        summary="ストレス反応を定量化し、交感神経の過剰な昂りを抑える。",
-        points=[
-            "トリガーを『環境』『人』『思考』に分類してジャーナル化すると原因の傾向が見える。",
-            "アラートを感じたらボックスブリージングで心拍を整え、視野を広げる。",
-        ],
-        actions=[
-            "1日3回のマイクロチェックインで体調、感情、集中度を10段階でメモする。",
-            "週末にストレスログを見返し、手放したい案件や会議を一つ選んで減らす。",
-        ],
-    ),
-    'exercise': TokenInfo(
-        summary="運動習慣を有酸素・筋力・柔軟の3軸で設計し、疲労の蓄積を防ぐ。",
-        points=[
-            "月曜は低負荷の全身サーキット、水曜はHIIT、金曜は長めの散歩でリズムを作る。",
-            "フォームを動画で記録し、2週に一度リプレイして改善点を洗い出す。",
-        ],
-        actions=[
-            "Apple WatchのムーブリングをSlackに自動投稿して可視化する。",
-            "筋トレ日はタンパク質1.6g/kgを意識し、食事ログに補食も含めて記録する。",
-        ],
-    ),
-    'parenting': TokenInfo(
-        summary="子育ての価値観を言語化し、家族全員が安心できるガイドラインを整える。",
-        points=[
-            "行動ではなく感情を認める声かけを最優先し、自己肯定感を支える。",
-            "週1回のファミリーミーティングで予定と気持ちを共有する。",
-        ],
-        actions=[
-            "シーズンごとに『家族の合言葉』を決め、家のホワイトボードに貼る。",
-            "学びたいテーマは親も一緒に調べ、好奇心の連鎖を体験させる。",
-        ],
-    ),
-    'child': TokenInfo(
-        summary="発達段階ごとの興味と成長サインを把握し、声かけを最適化する。",
-        points=[
-            "月齢ごとのできごとを『身体・知性・感情』で記録すると変化が捉えやすい。",
-            "非認知能力は小さな成功体験を一緒に振り返ることで強化できる。",
-        ],
-        actions=[
-            "観察ログに『発言』『環境』『気づき』の3列を用意し、日付タグで並べる。",
-            "保育園や学校からの連絡を週次レビューに転記し、家庭でのフォローを決める。",
-        ],
-    ),
-    'balance': TokenInfo(
-        summary="ワークとファミリーの接点を構造化し、罪悪感なく切り替えられるようにする。",
-        points=[
-            "日中は深い集中時間を守り、夕方以降は家族モードに入るスイッチ儀式を作る。",
-            "家族イベントは四半期ごとに先にカレンダーへブロックし、仕事を後から調整する。",
-        ],
-        actions=[
-            "夫婦のタスクボードを共有し、お互いの負荷を見える化する。",
-            "祝いや行事の準備タスクリストをテンプレ化し、直前のバタつきを減らす。",
-        ],
-    ),
-    'wave': TokenInfo(
-        summary="1日のエネルギー波形を捉え、クリエイティブとルーチンを最適に配分する。",
-        points=[
-            "起床から4時間は発散→収束→発散のサイクルを意識すると思考が途切れにくい。",
-            "15時以降は意思決定よりレビューや資料整理を入れ、決断疲れを防ぐ。",
-        ],
-        actions=[
-            "Notionデータベースに時間帯×集中度を記録し、ヒートマップで可視化する。",
-            "前夜に『最高の朝』ルーティンを書き出し、起床後の迷いをなくす。",
-        ],
-    ),
-    'energy': TokenInfo(
-        summary="身体・感情・認知のエネルギー残量を分けて管理し、燃え尽きを回避する。",
-        points=[
-            "食事と睡眠の質をタグ付けして関連性を確認すると調整ポイントが見つかる。",
-            "週に一度「エネルギーを奪う物事」を棚卸しし、手放す判断を入れる。",
-        ],
-        actions=[
-            "水分・カフェイン摂取をショートカットキーで即記録できるようにする。",
-            "季節ごとにサプリや運動メニューを見直し、身体負荷を平準化する。",
-        ],
-    ),
-    'focus': TokenInfo(
-        summary="集中リソースを守り、ディープワーク時間を戦略的に確保する。",
-        points=[
-            "午前は90分ブロック×2を死守し、午後はインタラクション中心に組む。",
-            "環境トリガー（音・光・椅子）を整えるだけで集中率が15%以上向上する。",
-        ],
-        actions=[
-            "Noise-cancelling + BGM の組み合わせを3種類用意し、タスクによって切り替える。",
-            "最初の5分で完了イメージを紙に描き、脳内の散漫さを減らす。",
-        ],
-    ),
-    'time': TokenInfo(
-        summary="時間を投資・維持・浪費に仕分けし、価値の高い予定にリソースを集中させる。",
-        points=[
-            "Googleカレンダーを色分けし、可処分時間の残量を常に把握する。",
-            "集中帯に会議が入る場合は理由と期待成果を参加者と共有する。",
-        ],
-        actions=[
-            "週次で『失った時間ログ』を書き、翌週のガードレールを決める。",
-            "定例は四半期ごとに棚卸しし、目的が薄れたものは思い切って終了する。",
-        ],
-    ),
-    'active': TokenInfo(
-        summary="アクティブラーニングの設計では、学習者の行動を最初に定義する。",
-        points=[
-            "知識投入→即実践→振り返りの1サイクルを30分以内で回すと定着率が高まる。",
-            "問いを提示する際は難易度と情緒的ハードルを分けて調整する。",
-        ],
-        actions=[
-            "授業の冒頭に『今日の挑戦』カードを配布し、目的を共有する。",
-            "受講者のアウトプットをMiroボードに集約し、全員で比較できるようにする。",
-        ],
-    ),
-    'feedback': TokenInfo(
-        summary="フィードバックは観察・解釈・提案の3段階で届ける。",
-        points=[
-            "事実と感想を分け、相手の意図を先に確認してから助言する。",
-            "即時フィードバックはモチベ維持に、遅延フィードバックは深い学びに効く。",
-        ],
-        actions=[
-            "SBI（Situation-Behavior-Impact）メモをテンプレ化し、フィードバック前に整理する。",
-            "ポジティブ:改善 = 2:1 の割合を守り、心理的安全性を担保する。",
-        ],
-    ),
-    'adult': TokenInfo(
-        summary="成人学習では内発的動機と即時活用の道筋をセットで提示する。",
-        points=[
-            "経験→概念化→実践→内省のコルブサイクルを1コマ内に収める。",
-            "自己決定感を高めるために小さな選択肢を頻繁に用意する。",
-        ],
-        actions=[
-            "事前アンケートで課題を集め、講義内の事例に反映する。",
-            "学習計画を3週間サイクルで設計し、フォローアップ面談を組み込む。",
-        ],
-    ),
-    'objectives': TokenInfo(
-        summary="学習目標は行動・条件・評価基準の3要素で書くと測定可能になる。",
-        points=[
-            "Bloomのタキソノミーに沿って認知レベルを定義し、教材の粒度を合わせる。",
-            "目標数は1セッションにつき最大3つまでに絞る。",
-        ],
-        actions=[
-            "『誰が・どの状況で・どのレベルまで』を書き切るテンプレを作る。",
-            "目標と評価指標を同じスプレッドシートで管理し、抜け漏れを防ぐ。",
-        ],
-    ),
-    'backward': TokenInfo(
-        summary="バックワードデザインでは成果物から逆算して学習体験を組み立てる。",
-        points=[
-            "終着点を定義→証拠を決める→学習活動を設計するの順番を崩さない。",
-            "評価方法はルーブリックを先に作り、受講者とも共有する。",
-        ],
-        actions=[
-            "成果物のサンプルを早期に見せ、期待値の認識合わせを行う。",
-            "各ステップのToDoをTrelloに登録し、レビュー日を自動通知する。",
-        ],
-    ),
-    'assessment': TokenInfo(
-        summary="評価設計はフォーミング・サマティブ双方の指標を連動させる。",
-        points=[
-            "観察記録、自己評価、ピアレビューを組み合わせると偏りが減る。",
-            "定量評価だけでなくコメント欄を設け、文脈を残す。",
-        ],
-        actions=[
-            "Googleフォームでチェックリスト化し、結果を自動集計する。",
-            "重要指標はシンプルなスコアカードにまとめ、ステークホルダーへ共有する。",
-        ],
-    ),
-    'storytelling': TokenInfo(
-        summary="ストーリーテリングは主人公・葛藤・変化の3要素で構成する。",
-        points=[
-            "導入で課題を提示し、過程で学びを描き、結末で行動変容を示す。",
-            "比喩やデータを織り交ぜると説得力が増す。",
-        ],
-        actions=[
-            "ワークショップではストーリーキャンバスを配布し、参加者に書いてもらう。",
-            "音声収録して声のトーンや間を振り返る。",
-        ],
-    ),
-    'metaphor': TokenInfo(
-        summary="メタファー活用は概念を既知の体験に橋渡しする技術。",
-        points=[
-            "聴衆が既に知っている世界観を例に選ぶと理解が早い。",
-            "1つの説明でメタファーは1種類までに絞る。",
-        ],
-        actions=[
-            "よく使うメタファー集をカテゴリー別に整理し、必要に応じて更新する。",
-            "誤解を招いたメタファーは学習ログに残し、再発を防ぐ。",
-        ],
-    ),
-    'live': TokenInfo(
-        summary="ライブコーディングでは失敗を恐れず、思考の声を実況する。",
-        points=[
-            "事前にコードスニペットを準備し、貼り付け時間を短縮する。",
-            "意図的に軽いエラーを出し、デバッグ手順を見せると理解が進む。",
-        ],
-        actions=[
-            "画面レイアウトを固定し、ズームレベルと配色を参加者に合わせる。",
-            "2台目の端末でチャットを監視し、質問を即拾えるようにする。",
-        ],
-    ),
-    'pricing': TokenInfo(
-        summary="価格戦略は価値指標とコスト構造の両面から検討する。",
-        points=[
-            "アンカー価格・フロントエンド・バックエンドを組み合わせてLTVを最大化する。",
-            "値上げ時はベネフィットの再定義とFAQ更新を同時に行う。",
-        ],
-        actions=[
-            "競合比較シートを作り、価格帯×差別化要素を視覚化する。",
-            "キャンペーン時は利益率シミュレーターで限界点を確認する。",
-        ],
-    ),
-    'consultative': TokenInfo(
-        summary="コンサルティブセリングは課題の共同発見と解決ロードマップの提示が肝。",
-        points=[
-            "診断フェーズではWhyを5回掘り下げ、真因を特定する。",
-            "提案は『現状→障壁→未来像』の順で語ると納得感が高い。",
-        ],
-        actions=[
-            "商談前にクライアントのKPIと政治的状況を整理したブリーフを作成。",
-            "次の打ち合わせまでに小さな成功体験を届け、信頼を積む。",
-        ],
-    ),
-    'member': TokenInfo(
-        summary="メンバー維持は『価値を感じる瞬間』を継続的に提供することが鍵。",
-        points=[
-            "オンボーディング90日間のタッチポイントを設計する。",
-            "休眠サイン（参加率・発言数）を指標化し、早期に声をかける。",
-        ],
-        actions=[
-            "歓迎メッセージの後に『最初の一歩タスク』を案内し、参加障壁を下げる。",
-            "退会理由を定期的に振り返り、プロダクトや運営改善に反映する。",
-        ],
-    ),
-    'event': TokenInfo(
-        summary="イベント設計は体験曲線（期待→参加→余韻）を意識する。",
-        points=[
-            "アジェンダは45分以内に一度休憩やワークを入れて集中を維持する。",
-            "参加後のフォロー資料とアンケートを24時間以内に送る。",
-        ],
-        actions=[
-            "逆算式ガントチャートを作り、Key Milestoneを共有する。",
-            "登壇者の紹介テンプレとチェックリストを用意し、当日の混乱を防ぐ。",
-        ],
-    ),
-    'community': TokenInfo(
-        summary="コミュニティの熱量は目的・儀式・物語の3つで維持できる。",
-        points=[
-            "定期的なハイライト投稿で成功事例を称え、模範行動を示す。",
-            "季節イベントやバッジ制度で帰属意識を高める。",
-        ],
-        actions=[
-            "ロイヤルメンバーと四半期レビューを実施し、改善点を聞き出す。",
-            "貢献度をスコア化し、ニュースレターで感謝を表明する。",
-        ],
-    ),
-    'workflow': TokenInfo(
-        summary="ワークフロー自動化は『繰り返し×エラーが多い』領域から着手する。",
-        points=[
-            "業務フローを泳線図で描き、手作業のボトルネックを特定。",
-            "自動化後も責任者による週次モニタリングを設定する。",
-        ],
-        actions=[
-            "ZapierやMakeのシナリオをリポジトリ化し、再利用できる形にする。",
-            "失敗時のリトライやアラートを事前に設計しておく。",
-        ],
-    ),
-    'automation': TokenInfo(
-        summary="自動化は『例外処理の設計』まで含めて仕上げとする。",
-        points=[
-            "API制限や権限エラーを想定したフォールバック経路を用意する。",
-            "ログをSlackやDataDogに集約し、障害検知を早める。",
-        ],
-        actions=[
-            "Runbookを作成し、誰でも復旧できるようドキュメント化する。",
-            "RPAとiPaaSの適材適所を比較表にまとめる。",
-        ],
-    ),
-    'social': TokenInfo(
-        summary="ソーシャルメディア戦略はペルソナの行動時間とトーンを最適化する。",
-        points=[
-            "プラットフォームごとの目的（認知/信頼/行動）を明確にする。",
-            "投稿は価値提供:自社情報 = 3:1 を維持すると嫌われない。",
-        ],
-        actions=[
-            "1か月分のテーマをバッチ化し、CanvaやFigmaでテンプレート化する。",
-            "反応データを週次でCSVに落とし、学びを次週に反映する。",
-        ],
-    ),
-    'positioning': TokenInfo(
-        summary="ポジショニングは競合マトリクス上で空白を見つけ、強みを尖らせる。",
-        points=[
-            "機能軸だけでなく『世界観』『サポート』『価格柔軟性』で比較する。",
-            "タグラインは顧客の言葉を引用して作ると刺さりやすい。",
-        ],
-        actions=[
-            "競合インサイトノートを毎月更新し、変化を追跡する。",
-            "営業資料に『向いていない顧客』も明記し、信頼を高める。",
-        ],
-    ),
-    'funnel': TokenInfo(
-        summary="ファネル設計は各段階のコンテンツとCTAをセットで定義する。",
-        points=[
-            "TOFU/MOFU/BOFUで提供価値を変え、次のアクションへ自然に誘導する。",
-            "指標は転換率とスピードを同時に追跡する。",
-        ],
-        actions=[
-            "MAツールでセグメントごとのナーチャリングシナリオを構築する。",
-            "離脱ポイントごとに改善仮説をA/Bテストする。",
-        ],
-    ),
-    'content': TokenInfo(
-        summary="コンテンツ戦略はペルソナの課題と検索意図に直結させる。",
-        points=[
-            "1本の記事で伝えるメッセージは1テーマに絞る。",
-            "更新サイクルを決め、陳腐化を防ぐ。",
-        ],
-        actions=[
-            "キーワード×課題のマトリクスを作り、重複を避ける。",
-            "執筆後24時間でセルフレビューし、伝わりづらい箇所を修正する。",
-        ],
-    ),
-    'cursor': TokenInfo(
-        summary="CursorはAIペアプログラミングを活かした高速開発が強み。",
-        points=[
-            "チェットペインで仕様を説明すると関数単位で提案が返ってくる。",
-            "プロジェクトごとにモデル設定を変え、ClaudeとGPTを使い分ける。",
-        ],
-        actions=[
-            "プロンプトをスニペット化し、ショートカットですぐ呼び出せるよう設定する。",
-            "コードリーディング時はフォーカスモードをオンにし、差分だけに集中する。",
-        ],
-    ),
-    'shortcuts': TokenInfo(
-        summary="ショートカット整備は思考のリズムを崩さずに操作できる鍵。",
-        points=[
-            "⌘Pでファイル移動、⇧⌘Kでコマンド検索などよく使う操作を5個に限定して覚える。",
-            "マクロキーにAI呼び出しとコード整形を割り当てるとトグルが減る。",
-        ],
-        actions=[
-            "週1回ショートカットの習熟度を自己採点し、使えていないものを練習する。",
-            "チームでお気に入りショートカットを共有し、知識を蓄積する。",
-        ],
-    ),
-    'basics': TokenInfo(
-        summary="基礎機能を体系的に押さえると応用も楽になる。",
-        points=[
-            "カーソルのパネル構造、AIモード、ターミナル連携を最初に理解する。",
-            "設定同期と環境変数の扱いを覚えておくとプロジェクト移行時に迷わない。",
-        ],
-        actions=[
-            "初学者向けのワークショップを30分で開き、復習としてアウトプットする。",
-            "学んだショートカットや設定をREADMEにまとめ、次回セットアップを短縮する。",
-        ],
-    ),
-    'advanced': TokenInfo(
-        summary="上級テクではマルチファイル編集やエージェント駆動を駆使する。",
-        points=[
-            "DiffビューでAI提案を比較し、採用理由をコメントに残す。",
-            "シナリオフローを設計し、連続した指示で大規模リファクタを実現する。",
-        ],
-        actions=[
-            "プロンプトチェーンをテンプレ化し、似た案件に再利用する。",
-            "クラッシュ時の復元ポイントをこまめに保存する。",
-        ],
-    ),
-    'tips': TokenInfo(
-        summary="Tips集は小さな工夫を素早く参照できるナレッジベース。",
-        points=[
-            "状況別（リファクタ、調査、生成など）にタグ分けすると検索しやすい。",
-            "うまくいかなかった例も並べ、判断材料を残す。",
-        ],
-        actions=[
-            "週末に新しく学んだコマンドを2個追加する。",
-            "Slackチャンネルで共有し、チーム全体の生産性を底上げする。",
-        ],
-    ),
-    'troubleshooting': TokenInfo(
-        summary="トラブルシュートメモは異常兆候→原因→対処を紐づける。",
-        points=[
-            "ログの見方と主要エラーコードをまとめておく。",
-            "再現手順を明記し、検証環境との差分を記録する。",
-        ],
-        actions=[
-            "原因判明後は再発防止策（設定変更や手順）をチームに共有する。",
-            "GitHub Issueに紐づけ、履歴をトレースできるようにする。",
-        ],
-    ),
-    'claude': TokenInfo(
-        summary="Claudeは長文コンテキストと指示理解に優れたモデル。",
-        points=[
-            "APIではsystem promptでトーンや役割を丁寧に定義する。",
-            "プロジェクト単位でキーを分け、利用状況を可視化する。",
-        ],
-        actions=[
-            "バージョンごとの差分をノートにまとめ、利用目的で選択基準を持つ。",
-            "Claudeの回答をそのまま使わず、根拠の引用や根拠URLを必ず確認する。",
-        ],
-    ),
-    'api': TokenInfo(
-        summary="API接続時はレート制限とコスト管理を最初に設計する。",
-        points=[
-            "Streamingと非Streamingのレスポンス差を理解してUIに反映する。",
-            "監査ログを保存し、問い合わせトレースを可能にする。",
-        ],
-        actions=[
-            "SDKのバージョンアップ時は互換性チェックリストを実行する。",
-            "環境変数でキーを管理し、ローテーションを自動化する。",
-        ],
-    ),
-    'projects': TokenInfo(
-        summary="プロジェクト事例を蓄積すると再利用できるテンプレが増える。",
-        points=[
-            "課題→アプローチ→成果→学びの4要素で記録する。",
-            "顧客の声やKPIの変化を含めると説得力が出る。",
-        ],
-        actions=[
-            "事例をNotionデータベース化し、検索性を高める。",
-            "毎月1件はケーススタディとしてブログにまとめる。",
-        ],
-    ),
-    'prompting': TokenInfo(
-        summary="プロンプト設計はゴール・文脈・制約の3点セット。",
-        points=[
-            "思考過程を明示させるにはChain of Thoughtやルーブリックを添える。",
-            "サンプル入力/出力を与えるFew-shotが精度を底上げする。",
-        ],
-        actions=[
-            "用途別のプロンプトライブラリをGitで管理する。",
-            "結果検証シートを作り、改善の履歴を残す。",
-        ],
-    ),
-    'windsurf': TokenInfo(
-        summary="Windsurfはブラウザ上でAI支援が完結するエディタ。",
-        points=[
-            "クラウド開発環境と相性が良く、軽量作業に向く。",
-            "ショートカットやAIモデル設定がCursorと異なるので比較表を作る。",
-        ],
-        actions=[
-            "用途別に使い分け、CI/CDの補助ツールとして検証する。",
-            "ワークスペーステンプレをエクスポートしてチーム共有する。",
-        ],
-    ),
-    'bolt': TokenInfo(
-        summary="Bolt.newはUIモックからコード生成までを高速化するWeb IDE。",
-        points=[
-            "FigmaインポートやUI部品の自動生成に強みがある。",
-            "生成コードのライセンスと品質基準を事前に確認する。",
-        ],
-        actions=[
-            "デザイン→実装の橋渡し用にPoCを作成し、導入判断材料にする。",
-            "他のAI IDEとの比較検証レポートを作る。",
-        ],
-    ),
-    'v0': TokenInfo(
-        summary="v0.devはVercel提供のAI UIジェネレーター。",
-        points=[
-            "TailwindとNext.jsコードを即座に生成できるが、アクセシビリティは要確認。",
-            "複数セクションを段階的に生成すると破綻しにくい。",
-        ],
-        actions=[
-            "生成結果をStorybookに配置し、デザインチームとすり合わせる。",
-            "LLMに渡すUI要件テンプレを整備する。",
-        ],
-    ),
-    'dify': TokenInfo(
-        summary="Difyはノーコードでエージェントやワークフローを組めるOSS。",
-        points=[
-            "ツールコールとナレッジベースをGUIで管理できる。",
-            "権限・APIキー管理をCloud/自ホスで選べる柔軟性がある。",
-        ],
-        actions=[
-            "社内ユースケース集を作り、テンプレートをクローンして使い回す。",
-            "ログをAlertmanagerに連携し、失敗検知を自動化する。",
-        ],
-    ),
-    'agents': TokenInfo(
-        summary="エージェント構築ではロール設計とツール接続が肝。",
-        points=[
-            "ゴールを明確にし、必要最低限のツールを与える。",
-            "メモリ設計（短期/長期）を用意し、文脈維持を行う。",
-        ],
-        actions=[
-            "テスト用のシナリオリストを作り、暴走を検知する。",
-            "コスト・応答速度をGrafanaでモニタリングする。",
-        ],
-    ),
-    'workflows': TokenInfo(
-        summary="ワークフロー構築では分岐条件とエラー経路を丁寧に設計する。",
-        points=[
-            "人手承認ポイントを挟むタイミングを明確にする。",
-            "ログをステップごとに記録し、分析を容易にする。",
-        ],
-        actions=[
-            "デバッグ環境でテストデータを複数用意して挙動を確認する。",
-            "在庫やスケジュールと連携する際はAPI制限を事前調査する。",
-        ],
-    ),
-    'setup': TokenInfo(
-        summary="セットアップ時はアクセス制御とシークレット管理を最優先する。",
-        points=[
-            "環境変数、APIキー、Webhook URLを分離管理する。",
-            "ロールベース権限を設定し、最小権限で運用する。",
-        ],
-        actions=[
-            "構築手順をMarkdownに残し、誰でも再現できるようにする。",
-            "本番投入前にスモールスタートで検証する。",
-        ],
-    ),
-    'llm': TokenInfo(
-        summary="LLMの理解はトークン化・確率分布・自己回帰の基礎から。",
-        points=[
-            "前処理で使われるSentencePieceやBPEの違いを確認する。",
-            "温度やTop-pの設定で出力の多様性が変わる。",
-        ],
-        actions=[
-            "サンプルプロンプトに対し温度とTop-pを変えて挙動を記録する。",
-            "論文の擬似コードを読み、内部計算を追体験する。",
-        ],
-    ),
-    'transformer': TokenInfo(
-        summary="TransformerはAttention機構で文脈を捉えるアーキテクチャ。",
-        points=[
-            "Multi-Head Attentionで情報を多視点から解釈する。",
-            "Positional Encodingで系列順序を学習に組み込む。",
-        ],
-        actions=[
-            "公式論文とIllustrated Transformerを読み、理解度をメモする。",
-            "小規模モデルをPyTorchで実装し、学習曲線を確認する。",
-        ],
-    ),
-    'safety': TokenInfo(
-        summary="AIセーフティは悪用防止・バイアス低減・透明性確保が軸。",
-        points=[
-            "レッドチームテストを実施し、危険応答を洗い出す。",
-            "利用規約やユーザー啓蒙をセットで整備する。",
-        ],
-        actions=[
-            "モデルの回答ログを匿名化して保存し、監査に備える。",
-            "ガードレール提示用のプロンプトテンプレを作成する。",
-        ],
-    ),
-    'explanation': TokenInfo(
-        summary="説明用プロンプトは論理の流れと根拠提示を指示する。",
-        points=[
-            "レベル設定（初心者/専門家）を明記する。",
-            "箇条書きや段階的に説明するよう求めると読みやすい。",
-        ],
-        actions=[
-            "出力例を保存し、良い表現を別タスクにも流用する。",
-            "誤説明が出たら修正指示まで含めて再学習する。",
-        ],
-    ),
-    'debugging': TokenInfo(
-        summary="デバッグ用プロンプトは失敗要因の仮説を列挙させる。",
-        points=[
-            "エラーメッセージと直前の操作をセットで提示する。",
-            "再現手順と期待動作を書き、差分を明確にする。",
-        ],
-        actions=[
-            "LLMに候補を出させた後、優先度順に検証する。",
-            "対策をコードへ反映したら必ず再テストし、結果を記録する。",
-        ],
-    ),
-    'code': TokenInfo(
-        summary="コード生成ではスタイルガイドと制約を明示する。",
-        points=[
-            "入出力例と境界条件を提示することで品質が安定する。",
-            "生成後は静的解析を通し、安全性を確認する。",
-        ],
-        actions=[
-            "小さな関数単位で生成し、テストを積み重ねる。",
-            "LLMへの依頼内容をGitのコミットメッセージと合わせて保管。",
-        ],
-    ),
-    'generation': TokenInfo(
-        summary="生成タスクは温度・max_tokensでコントロールする。",
-        points=[
-            "長文生成時はセクションごとに指示して破綻を防ぐ。",
-            "評価指標を用意し、出力品質を定量チェックする。",
-        ],
-        actions=[
-            "テキスト→要約→校正の順で3段階プロンプトを使う。",
-            "LLMのモデル差をドキュメント化し、得意領域を整理する。",
-        ],
-    ),
-    'patterns': TokenInfo(
-        summary="プロンプトパターン集は再利用性を高める知識資産。",
-        points=[
-            "Role, Task, Format, Constraintなど要素を分解して整理する。",
-            "実例とNG集をセットで載せる。",
-        ],
-        actions=[
-            "パターンごとの成功率を記録し、改善に活かす。",
-            "学習会で共有し、チーム全体の設計力を底上げする。",
-        ],
-    ),
-    'promptops': TokenInfo(
-        summary="PromptOpsはプロンプトのバージョン管理と評価を行う運用手法。",
-        points=[
-            "GitやFeature flagでどのバージョンが本番か追跡する。",
-            "自動テストを組み込み、品質劣化を検知する。",
-        ],
-        actions=[
-            "Prompt registryを構築し、利用履歴を残す。",
-            "Metrics（品質/コスト/速度）をダッシュボード化する。",
-        ],
-    ),
-    'vector': TokenInfo(
-        summary="ベクターデータベースは類似度検索で文脈を復元する技術。",
-        points=[
-            "次元数や距離関数により精度と速度が変わる。",
-            "チャンクサイズと重複率を調整し、検索漏れを減らす。",
-        ],
-        actions=[
-            "監視クエリを設定し、挙動が劣化したら再埋め込みする。",
-            "メタデータでフィルタリングし、不要な結果を除外する。",
-        ],
-    ),
-    'chunking': TokenInfo(
-        summary="チャンク戦略は文脈を保ちつつサイズを揃える工夫。",
-        points=[
-            "見出しや意味段落を基準にスライディングウィンドウで切る。",
-            "各チャンクにサマリを添え、検索後の理解を助ける。",
-        ],
-        actions=[
-            "異なるサイズでテストし、Precision/Recallを比較する。",
-            "PDFやスライドはレイアウト要素を除去してから分割する。",
-        ],
-    ),
-    'rag': TokenInfo(
-        summary="RAGはRetrieve→Augment→Generateの一連の流れ。",
-        points=[
-            "検索クエリを生成する際にユーザー意図を保持する。",
-            "回答には根拠を添え、引用元を提示する。",
-        ],
-        actions=[
-            "評価指標にFaithfulnessとAnswer Relevancyを設定する。",
-            "フェイルオーバーとしてFAQベースの回答を用意する。",
-        ],
-    ),
-    'agent': TokenInfo(
-        summary="エージェントは目標志向で外部ツールを呼び出す存在。",
-        points=[
-            "計画ステップと実行ステップを分離すると暴走しにくい。",
-            "メモリ書き込みを行う際はフォーマットを固定する。",
-        ],
-        actions=[
-            "タスク指示テンプレを作成し、観察結果を逐次レビューする。",
-            "評価ベンチマークを用意し、リグレッションを防ぐ。",
-        ],
-    ),
-    'multi': TokenInfo(
-        summary="マルチエージェントでは役割分担と調停ロジックが重要。",
-        points=[
-            "コーディネーター役を配置し、衝突解決を自動化する。",
-            "タスク分解と優先度付けを初期に実施する。",
-        ],
-        actions=[
-            "SlackやWebhookでエージェント同士のログを可視化する。",
-            "停止条件を明記し、処理が長引いた際に人間が介入できるようにする。",
-        ],
-    ),
-    'deployment': TokenInfo(
-        summary="デプロイはビルド、テスト、リリースの境界を明確にする。",
-        points=[
-            "青/緑デプロイやカナリアを活用してリスクを抑える。",
-            "ロールバック手順を事前に自動化しておく。",
-        ],
-        actions=[
-            "本番前にヘルスチェックと依存サービスの互換性を確認する。",
-            "デプロイごとにメトリクスを記録し、傾向を分析する。",
-        ],
-    ),
-    'docker': TokenInfo(
-        summary="Dockerは環境再現性とデプロイ容易性を高める。",
-        points=[
-            "イメージサイズを抑えるためにマルチステージビルドを使う。",
-            "セキュリティ更新のためにベースイメージの定期的なリビルドが必要。",
-        ],
-        actions=[
-            "docker composeでローカル依存関係をまとめ、開発者体験を統一する。",
-            "Dockerfileにコメントで根拠を記録し、変更理由を残す。",
-        ],
-    ),
-    'ci': TokenInfo(
-        summary="CIは小さな差分を頻繁にマージし、品質を保つ仕組み。",
-        points=[
-            "テストの並列化とキャッシュ戦略で速度を確保する。",
-            "失敗時のリトライと通知を整備する。",
-        ],
-        actions=[
-            "テストカバレッジをバッジ化し、基準値を守る。",
-            "ワークフローのYAMLをテンプレにし、プロジェクト間で再利用する。",
-        ],
-    ),
-    'cd': TokenInfo(
-        summary="CDはリリースまでの手順を自動化し、人為的エラーを減らす。",
-        points=[
-            "環境ごとの差分をTerraformやPulumiでコード化する。",
-            "シークレット管理をVault等で一元化する。",
-        ],
-        actions=[
-            "本番適用前にステージングで自動承認フローを挟む。",
-            "リリースノート生成をパイプラインに組み込む。",
-        ],
-    ),
-    'scalability': TokenInfo(
-        summary="スケーラビリティは垂直・水平の両面で考える。",
-        points=[
-            "ボトルネックをAPMで特定し、キャッシュ戦略や分割統治を検討する。",
-            "データベース分割やメッセージキュー導入を視野に入れる。",
-        ],
-        actions=[
-            "負荷試験を定期的に実施し、閾値を測定する。",
-            "オートスケールの閾値をCloudWatch等で管理する。",
-        ],
-    ),
-    'system': TokenInfo(
-        summary="システム設計ではコンテキスト境界を意識する。",
-        points=[
-            "責務をBounded Contextに分割し、依存関係を最小化する。",
-            "QoS指標（可用性・遅延・耐障害性）を早期に定義する。",
-        ],
-        actions=[
-            "C4モデルで図解し、利害関係者との認識合わせに使う。",
-            "データフローとエラー経路を明示した図を作る。",
-        ],
-    ),
-    'design': TokenInfo(
-        summary="設計は要件→制約→選択肢→妥協点の順で整理する。",
-        points=[
-            "KPIと技術的制約を一枚のドキュメントにまとめる。",
-            "意思決定理由をADRに残す。",
-        ],
-        actions=[
-            "リファレンスアーキテクチャを比較し、採用理由を明文化する。",
-            "レビュー会で反証を募り、盲点を減らす。",
-        ],
-    ),
-    'python': TokenInfo(
-        summary="Pythonは読みやすさと豊富なライブラリが魅力。",
-        points=[
-            "PEP8準拠で書き、型ヒントを積極的に使う。",
-            "仮想環境と依存管理（poetry/pipenv）を徹底する。",
-        ],
-        actions=[
-            "pytestでスモークテストを整備し、CIに組み込む。",
-            "標準ライブラリで済む処理は外部依存を増やさない。",
-        ],
-    ),
-    'data': TokenInfo(
-        summary="データ構造の理解はアルゴリズム選定を左右する。",
-        points=[
-            "配列・連結リスト・木・グラフなどの特性を比較する。",
-            "Big-Oで時間/空間計算量を把握する。",
-        ],
-        actions=[
-            "LeetCodeで週2題を解き、実装感覚を磨く。",
-            "社内の典型処理を分析し、最適な構造を選ぶ。",
-        ],
-    ),
-    'structures': TokenInfo(
-        summary="データ構造の選択はメモリと処理のトレードオフ。",
-        points=[
-            "辞書型はO(1)の検索が強みだがメモリを消費する。",
-            "Immutable構造が必要かどうかを判断する。",
-        ],
-        actions=[
-            "ユースケースごとに採用理由を記し、後で見返せるようにする。",
-            "コードレビューで構造の選択を説明できるよう準備する。",
-        ],
-    ),
-    'best': TokenInfo(
-        summary="ベストプラクティスは経験知を再利用可能な形でまとめたもの。",
-        points=[
-            "原則と例外をセットで記録すると新規メンバーにも伝わりやすい。",
-            "アップデート履歴を残し、陳腐化を防ぐ。",
-        ],
-        actions=[
-            "スライドやドキュメントとして定期的に共有会を開く。",
-            "実践例を集め、成功/失敗の両面から学ぶ。",
-        ],
-    ),
-    'practices': TokenInfo(
-        summary="プラクティス集は日常業務にすぐ応用できるTipsを集める。",
-        points=[
-            "カテゴリ別に整理し、検索性を高める。",
-            "実践後のフィードバック欄を作り改善を続ける。",
-        ],
-        actions=[
-            "四半期ごとに棚卸しし、不要になったものを整理する。",
-            "社内Wikiにアップデートログを残す。",
-        ],
-    ),
-    'typescript': TokenInfo(
-        summary="TypeScriptは型安全性で大規模開発を支える。",
-        points=[
-            "strictモードを有効化し、型推論に頼りすぎない。",
-            "utility typesや型ガードで表現力を高める。",
-        ],
-        actions=[
-            "tsconfigをプロジェクト共通化し、Lintルールと合わせる。",
-            "型定義の変更はChangelogに記録する。",
-        ],
-    ),
-    'nextjs': TokenInfo(
-        summary="Next.jsはApp Routerでフルスタック開発を簡素化。",
-        points=[
-            "Server Componentsでデータ取得を最適化し、キャッシュ戦略を考える。",
-            "Route HandlerでAPIを内包させ、BFF的に利用する。",
-        ],
-        actions=[
-            "Edge/Nodeどちらで動かすかを事前に決定し、依存ライブラリを選ぶ。",
-            "RSCとクライアントコンポーネントの境界を図に描いて共有する。",
-        ],
-    ),
-    'js': TokenInfo(
-        summary="JavaScriptの基礎はスコープ・非同期・プロトタイプチェーン。",
-        points=[
-            "var/let/constの挙動やTDZを理解しておく。",
-            "非同期処理の仕組み（Event Loop）をイメージできるようにする。",
-        ],
-        actions=[
-            "MDNのチュートリアルをベースに自作教材を作る。",
-            "テスト駆動で基本APIの使い方を確認する。",
-        ],
-    ),
-    'async': TokenInfo(
-        summary="非同期制御はPromise/async-await/Observableの特徴を理解して選ぶ。",
-        points=[
-            "エラーハンドリングとキャンセル処理をセットで設計する。",
-            "並列実行と直列実行を切り替えるユーティリティを用意する。",
-        ],
-        actions=[
-            "AbortControllerを積極活用し、不要なリクエストを中断する。",
-            "非同期テストではfake timersを使い、時間依存を排除する。",
-        ],
-    ),
-    'modern': TokenInfo(
-        summary="モダンJSはES Modulesや最新構文をフル活用する姿勢。",
-        points=[
-            "BabelやSWCを通じてブラウザ互換性を意識する。",
-            "Optional chainingやNull合体演算子で防御的なコードを書く。",
-        ],
-        actions=[
-            "ブラウザサポートポリシーを定め、Polyfillを管理する。",
-            "ツールチェーンのアップデート情報をウォッチする。",
-        ],
-    ),
-    'react': TokenInfo(
-        summary="Reactは宣言的UIとコンポーネント志向で状態を管理する。",
-        points=[
-            "Hooksのルールを守り、副作用と描画を分離する。",
-            "コンポーネント分割は責務単位で行い、再利用性を高める。",
-        ],
-        actions=[
-            "StorybookでUIをドキュメント化し、QAを効率化する。",
-            "パフォーマンス計測にReact Profilerを使い、メモ化の判断材料にする。",
-        ],
-    ),
-    'marketing': TokenInfo(
-        summary="マーケティングは顧客理解→価値提案→コミュニケーション設計。",
-        points=[
-            "カスタマージャーニーを描き、接点ごとの役割を決める。",
-            "ファネル指標をモニタリングし、改善サイクルを回す。",
-        ],
-        actions=[
-            "定性インタビューと定量データを組み合わせ、意思決定を行う。",
-            "週次でキャンペーンを振り返るMTGを設定する。",
-        ],
-    ),
-    'media': TokenInfo(
-        summary="メディア選定は受け手のライフスタイルと情報密度を基準にする。",
-        points=[
-            "短尺動画・長文記事・メルマガなど役割を明確にする。",
-            "再配信時はフォーマットを最適化し、同内容でも飽きさせない。",
-        ],
-        actions=[
-            "各媒体のCTAを比較し、最もCVの高い導線へ集中投資する。",
-            "配信時間帯をA/Bテストし、最適値を記録する。",
-        ],
-    ),
-}
-
-MEMORY_BASE_POINTS = {
-    'Personal': [
+class LazyBlocks(Mapping[str, str]):
+    """Read-only table of raw blocks; each entry goes through format_block on first access only."""
+
+    def __init__(self, raw: Dict[str, str]) -> None:
+        self._raw = raw
+        self._formatted: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> str:
+        block = self._formatted.get(key)
+        if block is None:
+            block = self._formatted[key] = format_block(self._raw[key])
+        return block
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+
+CATALOG_PATH = Path(__file__).with_name('token_catalog.json')
+CATALOG_CACHE_PATH = BASE_DIR / '.cache' / 'token_catalog.marshal'
+
+_catalog: Optional[Tuple[Dict[str, str], Dict[str, TokenInfo]]] = None
+_catalog_lock = threading.Lock()
+# Cleared by --plan, which reads the caches under .cache but must leave the vault untouched.
+_cache_writes = True
+
+
+def load_token_catalog() -> Tuple[Dict[str, str], Dict[str, TokenInfo]]:
+    # Loaded on first use only, so runs that never render a memory note skip it entirely.
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = _read_token_catalog()
+    return _catalog
+
+
+def _read_token_catalog() -> Tuple[Dict[str, str], Dict[str, TokenInfo]]:
+    source = CATALOG_PATH.read_bytes()
+    digest = hashlib.sha256(source).hexdigest()
+    raw = None
+    try:
+        cached_digest, cached = marshal.loads(CATALOG_CACHE_PATH.read_bytes())
+        if cached_digest == digest:
+            raw = cached
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    if raw is None:
+        raw = json.loads(source)
+        if _cache_writes:
+            _write_catalog_cache(digest, raw)
+    return _build_token_catalog(raw)
+
+
+def _build_token_catalog(raw: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, TokenInfo]]:
+    # Interned so keys, titles and points repeated across entries share one string object.
+    intern = sys.intern
+    translations = {intern(token): intern(title) for token, title in raw['translations'].items()}
+    info = {
+        intern(token): TokenInfo(
+            intern(entry['summary']),
+            tuple(intern(point) for point in entry['points']),
+            tuple(intern(action) for action in entry['actions']),
+        )
+        for token, entry in raw['info'].items()
+    }
+    return translations, info
+
+
+def _write_catalog_cache(digest: str, raw: Dict[str, Any]) -> None:
+    try:
+        CATALOG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.token_catalog.', suffix='.tmp', dir=CATALOG_CACHE_PATH.parent)
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(marshal.dumps((digest, raw)))
+        os.replace(tmp, CATALOG_CACHE_PATH)
+    except OSError:
+        pass  # the cache is an optimisation; a read-only vault still works from the JSON
+
+
+def token_translations() -> Dict[str, str]:
+    return load_token_catalog()[0]
+
+
+def token_info() -> Dict[str, TokenInfo]:
+    return load_token_catalog()[1]
+
+
+def stem_token(token: str) -> str:
+    # Deliberately tiny English stemmer: enough to fold prompts/prompting/prompt onto one form.
+    for suffix, replacement in (('ies', 'y'), ('ing', ''), ('ed', ''), ('s', '')):
+        if not token.endswith(suffix) or len(token) - len(suffix) + len(replacement) < 3:
+            continue
+        if suffix == 's' and token.endswith(('ss', 'us', 'is')):
+            break
+        token = token[: len(token) - len(suffix)] + replacement
+        if suffix in ('ing', 'ed') and len(token) > 3 and token[-1] == token[-2] and token[-1] not in 'lsz':
+            token = token[:-1]  # debugging -> debug, not debugg
+        break
+    if len(token) > 4 and token.endswith('e'):
+        token = token[:-1]
+    return token
+
+
+class TokenIndex:
+    """Resolves slug tokens to catalog keys by exact match, shared stem, or compound split."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self._exact = set(keys)
+        self._stems: Dict[str, str] = {}
+        for key in sorted(keys, key=lambda key: (stem_token(key) != key, key)):
+            self._stems.setdefault(stem_token(key), key)
+        # Character trie over every indexed form; a '' entry marks the end of a form.
+        self._trie: Dict[str, Any] = {}
+        forms = {key: key for key in keys}
+        forms.update((stem, key) for stem, key in self._stems.items() if stem not in forms)
+        for form, key in forms.items():
+            node = self._trie
+            for char in form:
+                node = node.setdefault(char, {})
+            node[''] = key
+        self._resolved: Dict[str, Tuple[str, ...]] = {}
+
+    def lookup(self, token: str) -> Tuple[str, ...]:
+        keys = self._resolved.get(token)
+        if keys is None:
+            keys = self._resolved[token] = self._lookup(token)
+        return keys
+
+    def resolve(self, tokens: Iterable[str]) -> List[str]:
+        seen: Set[str] = set()
+        keys: List[str] = []
+        for token in tokens:
+            for key in self.lookup(token):
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+        return keys
+
+    def _lookup(self, token: str) -> Tuple[str, ...]:
+        if token in self._exact:
+            return (token,)
+        key = self._stems.get(stem_token(token))
+        if key is not None:
+            return (key,)
+        return self._split(token)
+
+    def _prefixes(self, token: str, start: int) -> Iterator[Tuple[int, str]]:
+        node = self._trie
+        for end in range(start, len(token)):
+            node = node.get(token[end])
+            if node is None:
+                return
+            if '' in node and end + 1 - start >= 2:
+                yield end + 1, node['']
+
+    def _split(self, token: str) -> Tuple[str, ...]:
+        # Fewest-pieces segmentation of e.g. 'multiagent' into indexed forms covering the whole token.
+        best: List[Optional[Tuple[str, ...]]] = [None] * (len(token) + 1)
+        best[0] = ()
+        for start in range(len(token)):
+            pieces = best[start]
+            if pieces is None:
+                continue
+            for end, key in self._prefixes(token, start):
+                candidate = pieces + (key,)
+                if best[end] is None or len(candidate) < len(best[end]):
+                    best[end] = candidate
+        pieces = best[-1]
+        if pieces is None or len(pieces) < 2:
+            # A trailing inflection ('multiagents') only resolves once the stem is split.
+            stemmed = stem_token(token)
+            return self._split(stemmed) if stemmed != token else ()
+        return pieces
+
+
+_token_index: Optional[TokenIndex] = None
+
+
+def token_index() -> TokenIndex:
+    # Built once per process from the catalog keys; lookups are memoised per token after that.
+    global _token_index
+    if _token_index is None:
+        info = token_info()  # outside the lock: load_token_catalog takes it too
+        with _catalog_lock:
+            if _token_index is None:
+                _token_index = TokenIndex(info)
+    return _token_index
+
+
+def __getattr__(name: str) -> Any:
+    # Keep fill_empty_files.TOKEN_TRANSLATIONS / TOKEN_INFO working for importers.
+    if name == 'TOKEN_TRANSLATIONS':
+        return token_translations()
+    if name == 'TOKEN_INFO':
+        return token_info()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Immutable per-category defaults; each note merges its own TOKEN_INFO entries on top.
+MEMORY_BASE_POINTS: Dict[str, Tuple[str, ...]] = {
+    'Personal': (
         "身体・感情・思考の3レイヤーで状態を観察し、偏りを見つける。",
         "家族やチームと共有したい学びは週次レビューに転記する。",
-    ],
-    'Education': [
+    ),
+    'Education': (
         "学習者の前提知識と動機を把握してから教材を設計する。",
         "インプットとアウトプットの比率を常に確認し、退屈させない。",
-    ],
-    'Business': [
+    ),
+    'Business': (
         "顧客価値・提供プロセス・収益性の3視点で意思決定する。",
         "再現性のある施策はドキュメント化してチームに展開する。",
-    ],
-    'AI': [
+    ),
+    'AI': (
         "モデル・データ・ワークフローの三位一体で設計する。",
         "LLMの挙動はログを残し、改善サイクルを回す。",
-    ],
-    'Technical': [
+    ),
+    'Technical': (
         "要件・制約・トレードオフを明文化してから実装に入る。",
         "品質と速度のバランスをメトリクスで見える化する。",
-    ],
+    ),
 }
 
-MEMORY_BASE_ACTIONS = {
-    'Personal': [
+MEMORY_BASE_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    'Personal': (
         "毎週日曜に感情ログを振り返り、翌週のセルフケアを1つ決める。",
         "観察⇒気づき⇒次の一手を1行でメモする習慣を続ける。",
-    ],
-    'Education': [
+    ),
+    'Education': (
         "授業や講座後にアンケートを即回収し、改善案を3つ書き出す。",
         "教材のバージョン管理を行い、更新意図を記す。",
-    ],
-    'Business': [
+    ),
+    'Business': (
         "週次でKPIダッシュボードを見ながら改善タスクを決める。",
         "顧客の声を収集し、製品や運営の改善 backlog に追加する。",
-    ],
-    'AI': [
+    ),
+    'AI': (
         "プロンプト・評価指標・失敗例をGitで管理する。",
         "モデル更新時はABテストで品質差分を検証する。",
-    ],
-    'Technical': [
+    ),
+    'Technical': (
         "設計メモをADR化し、意思決定理由を残す。",
         "CI/CDでテストを自動化し、リグレッションを防ぐ。",
-    ],
+    ),
 }
 
+MEMORY_DEFAULT_POINTS = ("観察→気づき→改善を1セットで記録する。",)
+MEMORY_DEFAULT_ACTIONS = ("TODO化して週次で進捗確認する。",)
+MEMORY_ITEM_LIMIT = 6
+
+
+def merge_unique(*sources: Iterable[str], limit: Optional[int] = None) -> List[str]:
+    # Ordered de-duplication that stops as soon as `limit` items are collected, if given.
+    seen: Set[str] = set()
+    merged: List[str] = []
+    for source in sources:
+        for item in source:
+            if item in seen:
+                continue
+            seen.add(item)
+            merged.append(item)
+            if len(merged) == limit:
+                return merged
+    return merged
+
+
+# Directories that never hold routable notes (VCS data, plugin bundles, app sources).
+PRUNED_DIR_NAMES = frozenset({'.git', '.obsidian', 'node_modules', 'website'})
+
+Generator = Callable[[Path], str]
+
+
+@dataclass
+class RouteNode:
+    children: Dict[str, RouteNode] = field(default_factory=dict)
+    generator: Optional[Generator] = None
+    name_rules: List[Tuple[str, Generator]] = field(default_factory=list)
+
+    @property
+    def routes_subtree(self) -> bool:
+        return self.generator is not None or bool(self.name_rules)
+
+    def match(self, name: str, fallback: Optional[Generator]) -> Optional[Generator]:
+        for name_prefix, generator in self.name_rules:
+            if name.startswith(name_prefix):
+                return generator
+        return self.generator or fallback
+
+
+class GeneratorRouter:
+    """Path-segment trie mapping vault prefixes to generators; the deepest match wins."""
+
+    def __init__(self) -> None:
+        self.root = RouteNode()
+
+    def register(self, prefix: str, generator: Generator, name_prefix: Optional[str] = None) -> None:
+        node = self.root
+        for segment in prefix.strip('/').split('/'):
+            node = node.children.setdefault(segment, RouteNode())
+        if name_prefix is not None:
+            node.name_rules.append((name_prefix, generator))
+        elif node.generator is not None:
+            raise ValueError(f"Generator already registered for {prefix}")
+        else:
+            node.generator = generator
+
+    def route(self, prefix: str, name_prefix: Optional[str] = None) -> Callable[[Generator], Generator]:
+        def decorator(generator: Generator) -> Generator:
+            self.register(prefix, generator, name_prefix)
+            return generator
+
+        return decorator
+
+    def resolve(self, rel: str) -> Optional[Generator]:
+        segments = rel.split('/')
+        name = segments[-1]
+        node = self.root
+        found: Optional[Generator] = None
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            found = node.match(name, found)
+        return found
+
+
+ROUTER = GeneratorRouter()
+
+
+MANIFEST_PATH = BASE_DIR / '.cache' / 'fill_empty_files.json'
+MANIFEST_VERSION = 1
+
+DirEntries = List[Tuple[str, bool]]
+
+
+class ScanManifest:
+    """Directory listings from the previous scan, reused while a directory's mtime is unchanged.
+
+    Only subdirectories and zero-length files are recorded. A note truncated in place does not
+    touch its directory's mtime, so it is picked up once that directory changes or by a full run.
+    """
+
+    def __init__(self, root: Path, previous: Optional[Dict[str, list]] = None) -> None:
+        self.root = root
+        self._previous = previous or {}
+        self._current: Dict[str, list] = {}
+
+    @classmethod
+    def load(cls, path: Path, root: Path = BASE_DIR) -> ScanManifest:
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return cls(root)
+        if data.get('version') != MANIFEST_VERSION or data.get('root') != os.fspath(root):
+            return cls(root)
+        return cls(root, data.get('dirs'))
+
+    def entries(self, rel: str, mtime_ns: int) -> Optional[DirEntries]:
+        cached = self._previous.get(rel)
+        if cached is None or cached[0] != mtime_ns:
+            return None
+        return [(name, is_dir) for name, is_dir in cached[1]]
+
+    def record(self, rel: str, mtime_ns: int, entries: DirEntries) -> None:
+        self._current[rel] = [mtime_ns, entries]
+
+    def invalidate(self, rel: str) -> None:
+        self._current.pop(rel, None)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'version': MANIFEST_VERSION, 'root': os.fspath(self.root), 'dirs': self._current}
+        NoteWriter().write(path, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+
+
+def iter_empty_files(
+    root: Path = BASE_DIR,
+    router: GeneratorRouter = ROUTER,
+    manifest: Optional[ScanManifest] = None,
+    temp_files: Optional[List[str]] = None,
+) -> Iterator[Path]:
+    # Depth-first walk with each directory's entries sorted by name, which yields
+    # paths in the same order as sorted(Path, ...) without materialising the tree.
+    # Directories are followed only while the router can still route something below them.
+    # Writer temp files in the directories read along the way are appended to temp_files.
+    yield from _scan_dir(os.fspath(root), '', router.root, False, manifest, temp_files)
+
+
+def _scan_dir(
+    directory: str,
+    rel: str,
+    node: Optional[RouteNode],
+    covered: bool,
+    manifest: Optional[ScanManifest],
+    temp_files: Optional[List[str]] = None,
+) -> Iterator[Path]:
+    for name, is_dir in _dir_entries(directory, rel, manifest, temp_files):
+        entry_path = os.path.join(directory, name)
+        if not is_dir:
+            yield Path(entry_path)
+            continue
+        child = node.children.get(name) if node is not None else None
+        if child is None and not covered:
+            continue
+        yield from _scan_dir(
+            entry_path,
+            f'{rel}/{name}' if rel else name,
+            child,
+            covered or (child is not None and child.routes_subtree),
+            manifest,
+            temp_files,
+        )
 
-def main() -> None:
-    zero_files = sorted(
-        [p for p in BASE_DIR.rglob('*') if p.is_file() and p.stat().st_size == 0]
+
+def _dir_entries(
+    directory: str,
+    rel: str,
+    manifest: Optional[ScanManifest],
+    temp_files: Optional[List[str]] = None,
+) -> DirEntries:
+    if manifest is None:
+        return _read_dir_entries(directory, temp_files)
+    mtime_ns = os.stat(directory).st_mtime_ns
+    entries = manifest.entries(rel, mtime_ns)
+    if entries is None:
+        # A temp file left behind changed the directory's mtime, so it is seen here.
+        entries = _read_dir_entries(directory, temp_files)
+    else:
+        # An unchanged directory can still hold a note that was filled in place.
+        entries = [
+            (name, is_dir)
+            for name, is_dir in entries
+            if is_dir or (not _is_scratch(name) and _is_empty_file(os.path.join(directory, name)))
+        ]
+    manifest.record(rel, mtime_ns, entries)
+    return entries
+
+
+def _read_dir_entries(directory: str, temp_files: Optional[List[str]] = None) -> DirEntries:
+    entries: DirEntries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in PRUNED_DIR_NAMES:
+                    entries.append((entry.name, True))
+            elif _is_scratch(entry.name):
+                if temp_files is not None and TEMP_FILE_RE.match(entry.name):
+                    temp_files.append(entry.path)
+            elif entry.is_file() and entry.stat().st_size == 0:
+                entries.append((entry.name, False))
+    entries.sort()
+    return entries
+
+
+def _is_scratch(name: str) -> bool:
+    # Hidden files and NoteWriter temp files (".note.md.x1y2z3.tmp") are never notes.
+    return name.startswith('.') or name.endswith('.tmp')
+
+
+def _is_empty_file(path: str) -> bool:
+    try:
+        return os.stat(path).st_size == 0
+    except FileNotFoundError:
+        return False
+
+
+def find_unrouted(paths: Iterator[Path], router: GeneratorRouter = ROUTER) -> List[str]:
+    unrouted = []
+    for path in paths:
+        rel = path.relative_to(BASE_DIR).as_posix()
+        if router.resolve(rel) is None:
+            unrouted.append(rel)
+    return unrouted
+
+
+NoteStat = Tuple[str, int, int]
+# NoteWriter and patch_header temp files: mkstemp(prefix='.<name>.', suffix='.tmp').
+TEMP_FILE_RE = re.compile(r'^\..+\.[A-Za-z0-9_]+\.tmp$')
+STALE_TEMP_SECONDS = 3600
+
+
+def iter_notes(root: Path = BASE_DIR, temp_files: Optional[List[str]] = None) -> Iterator[NoteStat]:
+    # Every markdown note as (vault-relative path, mtime_ns, size) in sorted path order, for
+    # the vault indexes. Hidden directories such as .obsidian and .cache are skipped. Writer
+    # temp files met on the way are appended to temp_files, for remove_stale_temp_files().
+    yield from _walk_notes(os.fspath(root), '', temp_files)
+
+
+def _walk_notes(directory: str, rel: str, temp_files: Optional[List[str]]) -> Iterator[NoteStat]:
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if not entry.name.startswith('.') and entry.name not in PRUNED_DIR_NAMES:
+                yield from _walk_notes(entry.path, f'{rel}{entry.name}/', temp_files)
+        elif _is_scratch(entry.name):
+            if temp_files is not None and TEMP_FILE_RE.match(entry.name):
+                temp_files.append(entry.path)
+        elif entry.name.endswith('.md') and entry.is_file():
+            info = entry.stat()
+            yield f'{rel}{entry.name}', info.st_mtime_ns, info.st_size
+
+
+def remove_stale_temp_files(paths: Iterable[str], max_age: float = STALE_TEMP_SECONDS) -> int:
+    # A crash between mkstemp and os.replace leaves the temp file behind. Only old ones go:
+    # a younger one may belong to a writer that is still running.
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in paths:
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.unlink(path)
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def update_listing(
+    notes: List[NoteStat],
+    changed: Iterable[str],
+    moves: Optional[Mapping[str, str]] = None,
+    root: Path = BASE_DIR,
+) -> List[NoteStat]:
+    # An iter_notes() listing brought up to date after a batch wrote or moved notes, by
+    # re-statting only those notes instead of walking the vault again. Moved notes drop out
+    # under their old paths; pass their new paths in changed.
+    if moves:
+        notes = [note for note in notes if note[0] not in moves]
+    stats: Dict[str, NoteStat] = {}
+    for rel in changed:
+        try:
+            info = (root / rel).stat()
+        except FileNotFoundError:
+            continue  # failed to render or moved away since it was listed
+        stats[rel] = (rel, info.st_mtime_ns, info.st_size)
+    notes = [stats.pop(note[0], note) for note in notes]
+    for note in sorted(stats.values()):
+        insort(notes, note)
+    return notes
+
+
+# What os.link raises on filesystems that cannot hard-link at all.
+NO_HARD_LINK_ERRNOS = frozenset({errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS, errno.EMLINK})
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _current_umask()
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name == 'nt':  # directories cannot be opened for fsync on Windows
+        return
+    fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class NoteWriter:
+    """Crash-safe writes: temp file in the target directory, fsync, then os.replace.
+
+    With batch_fsync the directory fsync that makes each rename durable is deferred and
+    issued once per directory by flush(); note contents are always synced before the rename.
+    """
+
+    def __init__(self, batch_fsync: bool = False) -> None:
+        self.batch_fsync = batch_fsync
+        self._dirty_dirs: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def write(self, path: Path, content: str) -> None:
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                handle.write(content)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        if self.batch_fsync:
+            with self._lock:
+                self._dirty_dirs.add(path.parent)
+        else:
+            _fsync_dir(path.parent)
+
+    def rename(self, source: Path, target: Path) -> None:
+        # Moves inside the vault stay on one filesystem. os.rename would silently replace an
+        # existing target, so the note is hard-linked under its new name, which fails with
+        # FileExistsError if the name is taken, then unlinked from the old one. A crash in
+        # between leaves the same file under both names. Both directories change, and neither
+        # is durable until each has been fsynced.
+        try:
+            os.link(source, target)
+        except OSError as exc:
+            if exc.errno not in NO_HARD_LINK_ERRNOS:
+                raise
+            # exFAT, many SMB mounts and sync folders have no hard links; checking first
+            # leaves only a small window in which a new note at target could be replaced.
+            if target.exists():
+                raise FileExistsError(errno.EEXIST, 'File exists', str(target)) from None
+            os.rename(source, target)
+        else:
+            try:
+                os.unlink(source)
+            except BaseException:
+                os.unlink(target)
+                raise
+        if self.batch_fsync:
+            with self._lock:
+                self._dirty_dirs.update((source.parent, target.parent))
+        else:
+            _fsync_dir(source.parent)
+            _fsync_dir(target.parent)
+
+    def flush(self) -> None:
+        with self._lock:
+            dirty, self._dirty_dirs = self._dirty_dirs, set()
+        for directory in sorted(dirty):
+            _fsync_dir(directory)
+
+
+CACHE_DIR = BASE_DIR / '.cache' / 'generated'
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Generators whose output depends on the current date; their cache entries expire daily.
+DATE_BUCKETED_GENERATORS = frozenset({'generate_memory_note'})
+# Rendered from the daily notes, which the cache key cannot see; DailySummaries caches their inputs.
+UNCACHED_GENERATORS = frozenset({'generate_weekly_review', 'generate_monthly_review'})
+
+
+class GenerationCache:
+    """On-disk cache of rendered notes with least-recently-used eviction by total size.
+
+    Entries are keyed by generator name, a hash of this module's source and the token catalog
+    (generators read both, so any edit invalidates everything), the vault-relative path and,
+    for date-dependent generators, today's date. Generators that read other notes are never cached.
+    A read-only cache serves hits but neither stores nor evicts entries.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        read_only: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        sources = hashlib.sha256(Path(__file__).read_bytes())
+        sources.update(CATALOG_PATH.read_bytes())
+        self._source_digest = sources.hexdigest()
+        self._writer = NoteWriter(batch_fsync=True)
+        self._lock = threading.Lock()
+
+    def key(self, generator: Generator, rel: str) -> str:
+        bucket = date.today().isoformat() if generator.__name__ in DATE_BUCKETED_GENERATORS else ''
+        raw = '\0'.join((generator.__name__, self._source_digest, rel, bucket))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.directory / key
+        try:
+            content = entry.read_text(encoding='utf-8')
+            os.utime(entry)  # mtime doubles as the last-use time for eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def put(self, key: str, content: str) -> None:
+        if self.read_only:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writer.write(self.directory / key, content)
+
+    def close(self) -> None:
+        if self.read_only:
+            return
+        self._writer.flush()
+        self.evict()
+
+    def evict(self) -> None:
+        try:
+            with os.scandir(self.directory) as it:
+                entries = [
+                    (entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                    for entry in it
+                    if entry.is_file() and not entry.name.startswith('.')
+                ]
+        except FileNotFoundError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(entry_path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"Cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate)"
+
+
+DAILY_SUMMARY_NAME = 'daily_summaries.json'
+DAILY_SUMMARY_VERSION = 2
+SUMMARY_TASK_LIMIT = 50
+TASK_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+\[([ xX])\]\s*(.*?)\s*$')
+# materialize_dashboards writes query results between these markers. The tasks, links and
+# tags copied in there belong to the notes they came from, not to the dashboard.
+MATERIALIZED_START = '<!-- dataview-materialized'
+MATERIALIZED_END = '<!-- /dataview-materialized -->'
+# Latin words count once each; Japanese has no spaces, so each kana/kanji counts as one.
+WORD_RE = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)*|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]")
+
+
+def outside_materialized(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    # Lines numbered from 1, leaving out any materialized dashboard section.
+    inside = False
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if inside:
+            inside = stripped != MATERIALIZED_END
+        elif stripped.startswith(MATERIALIZED_START):
+            inside = True
+        else:
+            yield number, line
+
+
+@dataclass
+class ActivitySummary:
+    """Daily-note activity for one day or a span of days; spans are built by merging days."""
+
+    days: int = 0
+    notes: int = 0
+    words: int = 0
+    # Distinct tasks across the whole span. The lists hold them for display and are capped per
+    # persisted day, so the counts also carry the tasks a capped day did not list.
+    done: int = 0
+    pending: int = 0
+    done_tasks: List[str] = field(default_factory=list)
+    open_tasks: List[str] = field(default_factory=list)
+
+    def merge(self, other: ActivitySummary) -> None:
+        self.days += other.days
+        self.notes += other.notes
+        self.words += other.words
+        unlisted_done = self.done - len(self.done_tasks) + other.done - len(other.done_tasks)
+        unlisted_open = self.pending - len(self.open_tasks) + other.pending - len(other.open_tasks)
+        # Uncapped so a span's "finished" set is exact; only the persisted days are capped.
+        # A task ticked off on three days is still one finished task.
+        self.done_tasks = merge_unique(self.done_tasks, other.done_tasks)
+        # A task left open on Monday and ticked off on Thursday is no longer open.
+        finished = set(self.done_tasks)
+        self.open_tasks = merge_unique(
+            (task for task in self.open_tasks if task not in finished),
+            (task for task in other.open_tasks if task not in finished),
+        )
+        self.done = len(self.done_tasks) + unlisted_done
+        self.pending = len(self.open_tasks) + unlisted_open
+
+    def copy(self) -> ActivitySummary:
+        return ActivitySummary(**self.__dict__)
+
+
+def summarize_day(paths: List[Path]) -> ActivitySummary:
+    # Streams each note line by line; TODO and Daily notes often repeat the same checkbox,
+    # so tasks are counted once per day by their text.
+    done: Dict[str, None] = {}
+    pending: Dict[str, None] = {}
+    words = 0
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            in_frontmatter = False
+            for number, line in enumerate(handle):
+                if line.rstrip() == '---' and (number == 0 or in_frontmatter):
+                    in_frontmatter = not in_frontmatter
+                    continue
+                if in_frontmatter:
+                    continue
+                words += len(WORD_RE.findall(line))
+                task = TASK_RE.match(line)
+                if task and task.group(2):
+                    (pending if task.group(1) == ' ' else done)[task.group(2)] = None
+    still_open = [task for task in pending if task not in done]
+    return ActivitySummary(
+        days=1 if paths else 0,
+        notes=len(paths),
+        words=words,
+        done=len(done),
+        pending=len(still_open),
+        done_tasks=list(done)[:SUMMARY_TASK_LIMIT],
+        open_tasks=still_open[:SUMMARY_TASK_LIMIT],
     )
-    for path in zero_files:
-        content = generate_content(path)
-        path.write_text(content, encoding='utf-8')
 
 
-def generate_content(path: Path) -> str:
+class DailySummaries:
+    """Per-day summaries of 02_Daily/YYYY/YYYY-MM/YYYY-MM-DD/, persisted between runs.
+
+    A day is re-read only when the names, sizes or mtimes of its notes differ from the
+    recorded ones, so regenerating a year of reviews touches just the days that changed.
+    Within a run each day folder is listed once and each ISO week is merged once; months
+    are rolled up from those weeks, so backfilling a year costs one pass over the tree.
+    """
+
+    def __init__(self, root: Path, previous: Optional[Dict[str, Any]] = None) -> None:
+        self.root = root
+        self._days: Dict[str, Any] = previous or {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._seen: Dict[date, ActivitySummary] = {}
+        self._weeks: Dict[Tuple[int, int], ActivitySummary] = {}
+
+    @classmethod
+    def load(cls, root: Path = BASE_DIR) -> DailySummaries:
+        try:
+            data = json.loads((root / '.cache' / DAILY_SUMMARY_NAME).read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return cls(root)
+        if data.get('version') != DAILY_SUMMARY_VERSION:
+            return cls(root)
+        return cls(root, data.get('days'))
+
+    def day(self, day: date) -> ActivitySummary:
+        with self._lock:
+            seen = self._seen.get(day)
+        if seen is None:
+            seen = self._read_day(day)
+            with self._lock:
+                self._seen[day] = seen
+        return seen.copy()
+
+    def _read_day(self, day: date) -> ActivitySummary:
+        key = day.isoformat()
+        folder = self.root / '02_Daily' / f'{day:%Y}' / f'{day:%Y-%m}' / key
+        try:
+            with os.scandir(folder) as it:
+                files = sorted(
+                    [entry.name, entry.stat().st_mtime_ns, entry.stat().st_size]
+                    for entry in it
+                    if entry.name.endswith('.md') and entry.is_file()
+                )
+        except FileNotFoundError:
+            return ActivitySummary()
+        if not files:
+            return ActivitySummary()  # scaffolded but not yet written; nothing worth recording
+        with self._lock:
+            cached = self._days.get(key)
+        if cached is not None and cached['files'] == files:
+            return ActivitySummary(**cached['summary'])
+        summary = summarize_day([folder / name for name, _, _ in files])
+        with self._lock:
+            self._days[key] = {'files': files, 'summary': summary.__dict__}
+            self._dirty = True
+        return summary
+
+    def span(self, start: date, end: date) -> ActivitySummary:
+        total = ActivitySummary()
+        current = start
+        while current <= end:
+            total.merge(self.day(current))
+            current += timedelta(days=1)
+        return total
+
+    def week(self, iso_year: int, iso_week: int) -> ActivitySummary:
+        with self._lock:
+            merged = self._weeks.get((iso_year, iso_week))
+        if merged is None:
+            start = date.fromisocalendar(iso_year, iso_week, 1)
+            merged = self.span(start, start + timedelta(days=6))
+            with self._lock:
+                self._weeks[(iso_year, iso_week)] = merged
+        return merged.copy()
+
+    def month(self, year: int, month: int) -> ActivitySummary:
+        first = date(year, month, 1)
+        last = month_end(first)
+        total = ActivitySummary()
+        week_start = first - timedelta(days=first.weekday())
+        while week_start <= last:
+            week_end = week_start + timedelta(days=6)
+            if first <= week_start and week_end <= last:
+                iso_year, iso_week, _ = week_start.isocalendar()
+                total.merge(self.week(iso_year, iso_week))
+            else:
+                # An ISO week straddling the month boundary contributes only its in-month days.
+                total.merge(self.span(max(first, week_start), min(last, week_end)))
+            week_start += timedelta(days=7)
+        return total
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        path = self.root / '.cache' / DAILY_SUMMARY_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {'version': DAILY_SUMMARY_VERSION, 'days': self._days}
+            text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+            self._dirty = False
+        NoteWriter().write(path, text)
+
+
+def month_end(day: date) -> date:
+    following = day.replace(day=28) + timedelta(days=4)
+    return following - timedelta(days=following.day)
+
+
+_daily_summaries: Optional[DailySummaries] = None
+_daily_summaries_lock = threading.Lock()
+
+
+def daily_summaries() -> DailySummaries:
+    # Follows BASE_DIR so the benchmark and other importers can point it at another vault.
+    global _daily_summaries
+    with _daily_summaries_lock:
+        if _daily_summaries is None or _daily_summaries.root != BASE_DIR:
+            _daily_summaries = DailySummaries.load(BASE_DIR)
+        return _daily_summaries
+
+
+def save_daily_summaries() -> None:
+    if _daily_summaries is not None:
+        _daily_summaries.save()
+
+
+def _percentile(ordered: List[float], quantile: float) -> float:
+    # Nearest-rank percentile over an already sorted sample.
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(quantile * len(ordered)) - 1)]
+
+
+@dataclass
+class GeneratorStats:
+    durations: List[float] = field(default_factory=list)
+    bytes_out: int = 0
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.durations)
+        return {
+            'calls': len(ordered),
+            'total_seconds': sum(ordered),
+            'p50_seconds': _percentile(ordered, 0.50),
+            'p95_seconds': _percentile(ordered, 0.95),
+            'p99_seconds': _percentile(ordered, 0.99),
+            'bytes': self.bytes_out,
+        }
+
+
+class RunMetrics:
+    """Per-generator render timings and output volume, plus scan and write time for one run."""
+
+    QUANTILES = (('0.5', 'p50_seconds'), ('0.95', 'p95_seconds'), ('0.99', 'p99_seconds'))
+
+    def __init__(self) -> None:
+        self.generators: Dict[str, GeneratorStats] = {}
+        self.scan_seconds = 0.0
+        self.write_seconds = 0.0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def record_render(self, generator: str, seconds: float, size: int) -> None:
+        with self._lock:
+            stats = self.generators.setdefault(generator, GeneratorStats())
+            stats.durations.append(seconds)
+            stats.bytes_out += size
+
+    def record_write(self, seconds: float) -> None:
+        with self._lock:
+            self.write_seconds += seconds
+            self.writes += 1
+
+    def timed_scan(self, paths: Iterable[Path]) -> Iterator[Path]:
+        # The scanner is lazy, so its cost is the time spent inside each next() call.
+        iterator = iter(paths)
+        while True:
+            started = time.perf_counter()
+            try:
+                path = next(iterator)
+            except StopIteration:
+                self.scan_seconds += time.perf_counter() - started
+                return
+            self.scan_seconds += time.perf_counter() - started
+            yield path
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'scan_seconds': self.scan_seconds,
+            'write_seconds': self.write_seconds,
+            'writes': self.writes,
+            'generators': {name: stats.summary() for name, stats in sorted(self.generators.items())},
+        }
+
+    def format_table(self) -> str:
+        header = f"{'generator':<34} {'calls':>6} {'total_ms':>10} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'bytes':>10}"
+        lines = [header, '-' * len(header)]
+        for name, summary in self.as_dict()['generators'].items():
+            lines.append(
+                f"{name:<34} {summary['calls']:>6} {summary['total_seconds'] * 1000:>10.3f} "
+                f"{summary['p50_seconds'] * 1000:>8.3f} {summary['p95_seconds'] * 1000:>8.3f} "
+                f"{summary['p99_seconds'] * 1000:>8.3f} {summary['bytes']:>10}"
+            )
+        lines.append(
+            f"scan {self.scan_seconds * 1000:.3f} ms, "
+            f"write {self.write_seconds * 1000:.3f} ms over {self.writes} files"
+        )
+        return '\n'.join(lines)
+
+    def format_prometheus(self, prefix: str = 'fill_empty_files') -> str:
+        summaries = self.as_dict()['generators']
+        lines = [
+            f"# HELP {prefix}_render_seconds Time spent rendering notes, per generator.",
+            f"# TYPE {prefix}_render_seconds summary",
+        ]
+        for name, summary in summaries.items():
+            for quantile, key in self.QUANTILES:
+                lines.append(f'{prefix}_render_seconds{{generator="{name}",quantile="{quantile}"}} {summary[key]:.9f}')
+            lines.append(f'{prefix}_render_seconds_sum{{generator="{name}"}} {summary["total_seconds"]:.9f}')
+            lines.append(f'{prefix}_render_seconds_count{{generator="{name}"}} {summary["calls"]}')
+        lines += [
+            f"# HELP {prefix}_rendered_bytes_total UTF-8 bytes produced, per generator.",
+            f"# TYPE {prefix}_rendered_bytes_total counter",
+        ]
+        lines += [
+            f'{prefix}_rendered_bytes_total{{generator="{name}"}} {summary["bytes"]}'
+            for name, summary in summaries.items()
+        ]
+        lines += [
+            f"# HELP {prefix}_scan_seconds Time spent scanning the vault for candidates.",
+            f"# TYPE {prefix}_scan_seconds gauge",
+            f"{prefix}_scan_seconds {self.scan_seconds:.9f}",
+            f"# HELP {prefix}_write_seconds Time spent writing notes.",
+            f"# TYPE {prefix}_write_seconds gauge",
+            f"{prefix}_write_seconds {self.write_seconds:.9f}",
+            f"# HELP {prefix}_writes Notes written.",
+            f"# TYPE {prefix}_writes gauge",
+            f"{prefix}_writes {self.writes}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def fill_file(
+    path: Path,
+    writer: NoteWriter,
+    cache: Optional[GenerationCache] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> None:
+    content = generate_content(path, cache, metrics)
+    started = time.perf_counter()
+    writer.write(path, content)
+    if metrics is not None:
+        metrics.record_write(time.perf_counter() - started)
+
+
+def _attempt_fill(
+    path: Path,
+    writer: NoteWriter,
+    cache: Optional[GenerationCache],
+    metrics: Optional[RunMetrics],
+) -> Optional[Exception]:
+    try:
+        fill_file(path, writer, cache, metrics)
+    except Exception as exc:  # reported per file so the rest of the batch still runs
+        return exc
+    return None
+
+
+def fill_files(
+    paths: Iterable[Path],
+    jobs: int = 1,
+    writer: Optional[NoteWriter] = None,
+    cache: Optional[GenerationCache] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> Iterator[Tuple[Path, Optional[Exception]]]:
+    # Results come back in input order whatever the pool size, so output stays
+    # deterministic. At most 2 * jobs files are in flight at once.
+    writer = writer or NoteWriter()
+    try:
+        if jobs <= 1:
+            for path in paths:
+                yield path, _attempt_fill(path, writer, cache, metrics)
+            return
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            pending: Deque[Tuple[Path, Future[Optional[Exception]]]] = deque()
+            for path in paths:
+                pending.append((path, executor.submit(_attempt_fill, path, writer, cache, metrics)))
+                if len(pending) >= jobs * 2:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+    finally:
+        writer.flush()
+
+
+def plan_files(
+    paths: Iterable[Path],
+    cache: Optional[GenerationCache] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> Iterator[Dict[str, Any]]:
+    # One record per candidate, rendered in memory and discarded; nothing touches the vault.
+    for path in paths:
+        rel = path.relative_to(BASE_DIR).as_posix()
+        generator = ROUTER.resolve(rel)
+        record: Dict[str, Any] = {'path': rel, 'generator': generator.__name__ if generator else None}
+        started = time.perf_counter()
+        try:
+            record['bytes'] = len(generate_content(path, cache, metrics).encode('utf-8'))
+        except Exception as exc:  # a failing generator is part of the plan, not a crash
+            record['error'] = str(exc)
+        record['render_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        yield record
+
+
+@dataclass
+class CalendarPlan:
+    """Day folders and review notes covering a date range, computed in one pass over its days."""
+
+    day_dirs: List[Path]
+    weekly: List[Path]
+    monthly: List[Path]
+
+
+def plan_calendar(start: date, end: date, root: Path = BASE_DIR) -> CalendarPlan:
+    daily = root / '02_Daily'
+    plan = CalendarPlan([], [], [])
+    weeks: Set[Tuple[int, int]] = set()
+    months: Set[str] = set()
+    current = start
+    while current <= end:
+        year, month = f'{current:%Y}', f'{current:%Y-%m}'
+        plan.day_dirs.append(daily / year / month / current.isoformat())
+        iso_year, iso_week, _ = current.isocalendar()
+        if (iso_year, iso_week) not in weeks:
+            weeks.add((iso_year, iso_week))
+            plan.weekly.append(daily / 'Weekly-Reviews' / str(iso_year) / f'{iso_year}-W{iso_week:02d}.md')
+        if month not in months:
+            months.add(month)
+            plan.monthly.append(daily / 'Monthly-Reviews' / year / f'{month}.md')
+        current += timedelta(days=1)
+    return plan
+
+
+def review_period_end(rel: str) -> Optional[date]:
+    # Last day of the ISO week (YYYY-Www.md) or month (YYYY-MM.md) a review note covers.
+    folder, _, name = rel.rpartition('/')
+    stem = name[:-3] if name.endswith('.md') else name
+    try:
+        if folder.startswith('02_Daily/Weekly-Reviews/'):
+            year, week = stem.split('-W')
+            return date.fromisocalendar(int(year), int(week), 7)
+        if folder.startswith('02_Daily/Monthly-Reviews/'):
+            year, month = stem.split('-')
+            return month_end(date(int(year), int(month), 1))
+    except ValueError:
+        return None
+    return None
+
+
+def review_is_due(rel: str, today: date) -> bool:
+    # A review is due once the last day of its period has come (the Sunday or month-end
+    # nightly run). Other notes are always due.
+    end = review_period_end(rel)
+    return end is None or end <= today
+
+
+def skip_open_reviews(paths: Iterable[Path], today: date) -> Iterator[Path]:
+    # Leaves reviews of periods still under way empty, naming each one on stderr.
+    for path in paths:
+        rel = path.relative_to(BASE_DIR).as_posix()
+        if review_is_due(rel, today):
+            yield path
+        else:
+            print(f"Skipped {rel}: period ends {review_period_end(rel)}", file=sys.stderr)
+
+
+def make_dirs(directories: Iterable[Path], root: Path = BASE_DIR) -> int:
+    # Each missing directory gets exactly one mkdir, parents first, instead of a makedirs
+    # call per leaf that re-stats every shared ancestor.
+    wanted: Set[Path] = set()
+    for directory in directories:
+        while directory != root and directory not in wanted:
+            wanted.add(directory)
+            directory = directory.parent
+    created = 0
+    for directory in sorted(wanted):
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            continue
+        created += 1
+    return created
+
+
+def _needs_content(path: Path) -> bool:
+    try:
+        return path.stat().st_size == 0
+    except FileNotFoundError:
+        return True
+
+
+def _create_placeholder(path: Path) -> bool:
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+    except FileExistsError:
+        return False
+    return True
+
+
+def _scaffold(args: argparse.Namespace, metrics: Optional[RunMetrics]) -> int:
+    plan = plan_calendar(args.start, args.end, BASE_DIR)
+    reviews = plan.weekly + plan.monthly
+    created = make_dirs(plan.day_dirs + [path.parent for path in reviews], BASE_DIR)
+    # Existing reviews with content are left alone. Missing and zero-length ones are rendered
+    # once their period has ended; later ones become empty placeholders that the nightly
+    # review stage renders when they fall due (fill runs leave them with --skip-open-reviews).
+    today = date.today()
+    pending: List[Path] = []
+    placeholders = 0
+    for path in reviews:
+        if review_is_due(path.relative_to(BASE_DIR).as_posix(), today):
+            if _needs_content(path):
+                pending.append(path)
+        else:
+            placeholders += _create_placeholder(path)
+    filled = failed = 0
+    writer = NoteWriter(batch_fsync=args.batch_fsync)
+    for path, error in fill_files(pending, args.jobs, writer, metrics=metrics):
+        if error is None:
+            filled += 1
+            continue
+        failed += 1
+        print(f"Failed {path.relative_to(BASE_DIR).as_posix()}: {error}", file=sys.stderr)
+    print(
+        f"Scaffolded {args.start}..{args.end}: {created} folders created, "
+        f"{filled} reviews written, {placeholders} placeholders created, {failed} failed"
+    )
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    global _cache_writes
+    parser = argparse.ArgumentParser(description=__doc__)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '--check',
+        action='store_true',
+        help='list zero-length files that have no generator and exit without writing',
+    )
+    mode.add_argument(
+        '--plan',
+        action='store_true',
+        help='stream one JSON line per candidate (path, generator, bytes, render_ms) '
+        'to stdout without writing notes or cache files',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='render and write files on N worker threads (default: 1)',
+    )
+    parser.add_argument(
+        '--batch-fsync',
+        action='store_true',
+        help='fsync each directory once at the end of the run instead of after every rename',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=f'reuse directory listings from {MANIFEST_PATH.relative_to(BASE_DIR).as_posix()} '
+        'for directories whose mtime has not changed',
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f'serve rendered notes from {CACHE_DIR.relative_to(BASE_DIR).as_posix()} when possible',
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        metavar='MB',
+        help='evict least recently used cache entries beyond this size (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--skip-open-reviews',
+        action='store_true',
+        help='leave weekly and monthly reviews of periods that have not ended yet empty, '
+        'listing each skipped path on stderr',
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='print per-generator timings, scan time and write time to stderr at exit',
+    )
+    parser.add_argument(
+        '--stats-json',
+        type=Path,
+        metavar='PATH',
+        help='dump the run metrics as JSON to PATH',
+    )
+    parser.add_argument(
+        '--stats-prom',
+        type=Path,
+        metavar='PATH',
+        help='write the run metrics to PATH in Prometheus textfile format',
+    )
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    scaffold = commands.add_parser(
+        'scaffold',
+        help='create daily folders and weekly/monthly reviews for a date range',
+        description='Create 02_Daily/YYYY/YYYY-MM/YYYY-MM-DD/ folders for every day in the range '
+        'and render the weekly and monthly reviews that cover it; reviews of periods that have '
+        'not ended yet are created as empty placeholders.',
+    )
+    scaffold.add_argument('--from', dest='start', type=date.fromisoformat, required=True, metavar='YYYY-MM-DD')
+    scaffold.add_argument('--to', dest='end', type=date.fromisoformat, required=True, metavar='YYYY-MM-DD')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    _cache_writes = not args.plan
+    metrics = RunMetrics() if args.stats or args.stats_json or args.stats_prom else None
+    if args.command == 'scaffold':
+        if args.check or args.plan or args.incremental or args.cache:
+            parser.error('scaffold cannot be combined with --check, --plan, --incremental or --cache')
+        if args.start > args.end:
+            parser.error('scaffold --from must not be after --to')
+        status = _scaffold(args, metrics)
+        save_daily_summaries()
+        if metrics is not None:
+            _report_metrics(metrics, args)
+        return status
+    manifest = ScanManifest.load(MANIFEST_PATH) if args.incremental else None
+    # Only fill runs clean up; --check and --plan leave the vault as they found it.
+    temp_files: Optional[List[str]] = None if args.check or args.plan else []
+    candidates: Iterable[Path] = iter_empty_files(manifest=manifest, temp_files=temp_files)
+    if args.skip_open_reviews:
+        candidates = skip_open_reviews(candidates, date.today())
+    if metrics is not None:
+        candidates = metrics.timed_scan(candidates)
+    cache = None
+    if args.cache:
+        cache = GenerationCache(CACHE_DIR, args.cache_max_mb * 1024 * 1024, read_only=args.plan)
+    if args.check:
+        unrouted = find_unrouted(candidates)
+        for rel in unrouted:
+            print(f"No generator implemented for {rel}", file=sys.stderr)
+        if manifest is not None:
+            manifest.save(MANIFEST_PATH)
+        status = 1 if unrouted else 0
+    elif args.plan:
+        errors = 0
+        for record in plan_files(candidates, cache, metrics):
+            errors += 'error' in record
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        if cache is not None:
+            cache.close()
+            print(cache.summary(), file=sys.stderr)
+        status = 1 if errors else 0
+    else:
+        status = _fill_vault(candidates, args, manifest, cache, metrics)
+        # Only runs that write notes persist the summaries; --plan and --check leave .cache alone.
+        save_daily_summaries()
+        removed = remove_stale_temp_files(temp_files or [])
+        if removed:
+            print(f"Removed {removed} temp files left by an interrupted run", file=sys.stderr)
+    if metrics is not None:
+        _report_metrics(metrics, args)
+    return status
+
+
+def _fill_vault(
+    candidates: Iterable[Path],
+    args: argparse.Namespace,
+    manifest: Optional[ScanManifest],
+    cache: Optional[GenerationCache],
+    metrics: Optional[RunMetrics],
+) -> int:
+    filled = failed = 0
+    writer = NoteWriter(batch_fsync=args.batch_fsync)
+    for path, error in fill_files(candidates, args.jobs, writer, cache, metrics):
+        rel = path.relative_to(BASE_DIR).as_posix()
+        if error is None:
+            filled += 1
+            if manifest is not None:
+                # The rename changed the directory, so let the next run re-read it.
+                manifest.invalidate(rel.rpartition('/')[0])
+            continue
+        failed += 1
+        print(f"Failed {rel}: {error}", file=sys.stderr)
+    if manifest is not None:
+        manifest.save(MANIFEST_PATH)
+    print(f"Filled {filled} files, {failed} failed")
+    if cache is not None:
+        cache.close()
+        print(cache.summary())
+    return 1 if failed else 0
+
+
+def _report_metrics(metrics: RunMetrics, args: argparse.Namespace) -> None:
+    if args.stats:
+        print(metrics.format_table(), file=sys.stderr)
+    if args.stats_json:
+        args.stats_json.write_text(json.dumps(metrics.as_dict(), indent=2) + '\n', encoding='utf-8')
+    if args.stats_prom:
+        # The node exporter textfile collector expects the file to appear atomically.
+        NoteWriter().write(args.stats_prom, metrics.format_prometheus())
+
+
+def generate_content(
+    path: Path,
+    cache: Optional[GenerationCache] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> str:
     rel = path.relative_to(BASE_DIR).as_posix()
-    if rel.startswith('02_Daily/Weekly-Reviews/'):
-        return generate_weekly_review(path)
-    if rel.startswith('02_Daily/Monthly-Reviews/'):
-        return generate_monthly_review(path)
-    if rel.startswith('07_System/Dashboards/'):
-        return generate_dashboard(path)
-    if rel == '04_Memory/_Master-Index.md':
-        return generate_memory_master_index()
-    if rel.startswith('04_Memory/') and path.name.startswith('_'):
-        return generate_memory_moc(path)
-    if rel.startswith('04_Memory/'):
-        return generate_memory_note(path)
-    if rel.startswith('03_Input/'):
-        return generate_input_note(path)
-    if rel.startswith('06_Templates/'):
-        return generate_template(path)
-    if rel.startswith('99_Archive/'):
-        return generate_archive_note(path)
-    if rel.startswith('05_Output/Areas/Personal/'):
-        return generate_area_personal(path)
-    if rel.startswith('05_Output/Areas/Content-Creation/'):
-        return generate_area_content_creation(path)
-    if rel.startswith('05_Output/Areas/Business/'):
-        return generate_area_business(path)
-    if rel.startswith('05_Output/Projects/'):
-        return generate_project_note(path)
-    raise ValueError(f"No generator implemented for {rel}")
+    generator = ROUTER.resolve(rel)
+    if generator is None:
+        raise ValueError(f"No generator implemented for {rel}")
+    started = time.perf_counter()
+    if cache is None or generator.__name__ in UNCACHED_GENERATORS:
+        content = generator(path)
+    else:
+        key = cache.key(generator, rel)
+        content = cache.get(key)
+        if content is None:
+            content = generator(path)
+            cache.put(key, content)
+    if metrics is not None:
+        metrics.record_render(
+            generator.__name__, time.perf_counter() - started, len(content.encode('utf-8'))
+        )
+    return content
+
+
+def format_activity_table(activity: ActivitySummary, days: int, column: str) -> str:
+    return f"""| 指標 | {column} | メモ |
+|------|------|------|
+| 記録日数 | {activity.days}/{days}日 | デイリーノートがある日 |
+| ノート作成数 | {activity.notes}件 | 02_Daily配下のノート |
+| 完了タスク | {activity.done}件 | 未完了 {activity.pending}件 |
+| 執筆量 | {activity.words:,}語 | 英単語と日本語1文字を1語として集計 |
+"""
 
 
+@ROUTER.route('02_Daily/Weekly-Reviews')
 def generate_weekly_review(path: Path) -> str:
     week_label = path.stem
     year_str, week_part = week_label.split('-W')
@@ -1155,11 +1537,8 @@ def generate_weekly_review(path: Path) -> str:
     iso_week = int(week_part)
     start = date.fromisocalendar(iso_year, iso_week, 1)
     end = start + timedelta(days=6)
-    highlights = [
-        f"YouTubeシリーズの収録準備を進め、台本レビューを{iso_week}件クリアした。",
-        "SURVIBE AI講座の教材アップデートを実施し、受講者質問への回答テンプレも更新。",
-        "CursorとClaudeの最新アップデートを検証し、社内メモへ反映した。",
-    ]
+    activity = daily_summaries().week(iso_year, iso_week)
+    highlights = activity.done_tasks[:5] or ["この週のデイリーノートに完了タスクはまだ記録されていない。"]
     learnings = [
         "午前の集中時間にコンテンツづくりを固めると、午後の会議が楽になる。",
         "週後半はエネルギーが下がるため、軽めのメンテ作業を割り当てるとリズムが維持できる。",
@@ -1168,17 +1547,9 @@ def generate_weekly_review(path: Path) -> str:
         "Inbox整理を水曜日にも一度実施し、週末の負荷を軽減する。",
         "NotionタスクとObsidianタスクの二重管理をなくすため、連携ルールを明文化する。",
     ]
-    focus = [
-        "YouTube EP02の撮影と編集チェックを完了させる。",
-        "SURVIBE AIカリキュラムのWeek3演習をブラッシュアップする。",
-        "AIツール比較記事のドラフトを水曜までに書き切る。",
-    ]
-    metrics_table = """| 指標 | 今週 | メモ |
-|------|------|------|
-| Deep Work時間 | 14h | 午前2ブロック確保に成功 |
-| コンテンツ公開数 | 2本 | ブログ1/動画1 |
-| 学習ログ | 4件 | Claude/Dify/PromptOpsなど |
-"""
+    # Whatever is still open at the end of the week carries over as next week's focus.
+    focus = activity.open_tasks[:3] or ["来週の最優先タスクを3つ決めて書き出す。"]
+    metrics_table = format_activity_table(activity, 7, '今週')
     return format_block(
         f"""---
 week: {week_label}
@@ -1204,34 +1575,32 @@ tags: [weekly-review, {iso_year}, {week_label}]
     )
 
 
+@ROUTER.route('02_Daily/Monthly-Reviews')
 def generate_monthly_review(path: Path) -> str:
     ym = path.stem  # e.g. 2025-01
     year, month = map(int, ym.split('-'))
     start = date(year, month, 1)
-    if month == 12:
-        end = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = date(year, month + 1, 1) - timedelta(days=1)
-    outcomes = [
-        "YouTubeチャンネル登録者が月次目標を105%で達成。",
-        "SURVIBE AI講座の募集着地が定員に到達し、キャンセル待ちを整理。",
-        "AIプロンプト集の第2版を公開し、社内の問い合わせが20%減。",
-    ]
-    metrics = """| 指標 | 今月 | 先月比 |
-|------|------|-------|
-| コンテンツ公開数 | 8本 | +2 |
-| 売上(万円) | 180 | +15 |
-| 学習時間 | 22h | +4 |
-"""
+    end = month_end(start)
+    summaries = daily_summaries()
+    activity = summaries.month(year, month)
+    previous_start = (start - timedelta(days=1)).replace(day=1)
+    previous = summaries.month(previous_start.year, previous_start.month)
+    outcomes = activity.done_tasks[:5] or ["この月のデイリーノートに完了タスクはまだ記録されていない。"]
+    rows = (
+        ('記録日数', 'days', '日'),
+        ('ノート作成数', 'notes', '件'),
+        ('完了タスク', 'done', '件'),
+        ('執筆量', 'words', '語'),
+    )
+    metrics = "| 指標 | 今月 | 先月比 |\n|------|------|-------|\n" + ''.join(
+        f"| {label} | {getattr(activity, name):,}{unit} | {getattr(activity, name) - getattr(previous, name):+,} |\n"
+        for label, name, unit in rows
+    )
     lessons = [
         "App Router移行に伴うデプロイ体制を早めに整える必要がある。",
         "ニュースレターの開封率が高い金曜朝に合わせて配信すると効果が良い。",
     ]
-    next_focus = [
-        "SURVIBE AI Week4の最終課題を改善し、評価基準をアップデート。",
-        "Cursor vs Copilotの記事を深掘りし、リード獲得につなげる。",
-        "ヘルスデータの可視化を自動化し、エネルギー管理の精度を上げる。",
-    ]
+    next_focus = activity.open_tasks[:3] or ["来月の最優先テーマを3つ決めて書き出す。"]
     return format_block(
         f"""---
 month: {ym}
@@ -1257,7 +1626,8 @@ tags: [monthly-review, {year}, {ym}]
     )
 
 
-def generate_memory_master_index() -> str:
+@ROUTER.route('04_Memory/_Master-Index.md')
+def generate_memory_master_index(path: Optional[Path] = None) -> str:
     return format_block(
         """# 🧠 Second Brain Master Index
 
@@ -1283,6 +1653,7 @@ def generate_memory_master_index() -> str:
     )
 
 
+@ROUTER.route('04_Memory', name_prefix='_')
 def generate_memory_moc(path: Path) -> str:
     parts = path.relative_to(BASE_DIR).as_posix().split('/')
     category = parts[1]
@@ -1324,6 +1695,7 @@ def generate_memory_moc(path: Path) -> str:
     return body
 
 
+@ROUTER.route('04_Memory')
 def generate_memory_note(path: Path) -> str:
     rel = path.relative_to(BASE_DIR).as_posix()
     parts = rel.split('/')
@@ -1331,29 +1703,23 @@ def generate_memory_note(path: Path) -> str:
     slug = Path(rel).stem
     title = slug_to_title(slug)
     tokens = slug_tokens(slug)
-    infos = [TOKEN_INFO[t] for t in tokens if t in TOKEN_INFO]
+    catalog = token_info()
+    infos = [catalog[key] for key in token_index().resolve(tokens)]
     summary = f"{title}に関する知見を整理する。"
     if infos:
         summary += " " + " ".join(info.summary for info in infos)
     else:
         summary += " 背景・重要ポイント・行動指針を短くまとめる。"
-    points = MEMORY_BASE_POINTS.get(category, ["観察→気づき→改善を1セットで記録する。"])
-    actions = MEMORY_BASE_ACTIONS.get(category, ["TODO化して週次で進捗確認する。"])
-    for info in infos:
-        points.extend(info.points)
-        actions.extend(info.actions)
-    # deduplicate while preserving order
-    def dedup(seq: List[str]) -> List[str]:
-        seen = set()
-        result = []
-        for item in seq:
-            if item not in seen:
-                seen.add(item)
-                result.append(item)
-        return result
-
-    points = dedup(points)[:6]
-    actions = dedup(actions)[:6]
+    points = merge_unique(
+        MEMORY_BASE_POINTS.get(category, MEMORY_DEFAULT_POINTS),
+        *(info.points for info in infos),
+        limit=MEMORY_ITEM_LIMIT,
+    )
+    actions = merge_unique(
+        MEMORY_BASE_ACTIONS.get(category, MEMORY_DEFAULT_ACTIONS),
+        *(info.actions for info in infos),
+        limit=MEMORY_ITEM_LIMIT,
+    )
     if not points:
         points = [f"{title}に関する基礎概念と注意点を整理する。"]
     if not actions:
@@ -1371,6 +1737,9 @@ def generate_memory_note(path: Path) -> str:
         "## メモ\n- 更新日: " + str(date.today()) + "\n- 参照タグ: #" + category.lower()
     )
     return note
+
+
+@ROUTER.route('07_System/Dashboards')
 def generate_dashboard(path: Path) -> str:
     name = path.stem
     if 'HOME' in name or '🏠' in name:
@@ -1512,6 +1881,7 @@ SORT priority ASC
     raise ValueError(f"Unknown dashboard template for {name}")
 
 
+@ROUTER.route('03_Input')
 def generate_input_note(path: Path) -> str:
     name = path.stem
     if name == 'this-week-focus':
@@ -1620,11 +1990,8 @@ Sonnet 4は指示理解が鋭く、長文編集にも強い。Fine-grainedなCha
     raise ValueError(f"Unknown input note template for {name}")
 
 
-def generate_template(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '06_Templates').as_posix()
-    templates: Dict[str, str] = {
-        'Projects/プロジェクト振り返りテンプレート.md': format_block(
-            """# プロジェクト振り返りテンプレート
+TEMPLATES = LazyBlocks({
+    'Projects/プロジェクト振り返りテンプレート.md': """# プロジェクト振り返りテンプレート
 
 ## 🗓 プロジェクト情報
 - 期間: {{start}} ~ {{end}}
@@ -1652,10 +2019,8 @@ def generate_template(path: Path) -> str:
 - 技術:
 - プロセス:
 - コミュニケーション:
-"""
-        ),
-        'Projects/コースカリキュラムテンプレート.md': format_block(
-            """# コースカリキュラムテンプレート
+""",
+    'Projects/コースカリキュラムテンプレート.md': """# コースカリキュラムテンプレート
 
 ## 🎯 コース概要
 - タイトル: {{course_name}}
@@ -1682,10 +2047,8 @@ def generate_template(path: Path) -> str:
 ## 🧠 メモ
 - リスク: 
 - サポート体制: 
-"""
-        ),
-        'Projects/セミナー企画テンプレート.md': format_block(
-            """# セミナー企画テンプレート
+""",
+    'Projects/セミナー企画テンプレート.md': """# セミナー企画テンプレート
 
 ## 🗓 開催情報
 - タイトル:
@@ -1714,10 +2077,8 @@ def generate_template(path: Path) -> str:
 - [ ] 集客素材作成
 - [ ] 参加者リスト管理
 - [ ] リマインドメール送信
-"""
-        ),
-        'Projects/プロジェクト計画テンプレート.md': format_block(
-            """# プロジェクト計画テンプレート
+""",
+    'Projects/プロジェクト計画テンプレート.md': """# プロジェクト計画テンプレート
 
 ## 📌 情報
 - プロジェクト名: 
@@ -1747,10 +2108,8 @@ def generate_template(path: Path) -> str:
 ## ✅ 次の一歩
 - [ ] 
 - [ ] 
-"""
-        ),
-        'Projects/クライアント提案テンプレート.md': format_block(
-            """# クライアント提案テンプレート
+""",
+    'Projects/クライアント提案テンプレート.md': """# クライアント提案テンプレート
 
 ## 🧾 基本情報
 - クライアント: 
@@ -1776,10 +2135,8 @@ def generate_template(path: Path) -> str:
 
 ## 📎 添付資料
 - 
-"""
-        ),
-        'Content/ブログアウトラインテンプレート.md': format_block(
-            """# ブログアウトラインテンプレート
+""",
+    'Content/ブログアウトラインテンプレート.md': """# ブログアウトラインテンプレート
 
 ## タイトル案
 
@@ -1800,10 +2157,8 @@ def generate_template(path: Path) -> str:
 
 ## CTA案
 - 
-"""
-        ),
-        'Content/ブログ記事テンプレート.md': format_block(
-            """# {{title}}
+""",
+    'Content/ブログ記事テンプレート.md': """# {{title}}
 
 ## 導入
 - 読者の課題
@@ -1824,10 +2179,8 @@ def generate_template(path: Path) -> str:
 
 ## CTA
 - 
-"""
-        ),
-        'Content/SNS投稿テンプレート.md': format_block(
-            """# SNS投稿テンプレート
+""",
+    'Content/SNS投稿テンプレート.md': """# SNS投稿テンプレート
 
 ## プラットフォーム
 - Twitter / Threads / LinkedIn など
@@ -1846,10 +2199,8 @@ def generate_template(path: Path) -> str:
 ## 配信メモ
 - 予定日時:
 - 投稿後の反応: 
-"""
-        ),
-        'Content/Xスレッドテンプレート.md': format_block(
-            """# Xスレッドテンプレート
+""",
+    'Content/Xスレッドテンプレート.md': """# Xスレッドテンプレート
 
 ## テーマ
 - 
@@ -1865,10 +2216,8 @@ def generate_template(path: Path) -> str:
 ## メモ
 - 共有したいデータ/リンク
 - 補足画像
-"""
-        ),
-        'Content/YouTubeスクリプトテンプレート.md': format_block(
-            """# YouTubeスクリプトテンプレート
+""",
+    'Content/YouTubeスクリプトテンプレート.md': """# YouTubeスクリプトテンプレート
 
 ## 基本情報
 - タイトル: 
@@ -1887,10 +2236,8 @@ def generate_template(path: Path) -> str:
 - B-roll案: 
 - テロップ: 
 - 注意事項: 
-"""
-        ),
-        'Daily/デイリーTODOテンプレート.md': format_block(
-            """# {{date:YYYY-MM-DD}} TODO
+""",
+    'Daily/デイリーTODOテンプレート.md': """# {{date:YYYY-MM-DD}} TODO
 
 ## 🌞 朝の準備
 - [ ] エネルギーレベル記録
@@ -1908,10 +2255,8 @@ def generate_template(path: Path) -> str:
 ## 🌙 ふりかえり
 - 良かったこと:
 - 改善ポイント:
-"""
-        ),
-        'Daily/月次レビューテンプレート.md': format_block(
-            """# {{date:YYYY-MM}} 月次レビュー
+""",
+    'Daily/月次レビューテンプレート.md': """# {{date:YYYY-MM}} 月次レビュー
 
 ## ✅ 成果
 - 
@@ -1930,10 +2275,8 @@ def generate_template(path: Path) -> str:
 1. 
 2. 
 3. 
-"""
-        ),
-        'Daily/週次レビューテンプレート.md': format_block(
-            """# {{date:YYYY}}-W{{week}} 週次レビュー
+""",
+    'Daily/週次レビューテンプレート.md': """# {{date:YYYY}}-W{{week}} 週次レビュー
 
 ## 🌟 ハイライト
 - 
@@ -1953,10 +2296,8 @@ def generate_template(path: Path) -> str:
 1. 
 2. 
 3. 
-"""
-        ),
-        'Meeting/ブレインストーミングセッションテンプレート.md': format_block(
-            """# ブレインストーミングノート
+""",
+    'Meeting/ブレインストーミングセッションテンプレート.md': """# ブレインストーミングノート
 
 ## テーマ
 
@@ -1974,10 +2315,8 @@ def generate_template(path: Path) -> str:
 ## 収束ステップ
 - Top3候補:
 - 次のアクション:
-"""
-        ),
-        'Meeting/会議ノートテンプレート.md': format_block(
-            """# 会議ノート — {{title}}
+""",
+    'Meeting/会議ノートテンプレート.md': """# 会議ノート — {{title}}
 
 ## 基本情報
 - 日時: 
@@ -2000,10 +2339,8 @@ def generate_template(path: Path) -> str:
 ## 次回
 - 日時候補:
 - 準備物:
-"""
-        ),
-        'Meeting/クライアント会議テンプレート.md': format_block(
-            """# クライアント会議メモ
+""",
+    'Meeting/クライアント会議テンプレート.md': """# クライアント会議メモ
 
 ## 基本情報
 - クライアント: 
@@ -2026,10 +2363,8 @@ def generate_template(path: Path) -> str:
 ## フォローアップ
 - メール送信日: 
 - 添付資料: 
-"""
-        ),
-        'Meeting/1on1ノートテンプレート.md': format_block(
-            """# 1on1ノート — {{name}}
+""",
+    'Meeting/1on1ノートテンプレート.md': """# 1on1ノート — {{name}}
 
 ## 近況
 - 勝ち/感謝
@@ -2047,10 +2382,8 @@ def generate_template(path: Path) -> str:
 ## フィードバック
 - ポジティブ:
 - 改善:
-"""
-        ),
-        'Knowledge/概念ノートテンプレート.md': format_block(
-            """# {{concept}}
+""",
+    'Knowledge/概念ノートテンプレート.md': """# {{concept}}
 
 ## 定義
 
@@ -2065,10 +2398,8 @@ def generate_template(path: Path) -> str:
 
 ## メモ
 - 
-"""
-        ),
-        'Knowledge/MOCテンプレート.md': format_block(
-            """# {{title}} MOC
+""",
+    'Knowledge/MOCテンプレート.md': """# {{title}} MOC
 
 ## サマリー
 
@@ -2079,10 +2410,8 @@ def generate_template(path: Path) -> str:
 
 ## アクション
 - [ ] 次回更新日: {{date}}
-"""
-        ),
-        'Knowledge/ツールレビューテンプレート.md': format_block(
-            """# {{tool}} レビュー
+""",
+    'Knowledge/ツールレビューテンプレート.md': """# {{tool}} レビュー
 
 ## 基本情報
 - カテゴリ:
@@ -2102,10 +2431,8 @@ def generate_template(path: Path) -> str:
 
 ## 結論
 - 
-"""
-        ),
-        'Knowledge/テクニックガイドテンプレート.md': format_block(
-            """# {{technique}} ガイド
+""",
+    'Knowledge/テクニックガイドテンプレート.md': """# {{technique}} ガイド
 
 ## 概要
 
@@ -2119,10 +2446,8 @@ def generate_template(path: Path) -> str:
 
 ## 参考
 - 
-"""
-        ),
-        'Knowledge/学習ノートテンプレート.md': format_block(
-            """# 学習ノート — {{topic}}
+""",
+    'Knowledge/学習ノートテンプレート.md': """# 学習ノート — {{topic}}
 
 ## 目的
 
@@ -2134,20 +2459,20 @@ def generate_template(path: Path) -> str:
 
 ## 次のステップ
 - [ ] 
-"""
-        ),
-    }
-    if rel in templates:
-        return templates[rel]
+""",
+})
+
+
+@ROUTER.route('06_Templates')
+def generate_template(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '06_Templates').as_posix()
+    if rel in TEMPLATES:
+        return TEMPLATES[rel]
     raise ValueError(f"Unknown template for {rel}")
 
 
-def generate_archive_note(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '99_Archive').as_posix()
-    name = Path(rel).stem
-    if rel == '_archive-workflow.md':
-        return format_block(
-            """# アーカイブ運用ワークフロー
+ARCHIVE_NOTES = LazyBlocks({
+    '_archive-workflow.md': """# アーカイブ運用ワークフロー
 
 ## 目的
 - アクティブな情報と履歴資料を切り分ける
@@ -2166,11 +2491,8 @@ def generate_archive_note(path: Path) -> str:
 ## メモ
 - 1年経過後に更なる圧縮/削除を検討
 - 機微情報は暗号化または削除ルールを別途管理
-"""
-        )
-    if 'meeting-notes' in name:
-        return format_block(
-            """# 2025-01-14 Meeting Notes
+""",
+    'meeting-notes': """# 2025-01-14 Meeting Notes
 
 ## 概要
 - クライアント: Studio Polaris
@@ -2186,11 +2508,8 @@ def generate_archive_note(path: Path) -> str:
 - [ ] 1/18までに最新版スライド共有（担当: Tech）
 - [ ] 登壇者プロフィールの確認（担当: Client）
 - [ ] リハーサル日程調整（担当: PM）
-"""
-        )
-    if 'youtube-idea' in name:
-        return format_block(
-            """# 2025-01-13 YouTube アイデア
+""",
+    'youtube-idea': """# 2025-01-13 YouTube アイデア
 
 ## コンセプト
 - タイトル案: 「AIエディタCursorで1時間アプリ構築」
@@ -2207,11 +2526,8 @@ def generate_archive_note(path: Path) -> str:
 - [ ] シナリオ初稿作成
 - [ ] 画面キャプチャ撮影
 - [ ] サムネイル案出し
-"""
-        )
-    if name == 'memo-002':
-        return format_block(
-            """# メモ 002 — アイデア走り書き
+""",
+    'memo-002': """# メモ 002 — アイデア走り書き
 
 ## キーワード
 - マルチエージェント
@@ -2227,11 +2543,8 @@ def generate_archive_note(path: Path) -> str:
 - [ ] 需要ヒアリング
 - [ ] 技術検証
 - [ ] 収益化パターン整理
-"""
-        )
-    if 'voice-note' in name:
-        return format_block(
-            """# 音声メモ 2025-01-13
+""",
+    'voice-note': """# 音声メモ 2025-01-13
 
 ## トリガー
 - 移動中に浮かんだ講座改善アイデア
@@ -2244,11 +2557,8 @@ def generate_archive_note(path: Path) -> str:
 ## アクション
 - [ ] Botのシナリオ素案を作成
 - [ ] リハ用スクリプトを10分単位で整備
-"""
-        )
-    if 'ai-tool-idea' in name:
-        return format_block(
-            """# 2025-01-13 AIツール アイデア
+""",
+    'ai-tool-idea': """# 2025-01-13 AIツール アイデア
 
 ## 背景
 - クライアント向けにCursor/Claude/Difyの使い分け資料を作りたい
@@ -2262,16 +2572,26 @@ def generate_archive_note(path: Path) -> str:
 - 各ツールの最新価格
 - 事例ヒアリング: 企業3社
 - 既存ブログとの重複確認
-"""
-        )
+""",
+})
+
+
+@ROUTER.route('99_Archive')
+def generate_archive_note(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '99_Archive').as_posix()
+    name = Path(rel).stem
+    if rel == '_archive-workflow.md':
+        return ARCHIVE_NOTES[rel]
+    if name == 'memo-002':
+        return ARCHIVE_NOTES[name]
+    for marker in ('meeting-notes', 'youtube-idea', 'voice-note', 'ai-tool-idea'):
+        if marker in name:
+            return ARCHIVE_NOTES[marker]
     raise ValueError(f"Unknown archive note for {rel}")
 
 
-def generate_area_personal(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Personal').as_posix()
-    notes: Dict[str, str] = {
-        'Health/exercise-log.md': format_block(
-            """# エクササイズ記録
+AREA_PERSONAL_NOTES = LazyBlocks({
+    'Health/exercise-log.md': """# エクササイズ記録
 
 ## 目的
 - 週3回のトレーニングを習慣化し、体脂肪率18%を維持する。
@@ -2290,10 +2610,8 @@ def generate_area_personal(path: Path) -> str:
 ## 振り返り
 - 今週の改善点:
 - 次週トライ: 
-"""
-        ),
-        'Health/energy-tracking.md': format_block(
-            """# エネルギートラッキング
+""",
+    'Health/energy-tracking.md': """# エネルギートラッキング
 
 ## 今日の指標
 - 睡眠: __h / 質 __
@@ -2311,10 +2629,8 @@ def generate_area_personal(path: Path) -> str:
 ## 週次サマリー
 - エネルギー平均:
 - シグナル:
-"""
-        ),
-        'Family/kids-milestones.md': format_block(
-            """# 子どものマイルストーン
+""",
+    'Family/kids-milestones.md': """# 子どものマイルストーン
 
 ## プロフィール
 - 名前: 
@@ -2333,10 +2649,8 @@ def generate_area_personal(path: Path) -> str:
 ## 記録
 | 日付 | 出来事 | 親の気づき |
 |------|--------|-------------|
-"""
-        ),
-        'Family/@TODO/family-trip-planning.md': format_block(
-            """# TODO: 家族旅行計画
+""",
+    'Family/@TODO/family-trip-planning.md': """# TODO: 家族旅行計画
 
 ## 行き先候補
 - 
@@ -2357,10 +2671,8 @@ def generate_area_personal(path: Path) -> str:
 
 ## 予算
 - 概算: 円
-"""
-        ),
-        'Family/family-goals.md': format_block(
-            """# ファミリーゴール
+""",
+    'Family/family-goals.md': """# ファミリーゴール
 
 ## 年間テーマ
 - 
@@ -2375,10 +2687,8 @@ def generate_area_personal(path: Path) -> str:
 - 議題:
 - 決定事項:
 - 宿題:
-"""
-        ),
-        'Self-Development/learning-goals-2025.md': format_block(
-            """# 2025 学習ゴール
+""",
+    'Self-Development/learning-goals-2025.md': """# 2025 学習ゴール
 
 ## 目標
 - PromptOps運用を習得し、案件に適用
@@ -2397,10 +2707,8 @@ def generate_area_personal(path: Path) -> str:
 ## サポートリソース
 - 書籍/講座:
 - メンター/コミュニティ:
-"""
-        ),
-        'Self-Development/@TODO/learn-system-design.md': format_block(
-            """# TODO: システムデザインを学ぶ
+""",
+    'Self-Development/@TODO/learn-system-design.md': """# TODO: システムデザインを学ぶ
 
 ## 学習ステップ
 - [ ] Grokking System Design 復習
@@ -2418,10 +2726,8 @@ def generate_area_personal(path: Path) -> str:
 ## メモ
 - 苦手ポイント:
 - 対策:
-"""
-        ),
-        'Self-Development/reading-list.md': format_block(
-            """# 読書リスト
+""",
+    'Self-Development/reading-list.md': """# 読書リスト
 
 | 書名 | 著者 | ステータス | メモ |
 |------|------|------------|------|
@@ -2433,19 +2739,20 @@ def generate_area_personal(path: Path) -> str:
 
 ## 気づき
 - 
-"""
-        ),
-    }
-    if rel in notes:
-        return notes[rel]
+""",
+})
+
+
+@ROUTER.route('05_Output/Areas/Personal')
+def generate_area_personal(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Personal').as_posix()
+    if rel in AREA_PERSONAL_NOTES:
+        return AREA_PERSONAL_NOTES[rel]
     raise ValueError(f"Unknown personal area note for {rel}")
 
 
-def generate_area_content_creation(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Content-Creation').as_posix()
-    notes: Dict[str, str] = {
-        'Blog-Writing/00-content-strategy.md': format_block(
-            """# ブログコンテンツ戦略
+AREA_CONTENT_CREATION_NOTES = LazyBlocks({
+    'Blog-Writing/00-content-strategy.md': """# ブログコンテンツ戦略
 
 ## 目的
 - AI/LLM領域の専門性を示し、案件相談とリスト獲得を両立する。
@@ -2462,10 +2769,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## KPI
 - 月4本公開
 - CTA遷移率5%以上
-"""
-        ),
-        'Blog-Writing/@TODO/idea-cursor-vs-copilot.md': format_block(
-            """# TODO: Cursor vs Copilot 記事
+""",
+    'Blog-Writing/@TODO/idea-cursor-vs-copilot.md': """# TODO: Cursor vs Copilot 記事
 
 ## 仮タイトル
 - 「CursorとCopilotをどこで使い分けるか？」
@@ -2481,10 +2786,8 @@ def generate_area_content_creation(path: Path) -> str:
 
 ## CTA
 - ダウンロード資料 or ワークショップ案内
-"""
-        ),
-        'Blog-Writing/@Doing/draft-ai-agent-guide.md': format_block(
-            """# Draft: AI Agent Guide
+""",
+    'Blog-Writing/@Doing/draft-ai-agent-guide.md': """# Draft: AI Agent Guide
 
 ## ステータス
 - 章立て確定 / 事例追記中
@@ -2497,10 +2800,8 @@ def generate_area_content_creation(path: Path) -> str:
 - [ ] Dify実装キャプチャ撮影
 - [ ] 失敗例セクションの原稿
 - [ ] まとめイラスト案
-"""
-        ),
-        'Blog-Writing/Templates/qiita-template.md': format_block(
-            """# Qiita 記事テンプレ
+""",
+    'Blog-Writing/Templates/qiita-template.md': """# Qiita 記事テンプレ
 
 ## タイトル
 
@@ -2516,10 +2817,8 @@ def generate_area_content_creation(path: Path) -> str:
 
 ## ハッシュタグ
 - #ai #cursor など
-"""
-        ),
-        'Blog-Writing/Templates/note-template.md': format_block(
-            """# note 記事テンプレ
+""",
+    'Blog-Writing/Templates/note-template.md': """# note 記事テンプレ
 
 ## イントロ
 - 読者の感情に寄り添うストーリー
@@ -2532,10 +2831,8 @@ def generate_area_content_creation(path: Path) -> str:
 
 ## CTA
 - サービス紹介 or コミュニティ招待
-"""
-        ),
-        'Blog-Writing/@Completed/Qiita/2025/cursor-tips-2025.md': format_block(
-            """# Cursor Tips 2025 — 公開メモ
+""",
+    'Blog-Writing/@Completed/Qiita/2025/cursor-tips-2025.md': """# Cursor Tips 2025 — 公開メモ
 
 ## 公開情報
 - URL: 
@@ -2548,10 +2845,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## 改善メモ
 - 次回は動画も添付する
 - 画像の文字量を減らす
-"""
-        ),
-        'Social-Media/X-Twitter/content-calendar.md': format_block(
-            """# X/Twitter コンテンツカレンダー
+""",
+    'Social-Media/X-Twitter/content-calendar.md': """# X/Twitter コンテンツカレンダー
 
 | 日付 | テーマ | 形式 | CTA | 状況 |
 |------|--------|------|-----|------|
@@ -2561,10 +2856,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## 投稿ルール
 - 週3本
 - 1本はコミュニティ紹介
-"""
-        ),
-        'Social-Media/X-Twitter/@TODO/thread-cursor-tips.md': format_block(
-            """# TODO: スレッド Cursor Tips
+""",
+    'Social-Media/X-Twitter/@TODO/thread-cursor-tips.md': """# TODO: スレッド Cursor Tips
 
 ## 構成案
 1. Hook: 「Cursorだけでここまでできる」
@@ -2580,10 +2873,8 @@ def generate_area_content_creation(path: Path) -> str:
 - [ ] スクリプト作成
 - [ ] キャプチャ
 - [ ] 投稿予約
-"""
-        ),
-        'YouTube-Channel/00-channel-strategy.md': format_block(
-            """# YouTube チャンネル戦略
+""",
+    'YouTube-Channel/00-channel-strategy.md': """# YouTube チャンネル戦略
 
 ## 目的
 - AI×実務の実例で信頼構築
@@ -2601,10 +2892,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## 運用ルール
 - 週1本 + ショート
 - 台本→撮影→編集→公開のリードタイム7日
-"""
-        ),
-        'YouTube-Channel/@TODO/idea-ai-agents-explained.md': format_block(
-            """# TODO: AI Agents Explained
+""",
+    'YouTube-Channel/@TODO/idea-ai-agents-explained.md': """# TODO: AI Agents Explained
 
 ## 企画概要
 - マルチエージェントをわかりやすく紹介
@@ -2618,10 +2907,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## 必要素材
 - フローチャート
 - 画面キャプチャ
-"""
-        ),
-        'YouTube-Channel/@TODO/idea-cursor-shortcuts.md': format_block(
-            """# TODO: Cursor Shortcuts Video
+""",
+    'YouTube-Channel/@TODO/idea-cursor-shortcuts.md': """# TODO: Cursor Shortcuts Video
 
 ## 目的
 - 視聴者の定着率向上
@@ -2633,10 +2920,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## アクション
 - [ ] ショートカット表を更新
 - [ ] 撮影台本作成
-"""
-        ),
-        'YouTube-Channel/@Doing/cursor-advanced-guide/script.md': format_block(
-            """# Script — Cursor Advanced Guide
+""",
+    'YouTube-Channel/@Doing/cursor-advanced-guide/script.md': """# Script — Cursor Advanced Guide
 
 ## 進行状況
 - Hook/Section1完成
@@ -2645,10 +2930,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## リマインド
 - デモ時にAPIキーを伏せる
 - 収録は土曜午前
-"""
-        ),
-        'YouTube-Channel/@Doing/cursor-advanced-guide/notes.md': format_block(
-            """# Notes — Cursor Advanced Guide
+""",
+    'YouTube-Channel/@Doing/cursor-advanced-guide/notes.md': """# Notes — Cursor Advanced Guide
 
 ## 取材メモ
 - Beta UIの差分
@@ -2657,10 +2940,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## TODO
 - [ ] B-rollリスト作成
 - [ ] サムネ文字決定
-"""
-        ),
-        'YouTube-Channel/02-analytics.md': format_block(
-            """# YouTube Analytics
+""",
+    'YouTube-Channel/02-analytics.md': """# YouTube Analytics
 
 | 指標 | 今週 | 先週比 |
 |------|------|--------|
@@ -2671,10 +2952,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## メモ
 - EP01のRetention 60%◎
 - 新サムネABテスト実施予定
-"""
-        ),
-        'YouTube-Channel/@Completed/2025/01-January/cursor-intro-video.md': format_block(
-            """# Completed: Cursor Intro Video
+""",
+    'YouTube-Channel/@Completed/2025/01-January/cursor-intro-video.md': """# Completed: Cursor Intro Video
 
 ## 公開情報
 - 公開日: 2025-01-05
@@ -2688,10 +2967,8 @@ def generate_area_content_creation(path: Path) -> str:
 ## 再利用
 - ショート動画化予定
 - メルマガで台本を配布
-"""
-        ),
-        'YouTube-Channel/01-content-calendar.md': format_block(
-            """# YouTube コンテンツカレンダー
+""",
+    'YouTube-Channel/01-content-calendar.md': """# YouTube コンテンツカレンダー
 
 | 週 | タイトル | 状況 | 備考 |
 |----|----------|------|------|
@@ -2701,19 +2978,20 @@ def generate_area_content_creation(path: Path) -> str:
 ## メモ
 - 旬のアップデートを即反映
 - コラボ企画候補: ○○さん
-"""
-        ),
-    }
-    if rel in notes:
-        return notes[rel]
+""",
+})
+
+
+@ROUTER.route('05_Output/Areas/Content-Creation')
+def generate_area_content_creation(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Content-Creation').as_posix()
+    if rel in AREA_CONTENT_CREATION_NOTES:
+        return AREA_CONTENT_CREATION_NOTES[rel]
     raise ValueError(f"Unknown content-creation note for {rel}")
 
 
-def generate_area_business(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Business').as_posix()
-    notes: Dict[str, str] = {
-        'RIDE-ON-AI/@TODO/next-event-idea.md': format_block(
-            """# TODO: 次回イベント企画
+AREA_BUSINESS_NOTES = LazyBlocks({
+    'RIDE-ON-AI/@TODO/next-event-idea.md': """# TODO: 次回イベント企画
 
 ## テーマ案
 - 「AIエージェントでナレッジ共有を高速化」
@@ -2730,10 +3008,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] 会場/Zoom調整
 - [ ] 集客記事
 - [ ] スピーカー招致
-"""
-        ),
-        'RIDE-ON-AI/Member-Engagement/engagement-tactics.md': format_block(
-            """# エンゲージメント施策
+""",
+    'RIDE-ON-AI/Member-Engagement/engagement-tactics.md': """# エンゲージメント施策
 
 ## 目的
 - 月間アクティブ率60%維持
@@ -2747,10 +3023,8 @@ def generate_area_business(path: Path) -> str:
 - 投稿数
 - コメント数
 - Slack参加率
-"""
-        ),
-        'RIDE-ON-AI/Member-Engagement/member-journeys.md': format_block(
-            """# メンバージャーニー
+""",
+    'RIDE-ON-AI/Member-Engagement/member-journeys.md': """# メンバージャーニー
 
 ## フェーズ
 1. Awareness
@@ -2766,10 +3040,8 @@ def generate_area_business(path: Path) -> str:
 ## 改善メモ
 - Onboarding資料を動画化
 - 参加動機を定期的にヒアリング
-"""
-        ),
-        'RIDE-ON-AI/Partnerships/partnership-strategy.md': format_block(
-            """# パートナー戦略
+""",
+    'RIDE-ON-AI/Partnerships/partnership-strategy.md': """# パートナー戦略
 
 ## 目的
 - 共同イベントと研修パッケージ拡充
@@ -2782,10 +3054,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] 候補企業リスト
 - [ ] 提案資料
 - [ ] 共同LP
-"""
-        ),
-        'RIDE-ON-AI/00-community-strategy.md': format_block(
-            """# コミュニティ戦略
+""",
+    'RIDE-ON-AI/00-community-strategy.md': """# コミュニティ戦略
 
 ## Vision
 - AI活用の実践知を共有し合う場を作る
@@ -2798,10 +3068,8 @@ def generate_area_business(path: Path) -> str:
 - 月次イベント
 - ミニワークショップ
 - メンター制度
-"""
-        ),
-        'RIDE-ON-AI/Events/event-planning.md': format_block(
-            """# イベント計画
+""",
+    'RIDE-ON-AI/Events/event-planning.md': """# イベント計画
 
 ## 開催候補
 - 2/20 オンライン
@@ -2815,10 +3083,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] スピーカー決定
 - [ ] 資料テンプレ共有
 - [ ] 収録テスト
-"""
-        ),
-        'Corporate-Training/Training-Packages/cursor-training-package.md': format_block(
-            """# Cursor Training Package
+""",
+    'Corporate-Training/Training-Packages/cursor-training-package.md': """# Cursor Training Package
 
 ## 概要
 - 2日集中 / 12名まで
@@ -2835,10 +3101,8 @@ def generate_area_business(path: Path) -> str:
 ## 付帯
 - テンプレ集
 - 2週間QA
-"""
-        ),
-        'Corporate-Training/Training-Packages/ai-basics-package.md': format_block(
-            """# AI Basics Package
+""",
+    'Corporate-Training/Training-Packages/ai-basics-package.md': """# AI Basics Package
 
 ## 対象
 - 非エンジニア向け
@@ -2854,20 +3118,16 @@ def generate_area_business(path: Path) -> str:
 ## KPI
 - 満足度4.5/5
 - 活用アイデア10件
-"""
-        ),
-        'Corporate-Training/Training-Packages/custom-package-template.md': format_block(
-            """# カスタム研修テンプレ
+""",
+    'Corporate-Training/Training-Packages/custom-package-template.md': """# カスタム研修テンプレ
 
 - 背景:
 - 目的:
 - 期間/回数:
 - 成果物:
 - 見積:
-"""
-        ),
-        'Corporate-Training/00-service-overview.md': format_block(
-            """# 企業研修サービス概要
+""",
+    'Corporate-Training/00-service-overview.md': """# 企業研修サービス概要
 
 ## 提供メニュー
 - ワークショップ
@@ -2880,10 +3140,8 @@ def generate_area_business(path: Path) -> str:
 ## 差別化
 - 現場のAIワークフローを共創
 - 伴走サポート
-"""
-        ),
-        'Corporate-Training/@TODO/prospect-xyz-corp.md': format_block(
-            """# TODO: Prospect XYZ Corp
+""",
+    'Corporate-Training/@TODO/prospect-xyz-corp.md': """# TODO: Prospect XYZ Corp
 
 ## 状況
 - 問い合わせ済み / 2月提案
@@ -2895,10 +3153,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] ヒアリング日程決め
 - [ ] 提案骨子作成
 - [ ] 見積草案
-"""
-        ),
-        'Corporate-Training/Marketing/sales-materials.md': format_block(
-            """# セールス資料管理
+""",
+    'Corporate-Training/Marketing/sales-materials.md': """# セールス資料管理
 
 ## 必須資料
 - 会社紹介
@@ -2908,10 +3164,8 @@ def generate_area_business(path: Path) -> str:
 ## TODO
 - [ ] 価格表アップデート
 - [ ] 2024事例追記
-"""
-        ),
-        'Corporate-Training/Client-List/clients-database.md': format_block(
-            """# クライアントDB
+""",
+    'Corporate-Training/Client-List/clients-database.md': """# クライアントDB
 
 | 企業 | 担当 | プラン | ステータス |
 |------|------|-------|-----------|
@@ -2920,10 +3174,8 @@ def generate_area_business(path: Path) -> str:
 ## メモ
 - NDA状況
 - 継続契約タイミング
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Curriculum/core-curriculum.md': format_block(
-            """# Core Curriculum
+""",
+    'Survibe-AI-Baib-Coding-School/Curriculum/core-curriculum.md': """# Core Curriculum
 
 ## モジュール
 1. Cursor
@@ -2933,10 +3185,8 @@ def generate_area_business(path: Path) -> str:
 
 ## 改訂メモ
 - Week3演習を刷新する
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/@TODO/marketing-campaign-q2.md': format_block(
-            """# TODO: Q2 マーケキャンペーン
+""",
+    'Survibe-AI-Baib-Coding-School/@TODO/marketing-campaign-q2.md': """# TODO: Q2 マーケキャンペーン
 
 ## 目標
 - リード100件
@@ -2949,10 +3199,8 @@ def generate_area_business(path: Path) -> str:
 ## タスク
 - [ ] ペルソナ整理
 - [ ] LP更新
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/@TODO/new-curriculum-dev.md': format_block(
-            """# TODO: 新カリキュラム開発
+""",
+    'Survibe-AI-Baib-Coding-School/@TODO/new-curriculum-dev.md': """# TODO: 新カリキュラム開発
 
 ## 目的
 - 企業研修向けモジュール追加
@@ -2961,10 +3209,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] 要件ヒアリング
 - [ ] シラバス案
 - [ ] プロトタイプ
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Operations/workflows.md': format_block(
-            """# Operations Workflow
+""",
+    'Survibe-AI-Baib-Coding-School/Operations/workflows.md': """# Operations Workflow
 
 ## 主なプロセス
 - 受講申込〜請求
@@ -2974,10 +3220,8 @@ def generate_area_business(path: Path) -> str:
 ## 自動化候補
 - メールテンプレ送信
 - 受講状況ダッシュボード
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Operations/tools-systems.md': format_block(
-            """# 業務ツール一覧
+""",
+    'Survibe-AI-Baib-Coding-School/Operations/tools-systems.md': """# 業務ツール一覧
 
 | カテゴリ | ツール | 用途 |
 |----------|--------|------|
@@ -2986,10 +3230,8 @@ def generate_area_business(path: Path) -> str:
 
 ## TODO
 - [ ] API連携整理
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Marketing/marketing-strategy.md': format_block(
-            """# マーケティング戦略
+""",
+    'Survibe-AI-Baib-Coding-School/Marketing/marketing-strategy.md': """# マーケティング戦略
 
 ## ペルソナ
 - 企業研修担当
@@ -3003,10 +3245,8 @@ def generate_area_business(path: Path) -> str:
 ## KPI
 - リード/月 120
 - CVR 8%
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/00-business-model.md': format_block(
-            """# ビジネスモデル
+""",
+    'Survibe-AI-Baib-Coding-School/00-business-model.md': """# ビジネスモデル
 
 ## 収益源
 - 受講料
@@ -3021,10 +3261,8 @@ def generate_area_business(path: Path) -> str:
 ## 成功要因
 - 実務に寄り添う教材
 - コミュニティサポート
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Student-Management/alumni-network.md': format_block(
-            """# 卒業生ネットワーク
+""",
+    'Survibe-AI-Baib-Coding-School/Student-Management/alumni-network.md': """# 卒業生ネットワーク
 
 ## 現状
 - Slackコミュニティ 120名
@@ -3035,10 +3273,8 @@ def generate_area_business(path: Path) -> str:
 
 ## TODO
 - [ ] メンター制度ローンチ
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Student-Management/onboarding-process.md': format_block(
-            """# オンボーディングプロセス
+""",
+    'Survibe-AI-Baib-Coding-School/Student-Management/onboarding-process.md': """# オンボーディングプロセス
 
 ## ステップ
 1. 申込確認
@@ -3049,10 +3285,8 @@ def generate_area_business(path: Path) -> str:
 - [ ] Slack招待
 - [ ] LMSアカウント
 - [ ] 教材セット送付
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/Student-Management/support-system.md': format_block(
-            """# サポート体制
+""",
+    'Survibe-AI-Baib-Coding-School/Student-Management/support-system.md': """# サポート体制
 
 ## 連絡手段
 - Slack質問ch
@@ -3064,10 +3298,8 @@ def generate_area_business(path: Path) -> str:
 ## 改善案
 - ナレッジベース化
 - AIボット導入
-"""
-        ),
-        'Survibe-AI-Baib-Coding-School/01-vision-mission.md': format_block(
-            """# Vision / Mission
+""",
+    'Survibe-AI-Baib-Coding-School/01-vision-mission.md': """# Vision / Mission
 
 ## Vision
 - 実務で使えるAIスキルを誰もが持てる社会
@@ -3079,19 +3311,20 @@ def generate_area_business(path: Path) -> str:
 - Hands-on
 - Community
 - Transparency
-"""
-        ),
-    }
-    if rel in notes:
-        return notes[rel]
+""",
+})
+
+
+@ROUTER.route('05_Output/Areas/Business')
+def generate_area_business(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '05_Output/Areas/Business').as_posix()
+    if rel in AREA_BUSINESS_NOTES:
+        return AREA_BUSINESS_NOTES[rel]
     raise ValueError(f"Unknown business area note for {rel}")
 
 
-def generate_project_note(path: Path) -> str:
-    rel = path.relative_to(BASE_DIR / '05_Output/Projects').as_posix()
-    notes: Dict[str, str] = {
-        '@Active/SURVIBE-AI-Dec2025/00-project-overview.md': format_block(
-            """# SURVIBE AI Dec 2025 — Overview
+PROJECT_NOTES = LazyBlocks({
+    '@Active/SURVIBE-AI-Dec2025/00-project-overview.md': """# SURVIBE AI Dec 2025 — Overview
 
 ## 目的
 - 第5期12月コホートを成功させる
@@ -3108,10 +3341,8 @@ def generate_project_note(path: Path) -> str:
 ## 現状
 - カリキュラム60%完成
 - 登壇者調整中
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/01-planning/requirements.md': format_block(
-            """# 要件定義
+""",
+    '@Active/SURVIBE-AI-Dec2025/01-planning/requirements.md': """# 要件定義
 
 ## 受講者像
 - 業務でAIを使い始めたエンジニア
@@ -3125,10 +3356,8 @@ def generate_project_note(path: Path) -> str:
 
 ## メモ
 - LMSログイン体験を改善
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/01-planning/stakeholders.md': format_block(
-            """# ステークホルダー
+""",
+    '@Active/SURVIBE-AI-Dec2025/01-planning/stakeholders.md': """# ステークホルダー
 
 | 役割 | 名前 | メモ |
 |------|------|------|
@@ -3139,10 +3368,8 @@ def generate_project_note(path: Path) -> str:
 ## コミュニケーション
 - 週次MTG
 - Slackチャンネル
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/01-planning/timeline.md': format_block(
-            """# タイムライン
+""",
+    '@Active/SURVIBE-AI-Dec2025/01-planning/timeline.md': """# タイムライン
 
 | 週 | マイルストーン |
 |----|---------------|
@@ -3154,10 +3381,8 @@ def generate_project_note(path: Path) -> str:
 ## リスク
 - 登壇者調整
 - プロダクトアップデート
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/02-curriculum/week1-cursor-basics.md': format_block(
-            """# Week1 — Cursor Basics
+""",
+    '@Active/SURVIBE-AI-Dec2025/02-curriculum/week1-cursor-basics.md': """# Week1 — Cursor Basics
 
 ## 目標
 - Cursorの環境構築と基本操作を習得
@@ -3173,10 +3398,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 改善メモ
 - 動画教材を追加
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/02-curriculum/week2-dify-agents.md': format_block(
-            """# Week2 — Dify Agents
+""",
+    '@Active/SURVIBE-AI-Dec2025/02-curriculum/week2-dify-agents.md': """# Week2 — Dify Agents
 
 ## 目標
 - Difyでエージェントを構築し、ワークフロー化する
@@ -3188,10 +3411,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 宿題
 - 自社の業務を題材にBotを作る
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/02-curriculum/week3-prompting.md': format_block(
-            """# Week3 — Prompting
+""",
+    '@Active/SURVIBE-AI-Dec2025/02-curriculum/week3-prompting.md': """# Week3 — Prompting
 
 ## 目標
 - プロンプト設計と評価を実践
@@ -3203,10 +3424,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 宿題
 - 3パターンのプロンプト比較
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/02-curriculum/week4-final-project.md': format_block(
-            """# Week4 — Final Project
+""",
+    '@Active/SURVIBE-AI-Dec2025/02-curriculum/week4-final-project.md': """# Week4 — Final Project
 
 ## 目標
 - 個人/チームでAIプロダクトを仕上げる
@@ -3218,10 +3437,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 評価
 - 価値 / 実装 / プレゼン
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/05-review-feedback/student-feedback.md': format_block(
-            """# 受講生フィードバック
+""",
+    '@Active/SURVIBE-AI-Dec2025/05-review-feedback/student-feedback.md': """# 受講生フィードバック
 
 | 質問 | 平均 | コメント |
 |------|------|----------|
@@ -3230,10 +3447,8 @@ def generate_project_note(path: Path) -> str:
 
 ## メモ
 - 
-"""
-        ),
-        '@Active/SURVIBE-AI-Dec2025/05-review-feedback/improvements.md': format_block(
-            """# 改善点
+""",
+    '@Active/SURVIBE-AI-Dec2025/05-review-feedback/improvements.md': """# 改善点
 
 ## 優先度A
 - Week2資料のアップデート
@@ -3243,10 +3458,8 @@ def generate_project_note(path: Path) -> str:
 
 ## アクション
 - [ ] カリキュラム会議
-"""
-        ),
-        '@Active/Corporate-Training-ABC-Corp/00-client-brief.md': format_block(
-            """# Client Brief — ABC Corp
+""",
+    '@Active/Corporate-Training-ABC-Corp/00-client-brief.md': """# Client Brief — ABC Corp
 
 ## 背景
 - カスタマーサクセス部向けAI研修
@@ -3259,10 +3472,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 期待成果
 - マクロ＋LLM活用シナリオ
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/00-series-plan.md': format_block(
-            """# YouTube Cursor Series Plan
+""",
+    '@Active/YouTube-Cursor-Series/00-series-plan.md': """# YouTube Cursor Series Plan
 
 ## エピソード
 - EP01: Intro
@@ -3275,10 +3486,8 @@ def generate_project_note(path: Path) -> str:
 
 ## KPI
 - 再生数10k/本
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/01-scripts/ep01-intro-to-cursor.md': format_block(
-            """# Script EP01 — Intro to Cursor
+""",
+    '@Active/YouTube-Cursor-Series/01-scripts/ep01-intro-to-cursor.md': """# Script EP01 — Intro to Cursor
 
 ## 目的
 - Cursorの魅力を短時間で伝える
@@ -3291,10 +3500,8 @@ def generate_project_note(path: Path) -> str:
 
 ## メモ
 - 収録日: 
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/01-scripts/ep02-basic-features.md': format_block(
-            """# Script EP02 — Basic Features
+""",
+    '@Active/YouTube-Cursor-Series/01-scripts/ep02-basic-features.md': """# Script EP02 — Basic Features
 
 ## トピック
 - AIチャット
@@ -3303,10 +3510,8 @@ def generate_project_note(path: Path) -> str:
 
 ## TODO
 - [ ] デモ用レポ作成
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/01-scripts/ep03-advanced-tips.md': format_block(
-            """# Script EP03 — Advanced Tips
+""",
+    '@Active/YouTube-Cursor-Series/01-scripts/ep03-advanced-tips.md': """# Script EP03 — Advanced Tips
 
 ## ハイライト
 - プロンプトチェーン
@@ -3314,10 +3519,8 @@ def generate_project_note(path: Path) -> str:
 
 ## メモ
 - 成功パターンの比較表を挿入
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/01-scripts/ep04-real-world-demo.md': format_block(
-            """# Script EP04 — Real-world Demo
+""",
+    '@Active/YouTube-Cursor-Series/01-scripts/ep04-real-world-demo.md': """# Script EP04 — Real-world Demo
 
 ## 内容
 - Todoアプリをゼロから構築
@@ -3329,10 +3532,8 @@ def generate_project_note(path: Path) -> str:
 
 ## 留意点
 - 画面切替のタイミング
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/03-editing/ep01-edit-notes.md': format_block(
-            """# Editing Notes — EP01
+""",
+    '@Active/YouTube-Cursor-Series/03-editing/ep01-edit-notes.md': """# Editing Notes — EP01
 
 ## 編集チェック
 - BGM音量 -5db
@@ -3341,10 +3542,8 @@ def generate_project_note(path: Path) -> str:
 ## 修正
 - 0:45 カット
 - 2:10 テロップ追加
-"""
-        ),
-        '@Active/YouTube-Cursor-Series/04-published/ep01-analytics.md': format_block(
-            """# EP01 Analytics
+""",
+    '@Active/YouTube-Cursor-Series/04-published/ep01-analytics.md': """# EP01 Analytics
 
 ## 公開日
 - 2025-01-07
@@ -3357,10 +3556,8 @@ def generate_project_note(path: Path) -> str:
 ## 学び
 - サムネ成功
 - CTA位置を前倒ししたい
-"""
-        ),
-        '@Planning/new-course-idea.md': format_block(
-            """# 新コースアイデア
+""",
+    '@Planning/new-course-idea.md': """# 新コースアイデア
 
 ## コンセプト
 - 「AIオペレーション実践講座」
@@ -3374,10 +3571,8 @@ def generate_project_note(path: Path) -> str:
 ## 次ステップ
 - [ ] 競合調査
 - [ ] サーベイ
-"""
-        ),
-        '@Planning/youtube-series-prompting.md': format_block(
-            """# YouTube Prompting Series
+""",
+    '@Planning/youtube-series-prompting.md': """# YouTube Prompting Series
 
 ## 目的
 - Prompt設計ノウハウを体系化
@@ -3390,11 +3585,17 @@ def generate_project_note(path: Path) -> str:
 ## タスク
 - [ ] 台本構成
 - [ ] サムネ案
-"""
-        ),
-    }
-    if rel in notes:
-        return notes[rel]
+""",
+})
+
+
+@ROUTER.route('05_Output/Projects')
+def generate_project_note(path: Path) -> str:
+    rel = path.relative_to(BASE_DIR / '05_Output/Projects').as_posix()
+    if rel in PROJECT_NOTES:
+        return PROJECT_NOTES[rel]
     raise ValueError(f"Unknown project note for {rel}")
+
+
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
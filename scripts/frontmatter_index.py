@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Columnar index of every note's YAML frontmatter, read from the header bytes only."""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Set, Tuple
+
+import fill_empty_files as fill
+
+FRONTMATTER_INDEX_PATH = fill.BASE_DIR / '.cache' / 'frontmatter.json'
+FRONTMATTER_INDEX_VERSION = 1
+# A header longer than this is treated as unterminated rather than read to the end of a large note.
+HEADER_LIMIT = 64 * 1024
+
+
+def parse_scalar(raw: str) -> Any:
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'':
+        return raw[1:-1]
+    if raw.startswith('[') and raw.endswith(']'):
+        return [parse_scalar(item) for item in raw[1:-1].split(',') if item.strip()]
+    lowered = raw.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    if lowered in ('', 'null', '~'):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def parse_frontmatter(lines: List[str]) -> Tuple[Dict[str, Any], int]:
+    # The YAML the vault actually uses: scalars, [inline, lists] and "- item" block lists.
+    # Returns the fields and the index of the first body line.
+    if not lines or lines[0].strip() != '---':
+        return {}, 0
+    fields: Dict[str, Any] = {}
+    key: Optional[str] = None
+    for number, line in enumerate(lines[1:], 1):
+        stripped = line.strip()
+        if stripped == '---':
+            return fields, number + 1
+        if key is not None and stripped.startswith('- '):
+            if not isinstance(fields.get(key), list):
+                fields[key] = []
+            fields[key].append(parse_scalar(stripped[2:]))
+            continue
+        name, sep, value = line.partition(':')
+        if sep and name.strip() and not name.startswith((' ', '\t')):
+            key = name.strip()
+            fields[key] = parse_scalar(value)
+    return {}, 0  # unterminated: Obsidian treats it as body text too
+
+
+def header_lines(handle: BinaryIO) -> List[bytes]:
+    # Raw lines of a terminated frontmatter block, both '---' included, or [] when there is
+    # none. Reads line by line and stops at the closing '---', so the body is never read;
+    # afterwards handle.tell() is the offset where the body starts.
+    lines: List[bytes] = []
+    consumed = 0
+    while consumed < HEADER_LIMIT:
+        raw = handle.readline(HEADER_LIMIT - consumed)
+        if not raw:
+            break
+        consumed += len(raw)
+        lines.append(raw)
+        if raw.strip() == b'---':
+            if len(lines) > 1:
+                return lines
+        elif len(lines) == 1:
+            break
+    return []
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as handle:
+        lines = header_lines(handle)
+    text = [line.decode('utf-8', errors='replace').rstrip('\r\n') for line in lines]
+    return parse_frontmatter(text)[0]
+
+
+def _matches(value: Any, wanted: Any) -> bool:
+    # List-valued keys such as tags match when any element does; YAML turns 2025 into an int.
+    if isinstance(value, list):
+        return any(_matches(item, wanted) for item in value)
+    return value == wanted or (value is not None and str(value) == str(wanted))
+
+
+class FrontmatterIndex:
+    """Frontmatter stored column-wise: one list per key, aligned with the sorted note paths.
+
+    A query touches only the columns it filters on. Headers are re-read only for notes whose
+    mtime or size changed; everything else is carried over row by row from the cache.
+    """
+
+    def __init__(self, root: Path = fill.BASE_DIR, path: Optional[Path] = None) -> None:
+        self.root = root
+        self.path = path or root / '.cache' / FRONTMATTER_INDEX_PATH.name
+        self.paths: List[str] = []
+        self.stats: List[List[int]] = []
+        self.columns: Dict[str, List[Any]] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == FRONTMATTER_INDEX_VERSION:
+            self.paths, self.stats, self.columns = data['paths'], data['stats'], data['columns']
+
+    def update(self, notes: Optional[Iterable[fill.NoteStat]] = None) -> int:
+        previous = {rel: row for row, rel in enumerate(self.paths)}
+        paths: List[str] = []
+        stats: List[List[int]] = []
+        rows: List[Tuple[Optional[int], Dict[str, Any]]] = []
+        changed = 0
+        for rel, mtime_ns, size in fill.iter_notes(self.root) if notes is None else notes:
+            row = previous.get(rel)
+            if row is not None and self.stats[row][0] == mtime_ns and self.stats[row][1] == size:
+                rows.append((row, {}))
+            else:
+                try:
+                    fields = read_header(self.root / rel)
+                except FileNotFoundError:
+                    continue
+                rows.append((None, fields))
+                changed += 1
+            paths.append(rel)
+            stats.append([mtime_ns, size])
+        if not changed and paths == self.paths:
+            return 0
+        keys: Set[str] = set(self.columns)
+        for _, fields in rows:
+            keys.update(fields)
+        columns: Dict[str, List[Any]] = {}
+        for key in sorted(keys):
+            old = self.columns.get(key)
+            column = [
+                (old[row] if old is not None else None) if row is not None else fields.get(key)
+                for row, fields in rows
+            ]
+            if any(value is not None for value in column):
+                columns[key] = column
+        self.paths, self.stats, self.columns = paths, stats, columns
+        self._dirty = True
+        return changed
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': FRONTMATTER_INDEX_VERSION,
+            'paths': self.paths,
+            'stats': self.stats,
+            'columns': self.columns,
+        }
+        fill.NoteWriter().write(self.path, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+        self._dirty = False
+
+    def column(self, key: str) -> List[Any]:
+        return self.columns.get(key) or [None] * len(self.paths)
+
+    def equals(self, key: str, value: Any) -> Set[int]:
+        return {row for row, item in enumerate(self.column(key)) if item is not None and _matches(item, value)}
+
+    def between(self, key: str, low: Any, high: Any) -> Set[int]:
+        # ISO dates compare correctly as strings, so 'weeks between A and B' is a column scan.
+        rows = set()
+        for row, item in enumerate(self.column(key)):
+            if item is None or isinstance(item, (list, bool)):
+                continue
+            try:
+                if low <= item <= high:
+                    rows.add(row)
+            except TypeError:
+                if low <= str(item) <= high:
+                    rows.add(row)
+        return rows
+
+    def with_key(self, key: str) -> Set[int]:
+        return {row for row, item in enumerate(self.column(key)) if item is not None}
+
+    def rows(self, selected: Iterable[int], keys: Iterable[str]) -> List[Dict[str, Any]]:
+        keys = list(keys)
+        return [
+            dict({'path': self.paths[row]}, **{key: self.column(key)[row] for key in keys})
+            for row in sorted(selected)
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tag', action='append', default=[], help='only notes whose tags include TAG (repeatable)')
+    parser.add_argument(
+        '--where',
+        action='append',
+        default=[],
+        metavar='KEY=VALUE',
+        help='only notes whose KEY equals VALUE, e.g. archived=true (repeatable)',
+    )
+    parser.add_argument(
+        '--between',
+        action='append',
+        nargs=3,
+        default=[],
+        metavar=('KEY', 'LOW', 'HIGH'),
+        help='only notes whose KEY lies in [LOW, HIGH], e.g. start 2025-01-01 2025-03-31 (repeatable)',
+    )
+    parser.add_argument('--has', action='append', default=[], metavar='KEY', help='only notes that set KEY')
+    parser.add_argument('--show', default='', metavar='KEYS', help='comma-separated keys to print with each path')
+    parser.add_argument('--keys', action='store_true', help='list the indexed keys with how many notes set each')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per note')
+    args = parser.parse_args(argv)
+    index = FrontmatterIndex()
+    started = time.perf_counter()
+    changed = index.update()
+    elapsed = (time.perf_counter() - started) * 1000
+    index.save()
+    print(f"Indexed {changed} changed headers of {len(index.paths)} notes in {elapsed:.1f} ms", file=sys.stderr)
+    if args.keys:
+        for key, column in index.columns.items():
+            print(f"{key}\t{sum(value is not None for value in column)}")
+        return 0
+    started = time.perf_counter()
+    selected = set(range(len(index.paths)))
+    for tag in args.tag:
+        selected &= index.equals('tags', tag.lstrip('#'))
+    for condition in args.where:
+        key, sep, value = condition.partition('=')
+        if not sep:
+            parser.error(f"--where expects KEY=VALUE, got {condition}")
+        selected &= index.equals(key, parse_scalar(value))
+    for key, low, high in args.between:
+        selected &= index.between(key, parse_scalar(low), parse_scalar(high))
+    for key in args.has:
+        selected &= index.with_key(key)
+    keys = [key for key in args.show.split(',') if key]
+    results = index.rows(selected, keys)
+    elapsed = (time.perf_counter() - started) * 1000
+    for result in results:
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            print('\t'.join([result['path']] + [json.dumps(result[key], ensure_ascii=False) for key in keys]))
+    print(f"{len(results)} notes in {elapsed:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
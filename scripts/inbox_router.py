@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Route 01_Inbox notes to their destination folders and keep every link to them working."""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import fill_empty_files as fill
+from frontmatter_index import read_header
+from link_graph import LinkIndex, relink
+
+INBOX_DIR = '01_Inbox'
+PROJECTS_DIR = '05_Output/Projects/@Active'
+AREAS_DIR = '05_Output/Areas'
+MEMORY_DIR = '04_Memory'
+INPUT_DIR = '03_Input'
+# The decision flow of nightly-batch-process.md, checked in this order.
+TIERS = ('project', 'area', 'memory', 'input', 'daily')
+# Frontmatter that names the destination outright.
+EXPLICIT_KEYS = {'project': 'project', 'area': 'area', 'category': 'memory'}
+INPUT_TAGS = frozenset({'input', 'reference', 'this-week'})
+DATE_PREFIX_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+# A destination must share at least one term that no more than two destinations use.
+MIN_SCORE = 0.5
+
+
+def note_terms(tokens: Iterable[str]) -> Set[str]:
+    # The slug-token machinery of the generators: stems plus the catalog keys they resolve to.
+    tokens = [token for token in tokens if len(token) > 1 and not token.isdigit()]
+    return {fill.stem_token(token) for token in tokens} | set(fill.token_index().resolve(tokens))
+
+
+def _plain(value: Any) -> str:
+    # "[[SURVIBE-AI-Dec2025]]" and "SURVIBE-AI-Dec2025" name the same destination.
+    return str(value).strip().strip('[]').rpartition('|')[0 if '|' in str(value) else 2].lower()
+
+
+@dataclass(frozen=True)
+class Destination:
+    tier: str
+    name: str
+    folder: str
+    terms: FrozenSet[str]
+
+
+@dataclass
+class Route:
+    source: str
+    target: Optional[str]
+    reason: str
+
+
+class InboxRouter:
+    """Classifies inbox notes against the vault's own projects, areas and memory categories."""
+
+    def __init__(self, root: Path = fill.BASE_DIR) -> None:
+        self.root = root
+        self.destinations: List[Destination] = []
+        for name in self._folders(PROJECTS_DIR):
+            self._add('project', name, f'{PROJECTS_DIR}/{name}')
+        for group in self._folders(AREAS_DIR):
+            for name in self._folders(f'{AREAS_DIR}/{group}'):
+                self._add('area', name, f'{AREAS_DIR}/{group}/{name}/@TODO')
+        for category in self._folders(MEMORY_DIR):
+            self._add('memory', category, f'{MEMORY_DIR}/{category}')
+            for name in self._folders(f'{MEMORY_DIR}/{category}'):
+                self._add('memory', name, f'{MEMORY_DIR}/{category}/{name}')
+        # Terms most destinations share ('ai', 'business') say little about any one of them.
+        counts: Dict[str, int] = {}
+        for destination in self.destinations:
+            for term in destination.terms:
+                counts[term] = counts.get(term, 0) + 1
+        self.weights = {term: 1 / count for term, count in counts.items()}
+
+    def _folders(self, rel: str) -> List[str]:
+        try:
+            with os.scandir(self.root / rel) as entries:
+                names = [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(('.', '@', '_'))]
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name not in fill.PRUNED_DIR_NAMES)
+
+    def _add(self, tier: str, name: str, folder: str) -> None:
+        self.destinations.append(Destination(tier, name, folder, frozenset(note_terms(fill.slug_tokens(name)))))
+
+    def classify(self, rel: str) -> Route:
+        name = rel.rpartition('/')[2]
+        fields = read_header(self.root / rel)
+        tags = fields.get('tags') or []
+        tags = [str(tag).lstrip('#').lower() for tag in (tags if isinstance(tags, list) else [tags])]
+        for key, tier in EXPLICIT_KEYS.items():
+            if fields.get(key):
+                wanted = _plain(fields[key])
+                for destination in self.destinations:
+                    if destination.tier == tier and destination.name.lower() == wanted:
+                        return Route(rel, f'{destination.folder}/{name}', f'{key}: {destination.name}')
+        tokens = fill.slug_tokens(name[:-3]) + [part for tag in tags for part in re.split(r'[-_/]', tag)]
+        terms = note_terms(tokens)
+        for tier in TIERS:
+            if tier == 'input':
+                if INPUT_TAGS.intersection(tags):
+                    return Route(rel, f'{INPUT_DIR}/{name}', 'tagged as input')
+                continue
+            if tier == 'daily':
+                day = DATE_PREFIX_RE.match(name)
+                if day is not None:
+                    year, month, _ = day.groups()
+                    folder = f'02_Daily/{year}/{year}-{month}/{day.group(0)}'
+                    return Route(rel, f'{folder}/{name}', 'dated note')
+                continue
+            scored = [
+                (sum(self.weights[term] for term in destination.terms & terms), destination)
+                for destination in self.destinations
+                if destination.tier == tier
+            ]
+            score, best = max(scored, key=lambda item: item[0], default=(0.0, None))
+            if best is not None and score >= MIN_SCORE:
+                shared = ', '.join(sorted(best.terms & terms))
+                return Route(rel, f'{best.folder}/{name}', f'{tier} {best.name} ({shared})')
+        return Route(rel, None, 'no matching destination')
+
+
+def move_notes(routes: List[Route], writer: fill.NoteWriter, root: Path = fill.BASE_DIR) -> Tuple[Dict[str, str], List[str]]:
+    # Grouped by destination: one mkdir per folder, then plain renames inside the vault.
+    moves: Dict[str, str] = {}
+    failures: List[str] = []
+    by_folder: Dict[str, List[Route]] = {}
+    for route in routes:
+        if route.target is not None:
+            by_folder.setdefault(route.target.rpartition('/')[0], []).append(route)
+    fill.make_dirs([root / folder for folder in by_folder], root)
+    for folder, batch in sorted(by_folder.items()):
+        for route in batch:
+            try:
+                writer.rename(root / route.source, root / route.target)
+            except OSError as exc:
+                failures.append(f"Failed {route.source}: {exc}")
+                continue
+            moves[route.source] = route.target
+    return moves, failures
+
+
+def route_inbox(
+    notes: List[fill.NoteStat],
+    sources: Iterable[str],
+    writer: fill.NoteWriter,
+    root: Path = fill.BASE_DIR,
+    dry_run: bool = False,
+) -> Tuple[List[Route], Dict[str, str], List[str], List[str]]:
+    """Classify and move sources, then fix links; notes is the vault listing before the moves.
+
+    Returns the routes, the moves made, the notes whose links were rewritten and failures.
+    """
+    router = InboxRouter(root)
+    routes = [router.classify(rel) for rel in sources]
+    if dry_run or not any(route.target for route in routes):
+        return routes, {}, [], []
+    index = LinkIndex(root)
+    index.update(notes)
+    moves, failures = move_notes(routes, writer, root)
+    rewritten = relink(index, moves, writer) if moves else []
+    # The listing only changed where notes moved or were rewritten; no second walk.
+    index.update(fill.update_listing(notes, list(moves.values()) + rewritten, moves, root))
+    index.save()
+    return routes, moves, rewritten, failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('notes', nargs='*', metavar='NOTE', help='inbox notes to route (default: all of them)')
+    parser.add_argument('--dry-run', action='store_true', help='print where each note would go without moving it')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per routed note')
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    notes = list(fill.iter_notes())
+    inbox = [rel for rel, _, _ in notes if rel.startswith(INBOX_DIR + '/')]
+    for rel in args.notes:
+        if rel not in inbox:
+            parser.error(f"{rel} is not a note in {INBOX_DIR}")
+    writer = fill.NoteWriter(batch_fsync=True)
+    routes, moves, rewritten, failures = route_inbox(notes, args.notes or inbox, writer, dry_run=args.dry_run)
+    writer.flush()
+    elapsed = (time.perf_counter() - started) * 1000
+    for route in routes:
+        if args.json:
+            print(json.dumps(dict(route.__dict__, moved=route.source in moves), ensure_ascii=False))
+        elif route.target is None:
+            print(f"Kept {route.source}: {route.reason}")
+        else:
+            verb = 'Would move' if args.dry_run else 'Moved' if route.source in moves else 'Skipped'
+            print(f"{verb} {route.source} -> {route.target} ({route.reason})")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    print(
+        f"Routed {len(moves)} of {len(routes)} inbox notes, rewrote links in {len(rewritten)} notes, "
+        f"{len(failures)} failed ({elapsed:.1f} ms)",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Build the vault's wikilink graph and report broken links, orphan notes and backlinks."""
+from __future__ import annotations
+
+import argparse
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import posixpath
+import re
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import fill_empty_files as fill
+
+LINK_INDEX_PATH = fill.BASE_DIR / '.cache' / 'link_graph.json'
+LINK_INDEX_VERSION = 1
+WIKILINK_RE = re.compile(r'(!?)\[\[([^\[\]\n]+?)\]\]')
+INLINE_CODE_RE = re.compile(r'`[^`\n]*`')
+CODE_SPAN_RE = re.compile(r'(`[^`\n]*`)')
+# Where the path in a link body ends: heading, block reference or alias ('\|' inside tables).
+TARGET_END_RE = re.compile(r'\\\||[|#^]')
+# Templates keep placeholders such as [[{{date}}]] that only become links once instantiated.
+PLACEHOLDER_MARKERS = ('{{', '<%')
+TEMPLATES_DIR = '06_Templates'
+# The numbered folders of a vault. A top-level folder holding one of them is a nested vault
+# (Sample2025YK/) whose links are resolved and rewritten only among its own notes.
+VAULT_FOLDERS = frozenset(
+    {'00_Memo', '01_Inbox', '02_Daily', '03_Input', '04_Memory', '05_Output', '06_Templates', '07_System', '99_Archive'}
+)
+
+
+def parse_links(lines: Iterable[str]) -> List[str]:
+    # Raw link bodies in document order, embeds prefixed with '!'. Code never links, and
+    # neither do the copies in a materialized dashboard section.
+    links: List[str] = []
+    fenced = False
+    for _, line in fill.outside_materialized(lines):
+        if line.lstrip().startswith(('```', '~~~')):
+            fenced = not fenced
+            continue
+        if fenced or '[[' not in line:
+            continue
+        for embed, body in WIKILINK_RE.findall(INLINE_CODE_RE.sub('', line)):
+            if not any(marker in body for marker in PLACEHOLDER_MARKERS):
+                links.append(embed + body)
+    return links
+
+
+def link_target(raw: str) -> str:
+    # [[path#Heading|Alias]], [[path^block]] and ![[path]] all point at 'path'. Inside
+    # tables the alias pipe is written as '\|'.
+    body = raw.lstrip('!').replace('\\|', '|').split('|', 1)[0]
+    target = re.split(r'[#^]', body, 1)[0].strip()
+    return target[:-3] if target.lower().endswith('.md') else target
+
+
+def vault_trees(paths: Iterable[str]) -> Set[str]:
+    # Nested vaults as 'Sample2025YK/' prefixes; the notes outside all of them form tree ''.
+    trees: Set[str] = set()
+    for path in paths:
+        parts = path.split('/', 2)
+        if len(parts) == 3 and parts[1] in VAULT_FOLDERS and parts[0] not in VAULT_FOLDERS:
+            trees.add(parts[0] + '/')
+    return trees
+
+
+def tree_of(path: str, trees: Set[str]) -> str:
+    head = path.partition('/')[0] + '/'
+    return head if head in trees else ''
+
+
+def is_template(path: str) -> bool:
+    return TEMPLATES_DIR in path.split('/')[:-1]
+
+
+class LinkResolver:
+    """Resolves link targets the way Obsidian does: relative path, then vault path, then the
+    closest note whose path ends with the target (same folder first, then the shortest path).
+
+    With tree set, vault paths are read relative to that nested vault.
+    """
+
+    def __init__(self, paths: Iterable[str], tree: str = '') -> None:
+        self.tree = tree
+        self._by_path: Dict[str, str] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        for path in paths:
+            stem = path[:-3].lower()
+            self._by_path[stem] = path
+            self._by_name.setdefault(stem.rpartition('/')[2], []).append(path)
+
+    def resolve(self, target: str, source: str) -> Optional[str]:
+        folder = source.rpartition('/')[0]
+        key = target.lower()
+        if key.startswith(('./', '../')):
+            return self._by_path.get(posixpath.normpath(posixpath.join(folder.lower(), key)))
+        exact = self._by_path.get(self.tree.lower() + key.lstrip('/'))
+        if exact is not None:
+            return exact
+        candidates = [
+            path
+            for path in self._by_name.get(key.rpartition('/')[2], ())
+            if '/' not in key or path[:-3].lower().endswith('/' + key)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda path: (path.rpartition('/')[0] != folder, path.count('/'), path))
+
+
+def is_attachment(target: str) -> bool:
+    # ![[diagram.png]] and [[slides.pdf]] point at files outside the note graph.
+    suffix = posixpath.splitext(target)[1]
+    return bool(suffix) and suffix[1:].isalnum() and not suffix[1:].isdigit()
+
+
+def _csr(count: int, edges: List[Tuple[int, int]]) -> Tuple[array, array]:
+    # Compressed sparse rows: the neighbours of node i are targets[offsets[i]:offsets[i + 1]].
+    offsets = array('I', bytes(4 * (count + 1)))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for index in range(count):
+        offsets[index + 1] += offsets[index]
+    targets = array('I', bytes(4 * len(edges)))
+    cursor = offsets[:-1]
+    for source, target in sorted(edges):
+        targets[cursor[source]] = target
+        cursor[source] += 1
+    return offsets, targets
+
+
+class LinkGraph:
+    """Forward links and backlinks between notes, held as two CSR array pairs over note ids."""
+
+    def __init__(self, paths: List[str], edges: List[Tuple[int, int]]) -> None:
+        self.paths = paths
+        self.ids = {path: index for index, path in enumerate(paths)}
+        self._out = _csr(len(paths), edges)
+        self._in = _csr(len(paths), [(target, source) for source, target in edges])
+
+    def _neighbours(self, csr: Tuple[array, array], path: str) -> List[str]:
+        offsets, targets = csr
+        index = self.ids[path]
+        return [self.paths[target] for target in targets[offsets[index]:offsets[index + 1]]]
+
+    def links(self, path: str) -> List[str]:
+        return self._neighbours(self._out, path)
+
+    def backlinks(self, path: str) -> List[str]:
+        return self._neighbours(self._in, path)
+
+    def orphans(self) -> List[str]:
+        out_offsets, in_offsets = self._out[0], self._in[0]
+        return [
+            path
+            for index, path in enumerate(self.paths)
+            if out_offsets[index] == out_offsets[index + 1] and in_offsets[index] == in_offsets[index + 1]
+        ]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._out[1])
+
+
+@dataclass
+class BrokenLink:
+    source: str
+    raw: str
+
+    def format(self) -> str:
+        return f"{self.source}: [[{self.raw.lstrip('!')}]]"
+
+
+class LinkIndex:
+    """Raw links of every note, cached in .cache and re-parsed only for notes whose mtime changed.
+
+    Resolution is redone on every build because adding or renaming one note can fix or break
+    links anywhere in the vault; it is dictionary lookups only, so it stays cheap.
+    """
+
+    def __init__(self, root: Path = fill.BASE_DIR, path: Optional[Path] = None) -> None:
+        self.root = root
+        self.path = path or root / '.cache' / LINK_INDEX_PATH.name
+        self.notes: Dict[str, list] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == LINK_INDEX_VERSION:
+            self.notes = data['notes']
+
+    def update(self, notes: Optional[Iterable[fill.NoteStat]] = None) -> int:
+        current: Dict[str, list] = {}
+        changed = 0
+        for rel, mtime_ns, size in fill.iter_notes(self.root) if notes is None else notes:
+            entry = self.notes.get(rel)
+            if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                try:
+                    with open(self.root / rel, encoding='utf-8', errors='replace') as handle:
+                        entry = [mtime_ns, size, parse_links(handle)]
+                except FileNotFoundError:
+                    continue
+                changed += 1
+            current[rel] = entry
+        self._dirty = self._dirty or changed > 0 or len(current) != len(self.notes)
+        self.notes = current
+        return changed
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'version': LINK_INDEX_VERSION, 'notes': self.notes}
+        fill.NoteWriter().write(self.path, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+        self._dirty = False
+
+    def build(self) -> Tuple[LinkGraph, List[BrokenLink]]:
+        paths = sorted(self.notes)
+        resolver = LinkResolver(paths)
+        ids = {path: index for index, path in enumerate(paths)}
+        edges = set()
+        broken: List[BrokenLink] = []
+        for source in paths:
+            for raw in self.notes[source][2]:
+                target = link_target(raw)
+                if not target:
+                    continue  # [[#Heading]] points into the note itself
+                resolved = resolver.resolve(target, source)
+                if resolved is None:
+                    if not is_attachment(target):
+                        broken.append(BrokenLink(source, raw))
+                elif resolved != source:
+                    edges.add((ids[source], ids[resolved]))
+        return LinkGraph(paths, list(edges)), broken
+
+
+def retarget(body: str, target: str) -> str:
+    # Swap the path in 'path#Heading|Alias' and keep everything after it.
+    end = TARGET_END_RE.search(body)
+    return target + (body[end.start():] if end else '')
+
+
+def rewrite_links(text: str, replace: Callable[[str], Optional[str]]) -> str:
+    # replace() sees the same raw links parse_links() reports and returns a new path, or None
+    # to keep the link; fences, inline code and template placeholders are left untouched.
+    def substitute(match: re.Match[str]) -> str:
+        embed, body = match.groups()
+        if any(marker in body for marker in PLACEHOLDER_MARKERS):
+            return match.group(0)
+        target = replace(embed + body)
+        return match.group(0) if target is None else f'{embed}[[{retarget(body, target)}]]'
+
+    lines = text.split('\n')
+    fenced = False
+    for number, line in enumerate(lines):
+        if line.lstrip().startswith(('```', '~~~')):
+            fenced = not fenced
+            continue
+        if fenced or '[[' not in line:
+            continue
+        # Odd pieces are inline code spans.
+        pieces = CODE_SPAN_RE.split(line)
+        pieces[::2] = [WIKILINK_RE.sub(substitute, piece) for piece in pieces[::2]]
+        lines[number] = ''.join(pieces)
+    return '\n'.join(lines)
+
+
+def _tree_resolvers(paths: Iterable[str], trees: Set[str]) -> Dict[str, LinkResolver]:
+    grouped: Dict[str, List[str]] = {}
+    for path in paths:
+        grouped.setdefault(tree_of(path, trees), []).append(path)
+    return {tree: LinkResolver(group, tree) for tree, group in grouped.items()}
+
+
+def relink(index: LinkIndex, moves: Dict[str, str], writer: fill.NoteWriter) -> List[str]:
+    """Rewrite the links that a batch of moves would break, reading each affected note once.
+
+    index must still describe the vault before the moves. A link is rewritten only when it
+    no longer resolves to the same note, and then to the shortest form that does. Links are
+    resolved within the source's own vault tree, and templates are never rewritten: their
+    links only take effect in the notes made from them. Returns the rewritten notes by their
+    new paths.
+    """
+    trees = vault_trees(index.notes)
+    old_resolvers = _tree_resolvers(index.notes, trees)
+    new_resolvers = _tree_resolvers((moves.get(path, path) for path in index.notes), trees)
+
+    def replacement(raw: str, source: str) -> Optional[str]:
+        target = link_target(raw)
+        if not target:
+            return None
+        resolved = old_resolvers[tree_of(source, trees)].resolve(target, source)
+        if resolved is None:
+            return None  # already broken; a move cannot make it worse
+        wanted, moved_source = moves.get(resolved, resolved), moves.get(source, source)
+        tree = tree_of(moved_source, trees)
+        if tree_of(wanted, trees) != tree:
+            return None  # moved out of the source's vault tree; no link can reach it now
+        new_resolver = new_resolvers[tree]
+        if new_resolver.resolve(target, moved_source) == wanted:
+            return None
+        name = wanted[:-3].rpartition('/')[2]
+        return name if new_resolver.resolve(name, moved_source) == wanted else wanted[len(tree):-3]
+
+    rewritten: List[str] = []
+    for source, entry in sorted(index.notes.items()):
+        if is_template(moves.get(source, source)) or not any(replacement(raw, source) is not None for raw in entry[2]):
+            continue
+        current = moves.get(source, source)
+        path = index.root / current
+        text = path.read_text(encoding='utf-8')
+        updated = rewrite_links(text, lambda raw: replacement(raw, source))
+        if updated != text:
+            writer.write(path, updated)
+            rewritten.append(current)
+    return rewritten
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--broken', action='store_true', help='list every unresolved link')
+    parser.add_argument('--orphans', action='store_true', help='list notes with no links in either direction')
+    parser.add_argument('--links', metavar='NOTE', help='list the notes NOTE links to (vault-relative path)')
+    parser.add_argument('--backlinks', metavar='NOTE', help='list the notes linking to NOTE (vault-relative path)')
+    parser.add_argument('--json', action='store_true', help='print the report as one JSON object')
+    args = parser.parse_args(argv)
+    index = LinkIndex()
+    started = time.perf_counter()
+    changed = index.update()
+    graph, broken = index.build()
+    elapsed = (time.perf_counter() - started) * 1000
+    index.save()
+    for note in (args.links, args.backlinks):
+        if note is not None and note not in graph.ids:
+            parser.error(f"{note} is not a note in the vault")
+    orphans = graph.orphans()
+    if args.json:
+        report: Dict[str, object] = {
+            'notes': len(graph.paths),
+            'links': graph.edge_count,
+            'broken': [{'source': link.source, 'link': link.raw} for link in broken],
+            'orphans': orphans,
+        }
+        if args.links:
+            report['links_from'] = graph.links(args.links)
+        if args.backlinks:
+            report['backlinks'] = graph.backlinks(args.backlinks)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        if args.broken:
+            for link in broken:
+                print(link.format())
+        if args.orphans:
+            for path in orphans:
+                print(path)
+        if args.links:
+            for path in graph.links(args.links):
+                print(path)
+        if args.backlinks:
+            for path in graph.backlinks(args.backlinks):
+                print(path)
+    print(
+        f"{len(graph.paths)} notes, {graph.edge_count} links, {len(broken)} broken, "
+        f"{len(orphans)} orphans ({changed} notes re-parsed, {elapsed:.1f} ms)",
+        file=sys.stderr,
+    )
+    return 1 if broken and args.broken else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""Evaluate the dashboards' Dataview blocks offline and write the results as static markdown."""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import fill_empty_files as fill
+from frontmatter_index import parse_frontmatter, parse_scalar
+from task_index import DEFAULT_DB, Task, TaskIndex
+
+DASHBOARD_DIR = '07_System/Dashboards'
+NOTE_INDEX_PATH = fill.BASE_DIR / '.cache' / 'note_index.json'
+NOTE_INDEX_VERSION = 1
+MARKER_START = fill.MATERIALIZED_START
+MARKER_END = fill.MATERIALIZED_END
+SECTION_RE = re.compile(r'\n*<!-- dataview-materialized[^\n]*-->\n.*?<!-- /dataview-materialized -->\n?', re.S)
+BLOCK_RE = re.compile(r'^```dataview[ \t]*\n(.*?)^```', re.S | re.M)
+HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*$', re.M)
+INLINE_FIELD_RE = re.compile(r'^\s*(?:[-*]\s+)?([\w-]+)::[ \t]*(.+?)\s*$')
+BODY_TAG_RE = re.compile(r'(?:^|\s)#([^\s#\[\](),.!?:;"\']+)')
+DAY_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?$')
+
+
+@dataclass
+class NoteRecord:
+    path: str
+    mtime_ns: int
+    size: int
+    ctime_ns: int
+    fields: Dict[str, Any]
+    tags: List[str]
+
+
+def read_note(root: Path, rel: str, mtime_ns: int, size: int) -> NoteRecord:
+    path = root / rel
+    lines = path.read_text(encoding='utf-8', errors='replace').splitlines()
+    fields, body_start = parse_frontmatter(lines)
+    tags = fields.get('tags') or []
+    tags = [str(tag) for tag in (tags if isinstance(tags, list) else str(tags).replace(',', ' ').split())]
+    fenced = False
+    # A dashboard's own materialized section repeats other notes' fields and tags.
+    for _, line in fill.outside_materialized(lines[body_start:]):
+        if line.lstrip().startswith(('```', '~~~')):
+            fenced = not fenced
+            continue
+        if fenced:
+            continue
+        inline = INLINE_FIELD_RE.match(line)
+        if inline and inline.group(1) not in fields:
+            fields[inline.group(1)] = parse_scalar(inline.group(2))
+        tags.extend(tag for tag in BODY_TAG_RE.findall(line) if not tag.isdigit())
+    info = os.stat(path)
+    ctime_ns = getattr(info, 'st_birthtime_ns', None) or info.st_ctime_ns
+    return NoteRecord(rel, mtime_ns, size, ctime_ns, fields, list(dict.fromkeys(tag.lstrip('#') for tag in tags)))
+
+
+class NoteIndex:
+    """Frontmatter, inline fields and tags of every note, kept in .cache and refreshed by mtime."""
+
+    def __init__(self, root: Path = fill.BASE_DIR, path: Path = NOTE_INDEX_PATH) -> None:
+        self.root = root
+        self.path = path
+        self.notes: Dict[str, NoteRecord] = {}
+        self._dirty = False
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == NOTE_INDEX_VERSION:
+            self.notes = {rel: NoteRecord(rel, *entry) for rel, entry in data['notes'].items()}
+
+    def update(self, notes: Iterable[fill.NoteStat]) -> int:
+        current: Dict[str, NoteRecord] = {}
+        changed = 0
+        for rel, mtime_ns, size in notes:
+            record = self.notes.get(rel)
+            if record is None or (record.mtime_ns, record.size) != (mtime_ns, size):
+                try:
+                    record = read_note(self.root, rel, mtime_ns, size)
+                except FileNotFoundError:
+                    continue
+                changed += 1
+            current[rel] = record
+        self._dirty = self._dirty or changed > 0 or len(current) != len(self.notes)
+        self.notes = current
+        return changed
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        payload = {
+            'version': NOTE_INDEX_VERSION,
+            'notes': {
+                rel: [record.mtime_ns, record.size, record.ctime_ns, record.fields, record.tags]
+                for rel, record in self.notes.items()
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fill.NoteWriter().write(self.path, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+        self._dirty = False
+
+    def under(self, folder: Optional[str]) -> List[NoteRecord]:
+        if not folder:
+            return list(self.notes.values())
+        prefix = folder.strip('/') + '/'
+        return [record for rel, record in self.notes.items() if rel.startswith(prefix)]
+
+
+@dataclass(frozen=True)
+class Link:
+    path: str
+
+    def __str__(self) -> str:
+        return f"[[{self.path[:-3] if self.path.endswith('.md') else self.path}|{Path(self.path).stem}]]"
+
+
+# Expression AST nodes are plain tuples: ('lit', value), ('field', name), ('call', name, args),
+# ('not', node), ('neg', node) and ('bin', operator, left, right).
+Node = Tuple[Any, ...]
+TOKEN_RE = re.compile(
+    r"""\s*(?:
+    (?P<dur>dur\(\s*(?P<dur_body>[^)]*?)\s*\))
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<op>>=|<=|!=|&&|\|\||=|<|>|\+|-|\*|/|!|\(|\)|,)
+    |(?P<name>[^\W\d][\w.]*)
+    )""",
+    re.X | re.I,
+)
+KEYWORDS = frozenset({'from', 'where', 'sort', 'limit', 'as', 'asc', 'desc', 'and', 'or', 'without', 'id'})
+CLAUSES = frozenset({'from', 'where', 'sort', 'limit'})
+COMPARISONS = frozenset({'=', '!=', '<', '>', '<=', '>='})
+DURATION_UNITS = {
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400,
+    'w': 604800, 'wk': 604800, 'wks': 604800, 'week': 604800, 'weeks': 604800,
+    'mo': 2592000, 'month': 2592000, 'months': 2592000,
+    'y': 31536000, 'yr': 31536000, 'yrs': 31536000, 'year': 31536000, 'years': 31536000,
+}
+RELATIVE_DATES = {'today': 0, 'now': 0, 'tomorrow': 1, 'yesterday': -1}
+
+
+def parse_duration(text: str) -> timedelta:
+    seconds = 0.0
+    parts = re.findall(r'(\d+(?:\.\d+)?)\s*([a-z]+)', text.lower())
+    if not parts:
+        raise ValueError(f"Unsupported duration: dur({text})")
+    for amount, unit in parts:
+        if unit not in DURATION_UNITS:
+            raise ValueError(f"Unsupported duration unit: {unit}")
+        seconds += float(amount) * DURATION_UNITS[unit]
+    return timedelta(seconds=seconds)
+
+
+@dataclass
+class Query:
+    kind: str
+    columns: List[Tuple[str, Node]] = field(default_factory=list)
+    without_id: bool = False
+    source: Optional[str] = None
+    where: Optional[Node] = None
+    sort: List[Tuple[Node, bool]] = field(default_factory=list)
+    limit: Optional[int] = None
+
+
+class QueryParser:
+    """Recursive-descent parser for the TASK/LIST/TABLE subset with FROM, WHERE, SORT and LIMIT."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens: List[Tuple[str, Any, int, int]] = []
+        position = 0
+        while position < len(text):
+            match = TOKEN_RE.match(text, position)
+            if match is None or match.end() == position:
+                if text[position:].strip():
+                    raise ValueError(f"Unexpected input in dataview query: {text[position:].strip()[:20]!r}")
+                break
+            kind = match.lastgroup if match.lastgroup != 'dur_body' else 'dur'
+            start = match.start(kind)
+            if kind == 'dur':
+                value: Any = parse_duration(match.group('dur_body'))
+            elif kind == 'string':
+                value = json.loads(match.group('string'))
+            elif kind == 'number':
+                value = float(match.group('number')) if '.' in match.group('number') else int(match.group('number'))
+            else:
+                value = match.group(kind)
+            self.tokens.append((kind, value, start, match.end()))
+            position = match.end()
+        self.position = 0
+
+    def parse(self) -> Query:
+        head = self._keyword()
+        if head not in ('task', 'list', 'table'):
+            raise ValueError(f"Unsupported dataview query type: {head or self.text.split()[0]}")
+        self.position += 1
+        query = Query(head.upper())
+        if self._keyword() == 'without':
+            self.position += 1
+            self._expect_keyword('id')
+            query.without_id = True
+        if head == 'list' and not self._at_clause():
+            query.columns.append(self._column())
+        elif head == 'table':
+            while not self._at_clause():
+                query.columns.append(self._column())
+                if not self._accept(','):
+                    break
+        while self.position < len(self.tokens):
+            clause = self._keyword()
+            self.position += 1
+            if clause == 'from':
+                kind, value, _, _ = self._next()
+                if kind != 'string':
+                    raise ValueError('Only FROM "folder" sources are supported')
+                query.source = value
+            elif clause == 'where':
+                query.where = self._expression()
+            elif clause == 'sort':
+                while True:
+                    expression = self._expression()
+                    direction = self._keyword()
+                    if direction in ('asc', 'desc'):
+                        self.position += 1
+                    query.sort.append((expression, direction == 'desc'))
+                    if not self._accept(','):
+                        break
+            elif clause == 'limit':
+                kind, value, _, _ = self._next()
+                if kind != 'number':
+                    raise ValueError('LIMIT expects a number')
+                query.limit = int(value)
+            else:
+                raise ValueError(f"Unsupported dataview clause: {self.tokens[self.position - 1][1]}")
+        return query
+
+    def _column(self) -> Tuple[str, Node]:
+        start = self.tokens[self.position][2]
+        expression = self._expression()
+        label = self.text[start:self.tokens[self.position - 1][3]].strip()
+        if self._keyword() == 'as':
+            self.position += 1
+            kind, value, _, _ = self._next()
+            label = value
+        return label, expression
+
+    def _expression(self) -> Node:
+        return self._binary(0)
+
+    def _binary(self, level: int) -> Node:
+        levels = (('or', '||'), ('and', '&&'), COMPARISONS, ('+', '-'), ('*', '/'))
+        if level == len(levels):
+            return self._unary()
+        left = self._binary(level + 1)
+        while self.position < len(self.tokens):
+            kind, value, _, _ = self.tokens[self.position]
+            operator = value.lower() if kind == 'name' else value if kind == 'op' else None
+            if operator not in levels[level]:
+                break
+            self.position += 1
+            operator = {'||': 'or', '&&': 'and'}.get(operator, operator)
+            left = ('bin', operator, left, self._binary(level + 1))
+        return left
+
+    def _unary(self) -> Node:
+        if self._accept('!'):
+            return ('not', self._unary())
+        if self._accept('-'):
+            return ('neg', self._unary())
+        return self._primary()
+
+    def _primary(self) -> Node:
+        kind, value, _, _ = self._next()
+        if kind in ('string', 'number', 'dur'):
+            return ('lit', value)
+        if kind == 'op' and value == '(':
+            node = self._expression()
+            self._expect(')')
+            return node
+        if kind == 'name':
+            lowered = value.lower()
+            if lowered in ('true', 'false'):
+                return ('lit', lowered == 'true')
+            if lowered == 'null':
+                return ('lit', None)
+            if self._accept('('):
+                args: List[Node] = []
+                if not self._accept(')'):
+                    args.append(self._expression())
+                    while self._accept(','):
+                        args.append(self._expression())
+                    self._expect(')')
+                return ('call', lowered, args)
+            return ('field', value)
+        raise ValueError(f"Unexpected token in dataview query: {value}")
+
+    def _next(self) -> Tuple[str, Any, int, int]:
+        if self.position >= len(self.tokens):
+            raise ValueError('Unexpected end of dataview query')
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _keyword(self) -> Optional[str]:
+        if self.position < len(self.tokens) and self.tokens[self.position][0] == 'name':
+            lowered = self.tokens[self.position][1].lower()
+            return lowered if lowered in KEYWORDS | {'task', 'list', 'table'} else None
+        return None
+
+    def _at_clause(self) -> bool:
+        return self.position >= len(self.tokens) or self._keyword() in CLAUSES
+
+    def _accept(self, op: str) -> bool:
+        if self.position < len(self.tokens) and self.tokens[self.position][:2] == ('op', op):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, op: str) -> None:
+        if not self._accept(op):
+            raise ValueError(f"Expected {op!r} in dataview query")
+
+    def _expect_keyword(self, keyword: str) -> None:
+        if self._keyword() != keyword:
+            raise ValueError(f"Expected {keyword.upper()} in dataview query")
+        self.position += 1
+
+
+def parse_query(text: str) -> Query:
+    return QueryParser(text).parse()
+
+
+@dataclass
+class Row:
+    note: NoteRecord
+    task: Optional[Task] = None
+
+
+class Evaluator:
+    """Evaluates parsed queries against the note index and the task index for one fixed day."""
+
+    def __init__(self, notes: NoteIndex, tasks: TaskIndex, today: date) -> None:
+        self.notes = notes
+        self.tasks = tasks
+        self.today = datetime.combine(today, time())
+        self._tasks_by_note: Dict[str, Dict[str, List[Task]]] = {}
+
+    def run(self, query: Query) -> List[Row]:
+        records = self.notes.under(query.source)
+        if query.kind == 'TASK':
+            by_note = self._folder_tasks(query.source)
+            rows = [Row(record, task) for record in records for task in by_note.get(record.path, ())]
+        else:
+            rows = [Row(record) for record in records]
+        if query.where is not None:
+            rows = [row for row in rows if truthy(self.evaluate(query.where, row))]
+        for expression, descending in reversed(query.sort):
+            rows.sort(key=lambda row: sort_key(self.evaluate(expression, row)), reverse=descending)
+        return rows[: query.limit] if query.limit is not None else rows
+
+    def evaluate(self, node: Node, row: Row) -> Any:
+        kind = node[0]
+        if kind == 'lit':
+            return node[1]
+        if kind == 'field':
+            return self.resolve(node[1], row)
+        if kind == 'not':
+            return not truthy(self.evaluate(node[1], row))
+        if kind == 'neg':
+            value = self.evaluate(node[1], row)
+            return -value if isinstance(value, (int, float, timedelta)) else None
+        if kind == 'call':
+            return self._call(node[1], node[2], row)
+        operator, left, right = node[1], node[2], node[3]
+        if operator == 'and':
+            return truthy(self.evaluate(left, row)) and truthy(self.evaluate(right, row))
+        if operator == 'or':
+            return truthy(self.evaluate(left, row)) or truthy(self.evaluate(right, row))
+        return binary(operator, self.evaluate(left, row), self.evaluate(right, row))
+
+    def resolve(self, name: str, row: Row) -> Any:
+        note = row.note
+        if name.startswith('file.'):
+            attribute = name[5:]
+            if attribute == 'name':
+                return Path(note.path).stem
+            if attribute == 'path':
+                return note.path
+            if attribute == 'folder':
+                return note.path.rpartition('/')[0]
+            if attribute == 'link':
+                return Link(note.path)
+            if attribute == 'mtime':
+                return datetime.fromtimestamp(note.mtime_ns / 1e9)
+            if attribute == 'ctime':
+                return datetime.fromtimestamp(note.ctime_ns / 1e9)
+            if attribute == 'size':
+                return note.size
+            if attribute == 'tags':
+                # Dataview lists every parent of a nested tag as well: #a/b gives #a and #a/b.
+                expanded = []
+                for tag in note.tags:
+                    parts = tag.split('/')
+                    expanded += ['#' + '/'.join(parts[: index + 1]) for index in range(len(parts))]
+                return list(dict.fromkeys(expanded))
+            if attribute == 'tasks':
+                return self._folder_tasks(note.path.rpartition('/')[0]).get(note.path, [])
+            if attribute == 'day':
+                match = DAY_RE.search(Path(note.path).stem)
+                return as_date(match.group(1) if match else note.fields.get('date'))
+            return None
+        task = row.task
+        if task is not None:
+            if name in ('completed', 'checked', 'fullyCompleted'):
+                return task.done
+            if name == 'text':
+                return task.text
+            if name == 'status':
+                return 'x' if task.done else ' '
+            if name == 'line':
+                return task.line
+            if name == 'due':
+                return as_date(task.due)
+            if name == 'tags':
+                return ['#' + tag for tag in task.tags]
+        value = note.fields.get(name)
+        if value is None:
+            lowered = name.lower()
+            value = next((item for key, item in note.fields.items() if key.lower() == lowered), None)
+        return as_date(value) if isinstance(value, str) and ISO_DATE_RE.match(value) else value
+
+    def _folder_tasks(self, folder: Optional[str]) -> Dict[str, List[Task]]:
+        key = (folder or '').strip('/')
+        grouped = self._tasks_by_note.get(key)
+        if grouped is None:
+            grouped = {}
+            for task in self.tasks.query(prefix=key or None):
+                grouped.setdefault(task.path, []).append(task)
+            self._tasks_by_note[key] = grouped
+        return grouped
+
+    def _call(self, name: str, args: List[Node], row: Row) -> Any:
+        if name == 'date' and len(args) == 1 and args[0][0] == 'field' and args[0][1].lower() in RELATIVE_DATES:
+            return self.today + timedelta(days=RELATIVE_DATES[args[0][1].lower()])
+        values = [self.evaluate(arg, row) for arg in args]
+        function = FUNCTIONS.get(name)
+        if function is None:
+            raise ValueError(f"Unsupported dataview function: {name}()")
+        return function(*values)
+
+
+def as_date(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    if isinstance(value, str) and ISO_DATE_RE.match(value):
+        return datetime.fromisoformat(value.replace(' ', 'T'))
+    return None if isinstance(value, str) else value
+
+
+def truthy(value: Any) -> bool:
+    if isinstance(value, timedelta):
+        return value != timedelta(0)
+    return bool(value)
+
+
+def contains(container: Any, value: Any) -> bool:
+    # Dataview semantics: lists match element-wise, strings by substring.
+    if isinstance(container, list):
+        return any(contains(item, value) for item in container)
+    if isinstance(container, str):
+        return isinstance(value, str) and value in container
+    if isinstance(container, dict):
+        return value in container
+    return container == value
+
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    'date': as_date,
+    'choice': lambda condition, left, right: left if truthy(condition) else right,
+    'contains': contains,
+    'length': lambda value: len(value) if isinstance(value, (list, str, dict)) else 0,
+    'default': lambda value, fallback: fallback if value is None else value,
+    'lower': lambda value: value.lower() if isinstance(value, str) else value,
+    'upper': lambda value: value.upper() if isinstance(value, str) else value,
+}
+
+
+def binary(operator: str, left: Any, right: Any) -> Any:
+    if operator in COMPARISONS:
+        if operator == '=':
+            return left == right
+        if operator == '!=':
+            return left != right
+        if left is None or right is None:
+            return False
+        try:
+            return {'<': left < right, '>': left > right, '<=': left <= right, '>=': left >= right}[operator]
+        except TypeError:
+            return False
+    if operator == '+' and (isinstance(left, (str, Link)) or isinstance(right, (str, Link))):
+        return format_value(left) + format_value(right)
+    try:
+        if operator == '+':
+            return left + right
+        if operator == '-':
+            return left - right
+        if operator == '*':
+            return left * right
+        return left / right
+    except (TypeError, ZeroDivisionError):
+        return None
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    # Nulls first, then values grouped by type so mixed columns never compare str with int.
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, int(value))
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value)
+    if isinstance(value, timedelta):
+        return (4, value)
+    return (5, format_value(value).lower())
+
+
+def format_value(value: Any) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, timedelta):
+        return f"{value.days} days" if value.seconds == 0 else str(value)
+    if isinstance(value, Task):
+        return value.text
+    if isinstance(value, list):
+        return ', '.join(format_value(item) for item in value)
+    return str(value)
+
+
+def render_rows(query: Query, rows: List[Row], evaluator: Evaluator) -> str:
+    if not rows:
+        return '_該当なし_\n'
+    if query.kind == 'TASK':
+        return ''.join(
+            # Not '- [ ]': a checkbox here would count as a second copy of the task in Obsidian.
+            f"- {'☑' if row.task.done else '☐'} {row.task.text} ({Link(row.note.path)})\n" for row in rows
+        )
+    if query.kind == 'LIST':
+        if not query.columns:
+            return ''.join(f"- {Link(row.note.path)}\n" for row in rows)
+        expression = query.columns[0][1]
+        return ''.join(f"- {format_value(evaluator.evaluate(expression, row))}\n" for row in rows)
+    headers = ([] if query.without_id else ['File']) + [label for label, _ in query.columns]
+    lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(headers)]
+    for row in rows:
+        cells = [] if query.without_id else [str(Link(row.note.path))]
+        cells += [format_value(evaluator.evaluate(expression, row)) for _, expression in query.columns]
+        lines.append('| ' + ' | '.join(cell.replace('|', '\\|').replace('\n', ' ') for cell in cells) + ' |')
+    return '\n'.join(lines) + '\n'
+
+
+@dataclass
+class Dashboard:
+    path: Path
+    body: str
+    blocks: List[Tuple[str, Query]]
+    recorded: Optional[str]
+
+
+def load_dashboard(path: Path) -> Dashboard:
+    text = path.read_text(encoding='utf-8')
+    section = SECTION_RE.search(text)
+    recorded = None
+    if section is not None:
+        marker = re.search(r'inputs=([0-9a-f]+)', section.group(0))
+        recorded = marker.group(1) if marker else None
+    body = SECTION_RE.sub('\n', text).rstrip('\n') + '\n'
+    blocks = []
+    for block in BLOCK_RE.finditer(body):
+        headings = HEADING_RE.findall(body, 0, block.start())
+        blocks.append((headings[-1] if headings else 'Dataview', parse_query(block.group(1))))
+    return Dashboard(path, body, blocks, recorded)
+
+
+def _uses_today(node: Node) -> bool:
+    kind = node[0]
+    if kind == 'call':
+        name, args = node[1], node[2]
+        if name == 'date' and len(args) == 1 and args[0][0] == 'field' and args[0][1].lower() in RELATIVE_DATES:
+            return True
+        return any(_uses_today(arg) for arg in args)
+    if kind in ('not', 'neg'):
+        return _uses_today(node[1])
+    if kind == 'bin':
+        return _uses_today(node[2]) or _uses_today(node[3])
+    return False
+
+
+def is_relative(query: Query) -> bool:
+    # Whether the results depend on the day the query runs, through date(today) and friends.
+    nodes = [expression for _, expression in query.columns] + [expression for expression, _ in query.sort]
+    if query.where is not None:
+        nodes.append(query.where)
+    return any(_uses_today(node) for node in nodes)
+
+
+def input_digest(dashboard: Dashboard, listing: List[fill.NoteStat], today: date) -> str:
+    # Everything a dashboard's results depend on: its own queries, the notes under each FROM
+    # folder (path, mtime, size) and, for queries relative to today, the date itself.
+    digest = hashlib.sha256(dashboard.body.encode('utf-8'))
+    if any(is_relative(query) for _, query in dashboard.blocks):
+        digest.update(today.isoformat().encode('ascii'))
+    own = dashboard.path.as_posix()
+    for source in sorted({query.source or '' for _, query in dashboard.blocks}):
+        prefix = source.strip('/') + '/' if source else ''
+        for rel, mtime_ns, size in listing:
+            if rel.startswith(prefix) and not own.endswith('/' + rel):
+                digest.update(f'{rel}\0{mtime_ns}\0{size}\n'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def render_section(dashboard: Dashboard, evaluator: Evaluator, digest: str, today: date) -> str:
+    parts = [
+        f"{MARKER_START} inputs={digest} -->",
+        "## 📴 オフライン版",
+        '> Dataviewブロックの結果を静的に書き出したもの。モバイルではこちらを参照する。',
+    ]
+    for heading, query in dashboard.blocks:
+        # Only results relative to today go stale with the date, so only they show it.
+        title = f"{heading} ({today} 時点)" if is_relative(query) else heading
+        parts.append(f"### {title}\n" + render_rows(query, evaluator.run(query), evaluator).rstrip('\n'))
+    parts.append(MARKER_END)
+    return '\n\n'.join(parts) + '\n'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--dashboards',
+        default=DASHBOARD_DIR,
+        metavar='FOLDER',
+        help='vault folder holding the dashboards to materialize (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--db',
+        type=Path,
+        default=DEFAULT_DB,
+        help='task index SQLite file (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--today',
+        type=date.fromisoformat,
+        default=date.today(),
+        metavar='YYYY-MM-DD',
+        help='evaluate date(today) as this day (default: the current date)',
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='rewrite every dashboard even when its inputs are unchanged',
+    )
+    args = parser.parse_args(argv)
+    listing = list(fill.iter_notes())
+    notes = NoteIndex()
+    notes.update(listing)
+    tasks = TaskIndex(args.db)
+    refreshed = current = failed = 0
+    try:
+        tasks.update(listing)
+        evaluator = Evaluator(notes, tasks, args.today)
+        prefix = args.dashboards.strip('/') + '/'
+        for rel, _, size in listing:
+            if not rel.startswith(prefix) or size == 0:
+                continue
+            try:
+                dashboard = load_dashboard(fill.BASE_DIR / rel)
+                if not dashboard.blocks:
+                    continue
+                digest = input_digest(dashboard, listing, args.today)
+                if digest == dashboard.recorded and not args.force:
+                    current += 1
+                    continue
+                section = render_section(dashboard, evaluator, digest, args.today)
+                fill.NoteWriter().write(dashboard.path, dashboard.body + '\n' + section)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                print(f"Failed {rel}: {exc}", file=sys.stderr)
+                continue
+            refreshed += 1
+            print(f"Materialized {rel}")
+    finally:
+        tasks.close()
+        notes.save()
+    print(f"Refreshed {refreshed} dashboards, {current} up to date, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
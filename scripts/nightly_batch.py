@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Run the 23:00 batch from 07_System/Scripts/nightly-batch-process.md in one pass over the vault."""
+from __future__ import annotations
+
+import argparse
+from bisect import insort
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import json
+from pathlib import Path
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import fill_empty_files as fill
+from archive_notes import archive
+from frontmatter_index import parse_frontmatter
+from inbox_router import route_inbox
+
+MEMO_DIR = '00_Memo'
+INBOX_DIR = '01_Inbox'
+# The checklist's 目安: more than this many memos means they need processing.
+MEMO_LIMIT = 20
+INBOX_MAX_AGE = timedelta(days=7)
+HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*$')
+BULLET_RE = re.compile(r'^[-*+]\s+(.+?)\s*$')
+# Daily-note sections worth lifting out, by the emoji that opens their heading. The daily
+# template titles learnings "📚 What I Learned"; the checklist calls them 📝.
+EXTRACT_SECTIONS = (
+    ('💡', '💡 重要なアイデア'),
+    ('📚', '📝 学んだこと'),
+    ('🎯', '🎯 プロジェクトメモ'),
+    ('📊', '📊 KPI・数値'),
+)
+
+
+@dataclass
+class StageReport:
+    name: str
+    seconds: float
+    summary: str
+    failed: int = 0
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class NightlyBatch:
+    """State shared by the stages of one run; the note listing itself is passed stage to stage."""
+
+    today: date
+    root: Path = fill.BASE_DIR
+    jobs: int = 1
+    reviews: bool = False
+    archive: bool = False
+    skip_open_reviews: bool = False
+    writer: fill.NoteWriter = field(default_factory=lambda: fill.NoteWriter(batch_fsync=True))
+
+    def day_folder(self, day: date) -> str:
+        return f'02_Daily/{day:%Y}/{day:%Y-%m}/{day.isoformat()}/'
+
+
+StageResult = Tuple[List[fill.NoteStat], str, int, List[str]]
+Stage = Callable[[NightlyBatch, List[fill.NoteStat]], StageResult]
+
+
+def _under(notes: List[fill.NoteStat], folder: str) -> List[fill.NoteStat]:
+    prefix = folder.rstrip('/') + '/'
+    return [note for note in notes if note[0].startswith(prefix)]
+
+
+def stage_memo(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    count = len(_under(notes, MEMO_DIR))
+    warnings = []
+    if count > MEMO_LIMIT:
+        warnings.append(f"{MEMO_DIR} has {count} notes (limit {MEMO_LIMIT}); process them into {INBOX_DIR}")
+    return notes, f"{count} memos", 0, warnings
+
+
+def stage_inbox(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    # Notes get a week in the inbox for manual triage; after that the router decides.
+    inbox = _under(notes, INBOX_DIR)
+    cutoff = time.mktime((batch.today - INBOX_MAX_AGE).timetuple()) * 1e9
+    stale = [rel for rel, mtime_ns, _ in inbox if mtime_ns < cutoff]
+    if not stale:
+        return notes, f"{len(inbox)} inbox notes, none overdue", 0, []
+    routes, moves, rewritten, failures = route_inbox(notes, stale, batch.writer, batch.root)
+    warnings = [
+        f"{route.source} has waited in {INBOX_DIR} for over {INBOX_MAX_AGE.days} days: {route.reason}"
+        for route in routes
+        if route.target is None
+    ]
+    notes = fill.update_listing(notes, list(moves.values()) + rewritten, moves, batch.root)
+    summary = f"{len(inbox)} inbox notes, {len(moves)} of {len(stale)} overdue routed, {len(rewritten)} relinked"
+    return notes, summary, len(failures), warnings + failures
+
+
+def extract_sections(lines: List[str]) -> Dict[str, List[str]]:
+    # Top-level bullets directly under a matching heading; tasks stay in the daily note.
+    found: Dict[str, List[str]] = {}
+    label: Optional[str] = None
+    for line in lines:
+        heading = HEADING_RE.match(line)
+        if heading is not None:
+            label = next((name for emoji, name in EXTRACT_SECTIONS if heading.group(1).startswith(emoji)), None)
+            continue
+        bullet = BULLET_RE.match(line)
+        if label is None or bullet is None or fill.TASK_RE.match(line):
+            continue
+        found.setdefault(label, []).append(bullet.group(1))
+    return found
+
+
+def render_extract(day: date, sources: List[Tuple[str, Dict[str, List[str]]]]) -> str:
+    lines = [
+        '---',
+        f'date: {day.isoformat()}',
+        'tags: [nightly-extract, inbox]',
+        '---',
+        '',
+        f'# {day.isoformat()} デイリー抽出',
+        '',
+        '3ヶ月後も参照する価値があるものは `04_Memory` へ、それ以外はこのノートごと削除する。',
+    ]
+    for _, label in EXTRACT_SECTIONS:
+        items = [
+            f'- {item} ([[{rel.rpartition("/")[2][:-3]}]])'
+            for rel, found in sources
+            for item in found.get(label, ())
+        ]
+        if items:
+            lines += ['', f'## {label}', *items]
+    return '\n'.join(lines) + '\n'
+
+
+def stage_extract(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    folder = batch.day_folder(batch.today)
+    dailies = [rel for rel, _, size in _under(notes, folder) if size and rel.endswith('-Daily.md')]
+    sources = []
+    for rel in dailies:
+        lines = (batch.root / rel).read_text(encoding='utf-8', errors='replace').splitlines()
+        found = extract_sections(lines[parse_frontmatter(lines)[1]:])
+        if found:
+            sources.append((rel, found))
+    if not sources:
+        return notes, f"{len(dailies)} daily notes, nothing to extract", 0, []
+    rel = f'{INBOX_DIR}/{batch.today.isoformat()}-Nightly-Extract.md'
+    path = batch.root / rel
+    content = render_extract(batch.today, sources)
+    items = sum(len(found) for _, found in sources for found in found.values())
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return notes, f"{items} items already in {rel}", 0, []
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    batch.writer.write(path, content)
+    stat = path.stat()
+    notes = [note for note in notes if note[0] != rel]
+    insort(notes, (rel, stat.st_mtime_ns, stat.st_size))
+    return notes, f"{items} items from {len(sources)} daily notes to {rel}", 0, []
+
+
+def _fill(batch: NightlyBatch, paths: List[Path]) -> Tuple[int, List[str]]:
+    filled = 0
+    failures = []
+    for path, error in fill.fill_files(paths, batch.jobs, batch.writer):
+        if error is None:
+            filled += 1
+        else:
+            failures.append(f"Failed {path.relative_to(batch.root).as_posix()}: {error}")
+    return filled, failures
+
+
+def _restat(batch: NightlyBatch, notes: List[fill.NoteStat], written: List[str]) -> List[fill.NoteStat]:
+    return fill.update_listing(notes, written, root=batch.root)
+
+
+def stage_fill(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    # The listing already knows every size, so the empty notes need no second walk.
+    empty = [rel for rel, _, size in notes if size == 0]
+    skipped = []
+    if batch.skip_open_reviews:
+        # The reviews stage renders these on the last day of their week or month.
+        skipped = [
+            f"Skipped {rel}: period ends {fill.review_period_end(rel)}"
+            for rel in empty
+            if not fill.review_is_due(rel, batch.today)
+        ]
+        empty = [rel for rel in empty if fill.review_is_due(rel, batch.today)]
+    routed = [rel for rel in empty if fill.ROUTER.resolve(rel) is not None]
+    filled, failures = _fill(batch, [batch.root / rel for rel in routed])
+    notes = _restat(batch, notes, routed)
+    unrouted = len(empty) - len(routed)
+    summary = f"{filled} filled, {unrouted} without a generator"
+    if skipped:
+        summary += f", {len(skipped)} open reviews skipped"
+    return notes, summary, len(failures), failures + skipped
+
+
+def stage_reviews(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    # Sunday closes the ISO week and the last day closes the month; --reviews forces both.
+    plan = fill.plan_calendar(batch.today, batch.today, batch.root)
+    due: List[Path] = []
+    if batch.reviews or batch.today.isoweekday() == 7:
+        due += plan.weekly
+    if batch.reviews or fill.month_end(batch.today) == batch.today:
+        due += plan.monthly
+    if not due:
+        return notes, 'not a week or month end', 0, []
+    fill.make_dirs([path.parent for path in due], batch.root)
+    pending = [path for path in due if not path.exists() or path.stat().st_size == 0]
+    filled, failures = _fill(batch, pending)
+    notes = _restat(batch, notes, [path.relative_to(batch.root).as_posix() for path in pending])
+    return notes, f"{filled} of {len(due)} reviews written", len(failures), failures
+
+
+def stage_archive(batch: NightlyBatch, notes: List[fill.NoteStat]) -> StageResult:
+    # The month-end step of _archive-workflow.md; --archive runs it on any day.
+    if not batch.archive and fill.month_end(batch.today) != batch.today:
+        return notes, 'not a month end', 0, []
+    moves, rewritten, failures = archive(batch.today, batch.writer, notes, batch.root)
+    moved = {move.source: move.target for move in moves}
+    notes = fill.update_listing(notes, list(moved.values()) + rewritten, moved, batch.root)
+    return notes, f"{len(moves)} notes archived, {len(rewritten)} relinked", len(failures), failures
+
+
+STAGES: Tuple[Tuple[str, Stage], ...] = (
+    ('memo', stage_memo),
+    ('inbox', stage_inbox),
+    ('extract', stage_extract),
+    ('fill', stage_fill),
+    ('reviews', stage_reviews),
+    ('archive', stage_archive),
+)
+
+
+def run(batch: NightlyBatch, skip: Tuple[str, ...] = ()) -> List[StageReport]:
+    # One walk of the vault; every stage hands the (possibly updated) listing to the next.
+    started = time.perf_counter()
+    temp_files: List[str] = []
+    notes = list(fill.iter_notes(batch.root, temp_files))
+    removed = fill.remove_stale_temp_files(temp_files)
+    summary = f"{len(notes)} notes, {removed} stale temp files removed"
+    reports = [StageReport('walk', time.perf_counter() - started, summary)]
+    for name, stage in STAGES:
+        if name in skip:
+            continue
+        started = time.perf_counter()
+        try:
+            notes, summary, failed, warnings = stage(batch, notes)
+        except Exception as exc:  # one broken stage must not cost the rest of the night
+            summary, failed, warnings = 'aborted', 1, [f"Failed stage {name}: {exc}"]
+        reports.append(StageReport(name, time.perf_counter() - started, summary, failed, warnings))
+    batch.writer.flush()
+    fill.save_daily_summaries()
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--today',
+        type=date.fromisoformat,
+        default=date.today(),
+        metavar='YYYY-MM-DD',
+        help='process as if run on this day (default: today)',
+    )
+    parser.add_argument(
+        '--skip',
+        action='append',
+        default=[],
+        choices=[name for name, _ in STAGES],
+        help='leave out a stage (repeatable)',
+    )
+    parser.add_argument(
+        '--reviews',
+        action='store_true',
+        help="render this week's and this month's reviews whatever the day",
+    )
+    parser.add_argument('--archive', action='store_true', help='archive finished notes whatever the day')
+    parser.add_argument(
+        '--skip-open-reviews',
+        action='store_true',
+        help='leave empty reviews of weeks and months still under way for the reviews stage',
+    )
+    parser.add_argument('--jobs', type=int, default=1, metavar='N', help='fill notes on N worker threads (default: 1)')
+    parser.add_argument('--json', action='store_true', help='print the stage reports as one JSON object')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    started = time.perf_counter()
+    batch = NightlyBatch(
+        args.today,
+        jobs=args.jobs,
+        reviews=args.reviews,
+        archive=args.archive,
+        skip_open_reviews=args.skip_open_reviews,
+    )
+    reports = run(batch, tuple(args.skip))
+    elapsed = time.perf_counter() - started
+    failed = sum(report.failed for report in reports)
+    if args.json:
+        payload = {
+            'today': args.today.isoformat(),
+            'seconds': elapsed,
+            'stages': [report.__dict__ for report in reports],
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    else:
+        # Warnings go to stdout so cron mails them; timings stay on stderr.
+        for report in reports:
+            for warning in report.warnings:
+                print(warning)
+    for report in reports:
+        print(f"{report.name:<8} {report.seconds * 1000:>9.1f} ms  {report.summary}", file=sys.stderr)
+    print(f"Nightly batch for {args.today}: {elapsed:.2f} s, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
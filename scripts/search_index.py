@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Full-text search over the vault: CJK bigrams plus Latin words, BM25-ranked, mmap-backed."""
+from __future__ import annotations
+
+import argparse
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from bisect import bisect_left
+import heapq
+import json
+import marshal
+import math
+import mmap
+import os
+from pathlib import Path
+import re
+import struct
+import sys
+import tempfile
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import fill_empty_files as fill
+
+SEARCH_DIR = fill.BASE_DIR / '.cache' / 'search'
+INDEX_NAME = 'index.bin'
+DOCS_NAME = 'docs.marshal'
+FILES_NAME = 'files.marshal'
+MAGIC = b'VFTS'
+FORMAT_VERSION = 1
+# magic, version, documents, terms, average length, then the byte offset of each section.
+HEADER = struct.Struct('<4sIIId8Q')
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Latin and digit words, or runs of kana, CJK ideographs and hangul.
+TOKEN_RE = re.compile(r'[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+')
+
+DocVector = Tuple[int, int, int, Dict[str, int]]  # mtime_ns, size, length, term frequencies
+
+
+def tokenize(text: str) -> List[str]:
+    # Japanese has no word boundaries, so CJK runs become overlapping character bigrams;
+    # Latin words go through the same light stemmer the token catalog uses.
+    tokens: List[str] = []
+    for run in TOKEN_RE.findall(unicodedata.normalize('NFKC', text).lower()):
+        if run[0].isascii():
+            tokens.append(fill.stem_token(run))
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+    return tokens
+
+
+def _aligned(blob: bytearray) -> None:
+    blob.extend(bytes(-len(blob) % 8))
+
+
+def write_index(path: Path, docs: Dict[str, DocVector]) -> None:
+    # Each posting stores its BM25 term-frequency component ("impact") precomputed, so a
+    # query only multiplies by idf; each term also records its largest impact for pruning.
+    paths = sorted(docs)
+    lengths = [docs[rel][2] for rel in paths]
+    average = sum(lengths) / len(lengths) if lengths else 0.0
+    fixed = BM25_K1 * (1 - BM25_B)
+    scaled = BM25_K1 * BM25_B / average if average else 0.0
+    postings: Dict[str, Tuple[array, array]] = {}
+    for doc_id, rel in enumerate(paths):
+        norm = fixed + scaled * lengths[doc_id]
+        for term, frequency in docs[rel][3].items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array('I'), array('f'))
+            entry[0].append(doc_id)
+            entry[1].append(frequency * (BM25_K1 + 1) / (frequency + norm))
+    terms = sorted(postings, key=lambda term: term.encode('utf-8'))
+    path_offsets, path_blob = _blob(rel.encode('utf-8') for rel in paths)
+    term_offsets, term_blob = _blob(term.encode('utf-8') for term in terms)
+    posting_offsets = array('I', [0])
+    max_impacts = array('f')
+    doc_ids = array('I')
+    impacts = array('f')
+    for term in terms:
+        term_docs, term_impacts = postings[term]
+        doc_ids.extend(term_docs)
+        impacts.extend(term_impacts)
+        posting_offsets.append(len(doc_ids))
+        max_impacts.append(max(term_impacts))
+    sections = [
+        path_offsets.tobytes(), path_blob, term_offsets.tobytes(), term_blob,
+        posting_offsets.tobytes(), max_impacts.tobytes(), doc_ids.tobytes(), impacts.tobytes(),
+    ]
+    body = bytearray()
+    offsets = []
+    for section in sections:
+        offsets.append(HEADER.size + len(body))
+        body.extend(section)
+        _aligned(body)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(paths), len(terms), average, *offsets)
+    _write_bytes(path, header + body)
+
+
+def _blob(items: Iterable[bytes]) -> Tuple[array, bytearray]:
+    offsets = array('I', [0])
+    blob = bytearray()
+    for item in items:
+        blob.extend(item)
+        offsets.append(len(blob))
+    return offsets, blob
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    # Same temp-file-and-rename pattern as NoteWriter, so readers never map a half-written file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@dataclass
+class Hit:
+    path: str
+    score: float
+
+
+class SearchIndex:
+    """Read-only view of index.bin; every section is a memoryview into one mmap."""
+
+    def __init__(self, path: Path) -> None:
+        with open(path, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, version, self.documents, self.terms, self.average_length, *offsets = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            view.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a search index in format {FORMAT_VERSION}")
+        self._views: List[memoryview] = [view]
+        self._path_offsets = self._array(view, offsets[0], self.documents + 1)
+        self._path_blob = self._bytes(view, offsets[1], offsets[2])
+        self._term_offsets = self._array(view, offsets[2], self.terms + 1)
+        self._term_blob = self._bytes(view, offsets[3], offsets[4])
+        self._posting_offsets = self._array(view, offsets[4], self.terms + 1)
+        self._max_impacts = self._array(view, offsets[5], self.terms, 'f')
+        postings = self._posting_offsets[self.terms]
+        self._doc_ids = self._array(view, offsets[6], postings)
+        self._impacts = self._array(view, offsets[7], postings, 'f')
+
+    def _array(self, view: memoryview, start: int, count: int, code: str = 'I') -> memoryview:
+        section = view[start:start + 4 * count].cast(code)
+        self._views.append(section)
+        return section
+
+    def _bytes(self, view: memoryview, start: int, end: int) -> memoryview:
+        section = view[start:end]
+        self._views.append(section)
+        return section
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._map.close()
+
+    def path(self, doc_id: int) -> str:
+        return bytes(self._path_blob[self._path_offsets[doc_id]:self._path_offsets[doc_id + 1]]).decode('utf-8')
+
+    def _find(self, term: bytes) -> int:
+        low, high = 0, self.terms
+        offsets, blob = self._term_offsets, self._term_blob
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(blob[offsets[middle]:offsets[middle + 1]]) < term:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.terms and bytes(blob[offsets[low]:offsets[low + 1]]) == term:
+            return low
+        return -1
+
+    def search(self, query: str, limit: int = 10) -> List[Hit]:
+        # Term-at-a-time MaxScore: terms are scored in decreasing order of their best possible
+        # contribution. Once the terms left cannot lift an unseen note into the top k, their
+        # postings are no longer scanned; the surviving candidates are looked up by bisection.
+        if limit < 1:
+            return []
+        terms = []
+        for term, weight in Counter(tokenize(query)).items():
+            index = self._find(term.encode('utf-8'))
+            if index < 0:
+                continue
+            start, end = self._posting_offsets[index], self._posting_offsets[index + 1]
+            idf = math.log(1 + (self.documents - (end - start) + 0.5) / (end - start + 0.5)) * weight
+            terms.append((idf * self._max_impacts[index], idf, start, end))
+        terms.sort(reverse=True)
+        remaining = sum(bound for bound, _, _, _ in terms)
+        scores: Dict[int, float] = {}
+        for position, (bound, idf, start, end) in enumerate(terms):
+            if len(scores) >= limit and remaining <= heapq.nlargest(limit, scores.values())[-1]:
+                self._refine(scores, terms[position:], remaining, limit)
+                break
+            get = scores.get
+            for doc_id, impact in zip(self._doc_ids[start:end], self._impacts[start:end]):
+                scores[doc_id] = get(doc_id, 0.0) + idf * impact
+            remaining -= bound
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [Hit(self.path(doc_id), score) for doc_id, score in best]
+
+    def _refine(
+        self,
+        scores: Dict[int, float],
+        terms: List[Tuple[float, float, int, int]],
+        remaining: float,
+        limit: int,
+    ) -> None:
+        doc_ids, impacts = self._doc_ids, self._impacts
+        for bound, idf, start, end in terms:
+            threshold = heapq.nlargest(limit, scores.values())[-1]
+            # Scores only grow, so a note that cannot reach the current k-th score even with
+            # every remaining term is out for good.
+            for doc_id in [doc_id for doc_id, score in scores.items() if score + remaining < threshold]:
+                del scores[doc_id]
+            for doc_id in scores:
+                found = bisect_left(doc_ids, doc_id, start, end)
+                if found < end and doc_ids[found] == doc_id:
+                    scores[doc_id] += idf * impacts[found]
+            remaining -= bound
+
+
+class SearchBuilder:
+    """Keeps index.bin in step with the vault, re-tokenizing only notes whose mtime or size changed."""
+
+    def __init__(self, root: Path = fill.BASE_DIR, directory: Path = SEARCH_DIR) -> None:
+        self.root = root
+        self.directory = directory
+
+    def update(self, notes: Optional[Iterable[fill.NoteStat]] = None) -> Tuple[int, int]:
+        listing = {rel: (mtime_ns, size) for rel, mtime_ns, size in (fill.iter_notes(self.root) if notes is None else notes)}
+        # The listing is stored with the format version, so a format change forces a rebuild.
+        if self._load(FILES_NAME) == (FORMAT_VERSION, listing) and (self.directory / INDEX_NAME).exists():
+            return 0, 0  # the common case never touches the much larger term vectors
+        docs: Dict[str, DocVector] = self._load(DOCS_NAME) or {}
+        removed = [rel for rel in docs if rel not in listing]
+        for rel in removed:
+            del docs[rel]
+        changed = 0
+        for rel, (mtime_ns, size) in listing.items():
+            cached = docs.get(rel)
+            if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+                continue
+            try:
+                text = (self.root / rel).read_text(encoding='utf-8', errors='replace')
+            except FileNotFoundError:
+                continue
+            tokens = tokenize(text)
+            docs[rel] = (mtime_ns, size, len(tokens), dict(Counter(tokens)))
+            changed += 1
+        write_index(self.directory / INDEX_NAME, docs)
+        _write_bytes(self.directory / DOCS_NAME, marshal.dumps(docs))
+        _write_bytes(self.directory / FILES_NAME, marshal.dumps((FORMAT_VERSION, listing)))
+        return changed, len(removed)
+
+    def _load(self, name: str) -> Any:
+        try:
+            return marshal.loads((self.directory / name).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def open(self) -> SearchIndex:
+        return SearchIndex(self.directory / INDEX_NAME)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('query', nargs='+', help='words or Japanese text to search for')
+    parser.add_argument('-k', '--limit', type=int, default=10, metavar='K', help='hits to print (default: %(default)s)')
+    parser.add_argument(
+        '--no-update',
+        action='store_true',
+        help='search the index as it is without re-checking note mtimes',
+    )
+    parser.add_argument('--json', action='store_true', help='print one JSON object per hit')
+    args = parser.parse_args(argv)
+    if args.limit < 1:
+        parser.error('--limit must be at least 1')
+    builder = SearchBuilder()
+    if not args.no_update:
+        started = time.perf_counter()
+        changed, removed = builder.update()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Indexed {changed} changed and {removed} removed notes in {elapsed:.1f} ms", file=sys.stderr)
+    index = builder.open()
+    try:
+        started = time.perf_counter()
+        hits = index.search(' '.join(args.query), args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        for hit in hits:
+            print(json.dumps(hit.__dict__, ensure_ascii=False) if args.json else f"{hit.score:8.3f}  {hit.path}")
+        print(f"{len(hits)} hits in {elapsed:.2f} ms", file=sys.stderr)
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Index every checkbox task in the vault into SQLite and answer task queries from it."""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+import json
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import fill_empty_files as fill
+
+DEFAULT_DB = fill.BASE_DIR / '.cache' / 'tasks.sqlite3'
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tasks (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    due TEXT,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (path, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (done, path);
+CREATE INDEX IF NOT EXISTS tasks_by_due ON tasks (due) WHERE due IS NOT NULL;
+CREATE TABLE IF NOT EXISTS task_tags (
+    tag TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    PRIMARY KEY (tag, path, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS task_tags_by_note ON task_tags (path);
+"""
+# Tasks plugin (📅 2025-11-04) and Dataview inline fields ([due:: 2025-11-04]).
+DUE_RE = re.compile(r'(?:📅️?\s*|\bdue::\s*)(\d{4}-\d{2}-\d{2})')
+TAG_RE = re.compile(r'(?:^|\s)#([^\s#\[\](),]+)')
+FENCE_PREFIXES = ('```', '~~~')
+
+
+@dataclass
+class Task:
+    path: str
+    line: int
+    done: bool
+    text: str
+    due: Optional[str]
+    tags: Tuple[str, ...]
+
+    def format(self) -> str:
+        return f"{self.path}:{self.line} [{'x' if self.done else ' '}] {self.text}"
+
+
+def parse_tasks(rel: str, lines: Iterable[str]) -> Iterator[Task]:
+    # Frontmatter, fenced code blocks (dataview queries, examples) and materialized dashboard
+    # sections never hold real tasks.
+    fenced = in_frontmatter = False
+    for number, line in fill.outside_materialized(lines):
+        stripped = line.strip()
+        if stripped == '---' and (number == 1 or in_frontmatter):
+            in_frontmatter = not in_frontmatter
+            continue
+        if in_frontmatter:
+            continue
+        if stripped.startswith(FENCE_PREFIXES):
+            fenced = not fenced
+            continue
+        if fenced:
+            continue
+        match = fill.TASK_RE.match(line)
+        if match is None or not match.group(2):
+            continue
+        text = match.group(2)
+        due = DUE_RE.search(text)
+        tags = tuple(dict.fromkeys(tag for tag in TAG_RE.findall(text) if not tag.isdigit()))
+        yield Task(rel, number, match.group(1) != ' ', text, due.group(1) if due else None, tags)
+
+
+class TaskIndex:
+    """Tasks of every note in a SQLite file, refreshed only for notes whose mtime or size changed."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, root: Path = fill.BASE_DIR) -> None:
+        self.root = root
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self.connection.executescript(
+                'DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS tasks; DROP TABLE IF EXISTS task_tags;'
+            )
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, notes: Optional[Iterable[fill.NoteStat]] = None) -> Tuple[int, int]:
+        # Callers that already walked the vault can pass their iter_notes() listing.
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.connection.execute('SELECT path, mtime_ns, size FROM files')
+        }
+        changed = []
+        for rel, mtime_ns, size in fill.iter_notes(self.root) if notes is None else notes:
+            previous = known.pop(rel, None)
+            if previous != (mtime_ns, size):
+                changed.append((rel, mtime_ns, size, previous is not None))
+        removed = list(known)  # whatever the walk did not see any more
+        with self.connection:
+            for rel in removed:
+                self._forget(rel)
+                self.connection.execute('DELETE FROM files WHERE path = ?', (rel,))
+            for rel, mtime_ns, size, indexed in changed:
+                if indexed:
+                    self._forget(rel)
+                self._index(rel)
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)', (rel, mtime_ns, size)
+                )
+        return len(changed), len(removed)
+
+    def _forget(self, rel: str) -> None:
+        self.connection.execute('DELETE FROM tasks WHERE path = ?', (rel,))
+        self.connection.execute('DELETE FROM task_tags WHERE path = ?', (rel,))
+
+    def _index(self, rel: str) -> None:
+        try:
+            with open(self.root / rel, encoding='utf-8', errors='replace') as handle:
+                tasks = list(parse_tasks(rel, handle))
+        except FileNotFoundError:
+            return  # deleted between the walk and the read; the next update drops it
+        self.connection.executemany(
+            'INSERT INTO tasks (path, line, done, text, due, tags) VALUES (?, ?, ?, ?, ?, ?)',
+            [(task.path, task.line, task.done, task.text, task.due, ' '.join(task.tags)) for task in tasks],
+        )
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO task_tags (tag, path, line) VALUES (?, ?, ?)',
+            [(tag, task.path, task.line) for task in tasks for tag in task.tags],
+        )
+
+    def query(
+        self,
+        done: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        tag: Optional[str] = None,
+        due_before: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if done is not None:
+            clauses.append('tasks.done = ?')
+            params.append(done)
+        if prefix:
+            # A folder is a key range, so the (done, path) index answers it without a scan.
+            folder = prefix.strip('/') + '/'
+            clauses.append('tasks.path >= ? AND tasks.path < ?')
+            params += [folder, folder[:-1] + '0']
+        if tag:
+            # Nested tags count too: #project matches #project/active.
+            tag = tag.lstrip('#')
+            clauses.append(
+                '(tasks.path, tasks.line) IN (SELECT path, line FROM task_tags'
+                ' WHERE tag = ? OR (tag >= ? AND tag < ?))'
+            )
+            params += [tag, tag + '/', tag + '0']
+        if due_before is not None:
+            clauses.append('tasks.due IS NOT NULL AND tasks.due < ?')
+            params.append(due_before.isoformat())
+        sql = 'SELECT path, line, done, text, due, tags FROM tasks'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY path, line'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [
+            Task(path, line, bool(done_flag), text, due, tuple(tags.split()))
+            for path, line, done_flag, text, due, tags in self.connection.execute(sql, params)
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        total, done = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(done), 0) FROM tasks').fetchone()
+        return {'tasks': total, 'done': done, 'open': total - done}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--db',
+        type=Path,
+        default=DEFAULT_DB,
+        help='SQLite file holding the index (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--no-update',
+        action='store_true',
+        help='query the index as it is without re-checking note mtimes',
+    )
+    status = parser.add_mutually_exclusive_group()
+    status.add_argument('--open', action='store_true', help='only unchecked tasks')
+    status.add_argument('--done', action='store_true', help='only completed tasks')
+    parser.add_argument('--path', metavar='PREFIX', help='only tasks in notes under this vault folder')
+    parser.add_argument('--tag', help='only tasks carrying this tag or one nested below it')
+    parser.add_argument(
+        '--due-before',
+        type=date.fromisoformat,
+        metavar='YYYY-MM-DD',
+        help='only tasks with a due date before this day',
+    )
+    parser.add_argument('--limit', type=int, metavar='N', help='print at most N tasks')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per task')
+    args = parser.parse_args(argv)
+    index = TaskIndex(args.db)
+    try:
+        if not args.no_update:
+            started = time.perf_counter()
+            changed, removed = index.update()
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"Indexed {changed} changed and {removed} removed notes in {elapsed:.1f} ms", file=sys.stderr)
+        done = True if args.done else False if args.open else None
+        started = time.perf_counter()
+        tasks = index.query(done, args.path, args.tag, args.due_before, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        for task in tasks:
+            print(json.dumps(task.__dict__, ensure_ascii=False) if args.json else task.format())
+        print(f"{len(tasks)} tasks in {elapsed:.1f} ms", file=sys.stderr)
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
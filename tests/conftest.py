@@ -0,0 +1,5 @@
+from pathlib import Path
+import sys
+
+# The tools are standalone scripts that import each other by module name.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'scripts'))
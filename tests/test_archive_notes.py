@@ -0,0 +1,82 @@
+from datetime import date
+
+import fill_empty_files as fill
+from archive_notes import archive, find_candidates, patch_header, plan_moves
+from frontmatter_index import FrontmatterIndex
+from link_graph import vault_trees
+
+DONE = '---\ntags: [done]\n---\nBody\n'
+
+
+def _vault(root, notes):
+    for rel, text in notes.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode('utf-8'))
+
+
+def test_candidates_skip_archive_system_and_template_folders(tmp_path):
+    _vault(tmp_path, {
+        '04_Memory/AI/old.md': DONE,
+        '05_Output/Projects/launch.md': '---\nstatus: done\n---\n',
+        '05_Output/Projects/open.md': '---\nstatus: active\n---\n',
+        '06_Templates/tpl-done.md': DONE,
+        '07_System/Guides/example.md': DONE,
+        '99_Archive/2025/old.md': DONE,
+        'Sample2025YK/04_Memory/AI/idea.md': DONE,
+        'Sample2025YK/06_Templates/tpl-done.md': DONE,
+        'Sample2025YK/99_Archive/2025/old.md': DONE,
+    })
+    index = FrontmatterIndex(tmp_path)
+    index.update()
+    candidates = find_candidates(index)
+    assert candidates == ['04_Memory/AI/old.md', '05_Output/Projects/launch.md', 'Sample2025YK/04_Memory/AI/idea.md']
+    moves, conflicts = plan_moves(candidates, date(2026, 1, 31), tmp_path, vault_trees(index.paths))
+    assert [move.target for move in moves] == [
+        '99_Archive/2026/old.md',
+        '99_Archive/2026/launch.md',
+        'Sample2025YK/99_Archive/2026/idea.md',
+    ]
+    assert conflicts == []
+
+
+def test_archive_keeps_nested_vault_notes_in_their_own_archive(tmp_path):
+    _vault(tmp_path, {
+        '04_Memory/AI/old.md': DONE,
+        'Sample2025YK/04_Memory/AI/old.md': DONE,
+        'Sample2025YK/04_Memory/index.md': '[[AI/old]]\n',
+    })
+    moves, rewritten, failures = archive(date(2026, 1, 31), fill.NoteWriter(), root=tmp_path)
+    assert failures == []
+    assert sorted(move.target for move in moves) == ['99_Archive/2026/old.md', 'Sample2025YK/99_Archive/2026/old.md']
+    assert rewritten == ['Sample2025YK/04_Memory/index.md']
+    # The outer vault's old.md does not make the name ambiguous inside Sample2025YK.
+    assert (tmp_path / 'Sample2025YK/04_Memory/index.md').read_text(encoding='utf-8') == '[[old]]\n'
+    index = FrontmatterIndex(tmp_path)
+    assert index.paths == [rel for rel, _, _ in fill.iter_notes(tmp_path)]
+    assert set(index.column('archived_on')) == {'2026-01-31', None}
+
+
+def test_patch_header_keeps_crlf_line_endings(tmp_path):
+    path = tmp_path / 'note.md'
+    path.write_bytes(b'---\r\ntitle: Plan\r\n---\r\nBody\r\n')
+    assert patch_header(path, {'archived': 'true'})
+    assert path.read_bytes() == b'---\r\ntitle: Plan\r\narchived: true\r\n---\r\nBody\r\n'
+
+
+def test_patch_header_adds_frontmatter_when_missing(tmp_path):
+    path = tmp_path / 'note.md'
+    path.write_bytes(b'# Plan\n---\nBody\n')
+    assert patch_header(path, {'archived': 'true'})
+    assert path.read_bytes() == b'---\narchived: true\n---\n# Plan\n---\nBody\n'
+
+
+def test_patch_header_resumed_run_keeps_the_first_date(tmp_path):
+    path = tmp_path / 'note.md'
+    path.write_bytes(b'---\ntags: [done]\n---\nBody\n')
+    assert patch_header(path, {'archived': 'true', 'archived_on': '2026-01-31'})
+    patched = path.read_bytes()
+    assert not patch_header(path, {'archived': 'true', 'archived_on': '2026-02-28'})
+    assert path.read_bytes() == patched
+    assert b'archived_on: 2026-01-31\n' in patched
+    assert [entry.name for entry in tmp_path.iterdir()] == ['note.md']
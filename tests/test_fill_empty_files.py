@@ -0,0 +1,410 @@
+import argparse
+from datetime import date, timedelta
+import errno
+import os
+import time
+
+import pytest
+
+import fill_empty_files as fill
+
+
+def test_scanner_skips_writer_temp_files(tmp_path):
+    folder = tmp_path / '04_Memory' / 'AI'
+    folder.mkdir(parents=True)
+    (folder / 'agents.md').write_text('')
+    (folder / '.agents.md.k3j9x_2a.tmp').write_text('')
+    (folder / '.hidden.md').write_text('')
+    temp_files = []
+    found = [path.relative_to(tmp_path).as_posix() for path in fill.iter_empty_files(tmp_path, temp_files=temp_files)]
+    assert found == ['04_Memory/AI/agents.md']
+    # The scan itself collects the leftovers, so cleaning up needs no second walk.
+    assert temp_files == [str(folder / '.agents.md.k3j9x_2a.tmp')]
+
+
+def test_only_stale_temp_files_are_removed(tmp_path):
+    (tmp_path / 'note.md').write_text('x')
+    stale = tmp_path / '.note.md.ab12cd34.tmp'
+    fresh = tmp_path / '.note.md.ef56gh78.tmp'
+    stale.write_text('')
+    fresh.write_text('')
+    old = time.time() - 2 * fill.STALE_TEMP_SECONDS
+    os.utime(stale, (old, old))
+    temp_files = []
+    notes = list(fill.iter_notes(tmp_path, temp_files))
+    assert [rel for rel, _, _ in notes] == ['note.md']
+    assert sorted(temp_files) == sorted([str(stale), str(fresh)])
+    assert fill.remove_stale_temp_files(temp_files) == 1
+    assert not stale.exists() and fresh.exists()
+
+
+def _day(done, still_open):
+    return fill.ActivitySummary(
+        days=1,
+        notes=1,
+        done=len(done),
+        pending=len(still_open),
+        done_tasks=list(done),
+        open_tasks=list(still_open),
+    )
+
+
+def test_span_counts_distinct_tasks():
+    span = fill.ActivitySummary()
+    span.merge(_day(['ship'], ['write', 'review']))
+    span.merge(_day(['ship', 'write'], ['review']))
+    span.merge(_day(['ship'], []))
+    assert span.done == 2 and span.done_tasks == ['ship', 'write']
+    assert span.pending == 1 and span.open_tasks == ['review']
+
+
+def test_span_keeps_counts_beyond_the_listed_tasks():
+    busy = _day([f'done {n}' for n in range(60)], [f'open {n}' for n in range(70)])
+    busy.done_tasks = busy.done_tasks[:fill.SUMMARY_TASK_LIMIT]
+    busy.open_tasks = busy.open_tasks[:fill.SUMMARY_TASK_LIMIT]
+    span = fill.ActivitySummary()
+    span.merge(busy)
+    span.merge(_day(['done 0'], ['open 0']))
+    assert (span.done, span.pending) == (60, 70)
+    assert len(span.open_tasks) == fill.SUMMARY_TASK_LIMIT
+
+
+def test_reviews_fall_due_on_the_last_day_of_their_period():
+    weekly = '02_Daily/Weekly-Reviews/2025/2025-W02.md'
+    monthly = '02_Daily/Monthly-Reviews/2025/2025-02.md'
+    assert fill.review_period_end(weekly) == date(2025, 1, 12)
+    assert fill.review_period_end(monthly) == date(2025, 2, 28)
+    assert not fill.review_is_due(weekly, date(2025, 1, 11))
+    assert fill.review_is_due(weekly, date(2025, 1, 12))
+    assert fill.review_is_due('04_Memory/AI/agents.md', date(2000, 1, 1))
+
+
+def test_scaffold_leaves_future_reviews_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(fill, 'BASE_DIR', tmp_path)
+    today = date.today()
+    args = argparse.Namespace(start=today - timedelta(days=40), end=today + timedelta(days=40), jobs=1, batch_fsync=False)
+    assert fill._scaffold(args, None) == 0
+    reviews = sorted((tmp_path / '02_Daily').glob('*-Reviews/*/*.md'))
+    assert reviews
+    for path in reviews:
+        due = fill.review_is_due(path.relative_to(tmp_path).as_posix(), today)
+        assert (path.stat().st_size > 0) == due
+    empty = [path.relative_to(tmp_path).as_posix() for path in fill.iter_empty_files(tmp_path)]
+    assert empty and not any(fill.review_is_due(rel, today) for rel in empty)
+
+
+def test_skip_open_reviews_names_what_it_leaves(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(fill, 'BASE_DIR', tmp_path)
+    paths = [
+        tmp_path / '02_Daily/Weekly-Reviews/2025/2025-W02.md',
+        tmp_path / '02_Daily/Weekly-Reviews/2025/2025-W03.md',
+        tmp_path / '02_Daily/Monthly-Reviews/2025/2025-01.md',
+        tmp_path / '04_Memory/AI/agents.md',
+    ]
+    kept = list(fill.skip_open_reviews(paths, date(2025, 1, 12)))
+    assert kept == [paths[0], paths[3]]
+    assert capsys.readouterr().err.splitlines() == [
+        'Skipped 02_Daily/Weekly-Reviews/2025/2025-W03.md: period ends 2025-01-19',
+        'Skipped 02_Daily/Monthly-Reviews/2025/2025-01.md: period ends 2025-01-31',
+    ]
+
+
+def test_rename_never_replaces_an_existing_note(tmp_path):
+    source = tmp_path / 'draft.md'
+    target = tmp_path / 'final.md'
+    source.write_text('draft')
+    target.write_text('final')
+    writer = fill.NoteWriter()
+    with pytest.raises(FileExistsError):
+        writer.rename(source, target)
+    assert source.read_text() == 'draft' and target.read_text() == 'final'
+    target.unlink()
+    writer.rename(source, target)
+    assert not source.exists() and target.read_text() == 'draft'
+
+
+def test_update_listing_matches_a_fresh_walk(tmp_path):
+    for rel in ('01_Inbox/idea.md', '04_Memory/AI/agents.md', '04_Memory/AI/rag.md'):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    notes = list(fill.iter_notes(tmp_path))
+    os.rename(tmp_path / '01_Inbox/idea.md', tmp_path / '04_Memory/AI/idea.md')
+    (tmp_path / '04_Memory/AI/rag.md').write_text('rewritten')
+    moves = {'01_Inbox/idea.md': '04_Memory/AI/idea.md'}
+    updated = fill.update_listing(notes, ['04_Memory/AI/idea.md', '04_Memory/AI/rag.md'], moves, tmp_path)
+    assert updated == list(fill.iter_notes(tmp_path))
+
+
+def test_rename_falls_back_when_hard_links_are_unsupported(tmp_path, monkeypatch):
+    def no_links(source, target):
+        raise OSError(errno.EPERM, 'Operation not permitted')
+
+    monkeypatch.setattr(fill.os, 'link', no_links)
+    source = tmp_path / 'draft.md'
+    target = tmp_path / 'final.md'
+    source.write_text('draft')
+    target.write_text('final')
+    writer = fill.NoteWriter()
+    with pytest.raises(FileExistsError):
+        writer.rename(source, target)
+    assert target.read_text() == 'final'
+    target.unlink()
+    writer.rename(source, target)
+    assert not source.exists() and target.read_text() == 'draft'
+
+
+@pytest.mark.parametrize('token, stem', [
+    ('prompts', 'prompt'),
+    ('prompting', 'prompt'),
+    ('debugging', 'debug'),
+    ('stories', 'story'),
+    ('tested', 'test'),
+    ('status', 'status'),
+    ('analysis', 'analysis'),
+    ('use', 'use'),
+])
+def test_stem_token(token, stem):
+    assert fill.stem_token(token) == stem
+
+
+def test_token_index_resolves_exact_stem_and_compound_forms():
+    index = fill.TokenIndex(['prompting', 'multi', 'agent', 'rag', 'vector', 'system'])
+    assert index.lookup('rag') == ('rag',)
+    assert index.lookup('prompts') == ('prompting',)
+    assert index.lookup('multiagent') == ('multi', 'agent')
+    # The inflection only comes off once the stem is split.
+    assert index.lookup('multiagents') == ('multi', 'agent')
+    assert index.lookup('ragvectors') == ('rag', 'vector')
+    # Unknown tokens, and pieces shorter than two characters, resolve to nothing.
+    assert index.lookup('zzzz') == ()
+    assert index.lookup('ragx') == ()
+    assert index.resolve(['multi', 'agent', 'systems', 'multiagent']) == ['multi', 'agent', 'system']
+
+
+def test_memory_note_slugs_resolve_against_the_catalog():
+    # Pins the catalog keys that drive the generated 04_Memory notes.
+    index = fill.token_index()
+    assert index.resolve(fill.slug_tokens('prompt-engineering-basics'))[:1] == ['prompting']
+    assert index.lookup('multiagent') == ('multi', 'agent')
+    assert index.resolve(fill.slug_tokens('multi-agent-systems')) == ['multi', 'agent', 'system']
+    assert index.resolve(fill.slug_tokens('unknown-thing')) == []
+
+
+def _if_chain(rel):
+    # The generator generate_content picked before routing moved into GeneratorRouter.
+    name = rel.rsplit('/', 1)[-1]
+    if rel.startswith('02_Daily/Weekly-Reviews/'):
+        return 'generate_weekly_review'
+    if rel.startswith('02_Daily/Monthly-Reviews/'):
+        return 'generate_monthly_review'
+    if rel.startswith('07_System/Dashboards/'):
+        return 'generate_dashboard'
+    if rel == '04_Memory/_Master-Index.md':
+        return 'generate_memory_master_index'
+    if rel.startswith('04_Memory/') and name.startswith('_'):
+        return 'generate_memory_moc'
+    if rel.startswith('04_Memory/'):
+        return 'generate_memory_note'
+    if rel.startswith('03_Input/'):
+        return 'generate_input_note'
+    if rel.startswith('06_Templates/'):
+        return 'generate_template'
+    if rel.startswith('99_Archive/'):
+        return 'generate_archive_note'
+    if rel.startswith('05_Output/Areas/Personal/'):
+        return 'generate_area_personal'
+    if rel.startswith('05_Output/Areas/Content-Creation/'):
+        return 'generate_area_content_creation'
+    if rel.startswith('05_Output/Areas/Business/'):
+        return 'generate_area_business'
+    if rel.startswith('05_Output/Projects/'):
+        return 'generate_project_note'
+    return None
+
+
+@pytest.mark.parametrize('rel', [
+    '02_Daily/Weekly-Reviews/2025/2025-W02.md',
+    '02_Daily/Monthly-Reviews/2025/2025-02.md',
+    '02_Daily/2025/01/2025-01-06.md',
+    '07_System/Dashboards/Tasks.md',
+    '07_System/Guides/example.md',
+    '04_Memory/_Master-Index.md',
+    '04_Memory/_AI-MOC.md',
+    '04_Memory/AI/_AI-MOC.md',
+    '04_Memory/AI/_Master-Index.md',
+    '04_Memory/AI/agents.md',
+    '04_Memory/agents_notes.md',
+    '03_Input/Articles/rag.md',
+    '06_Templates/tpl-daily.md',
+    '99_Archive/2025/old.md',
+    '05_Output/Areas/Personal/health.md',
+    '05_Output/Areas/Content-Creation/ideas.md',
+    '05_Output/Areas/Business/plan.md',
+    '05_Output/Areas/Other/plan.md',
+    '05_Output/Projects/launch/overview.md',
+    '01_Inbox/idea.md',
+    'Sample2025YK/04_Memory/AI/agents.md',
+    'README.md',
+])
+def test_router_matches_the_old_if_chain(rel):
+    generator = fill.ROUTER.resolve(rel)
+    assert (generator.__name__ if generator else None) == _if_chain(rel)
+
+
+def test_router_matches_the_old_if_chain_for_the_vault():
+    for rel, _, _ in fill.iter_notes(fill.BASE_DIR):
+        generator = fill.ROUTER.resolve(rel)
+        assert (generator.__name__ if generator else None) == _if_chain(rel), rel
+
+
+def test_parallel_fill_keeps_input_order_and_survives_a_failure(tmp_path, monkeypatch):
+    def slow_render(path, cache=None, metrics=None):
+        if path.name == 'n03.md':
+            raise ValueError('boom')
+        # Earlier files take longest, so workers finish out of order.
+        time.sleep((12 - int(path.stem[1:])) * 0.002)
+        return path.name
+
+    monkeypatch.setattr(fill, 'generate_content', slow_render)
+    paths = [tmp_path / f'n{n:02}.md' for n in range(12)]
+    for path in paths:
+        path.write_text('')
+    results = list(fill.fill_files(paths, jobs=4))
+    assert [path for path, _ in results] == paths
+    errors = {path.name: str(error) for path, error in results if error is not None}
+    assert errors == {'n03.md': 'boom'}
+    assert all(path.read_text() == path.name for path in paths if path.name != 'n03.md')
+    assert (tmp_path / 'n03.md').read_text() == ''
+
+
+def test_manifest_skips_unchanged_directories(tmp_path, monkeypatch):
+    for rel in ('04_Memory/AI/agents.md', '04_Memory/AI/rag.md', '03_Input/Articles/old.md'):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text('')
+    manifest_path = tmp_path / '.cache' / 'manifest.json'
+    # Saving the manifest would otherwise change the root's mtime after the first scan.
+    manifest_path.parent.mkdir()
+
+    def scan():
+        manifest = fill.ScanManifest.load(manifest_path, tmp_path)
+        found = [path.relative_to(tmp_path).as_posix() for path in fill.iter_empty_files(tmp_path, manifest=manifest)]
+        manifest.save(manifest_path)
+        return found
+
+    first = scan()
+    assert first == [path.relative_to(tmp_path).as_posix() for path in fill.iter_empty_files(tmp_path)]
+    read = []
+    read_dir_entries = fill._read_dir_entries
+    monkeypatch.setattr(fill, '_read_dir_entries', lambda directory, temp_files=None: (
+        read.append(os.path.relpath(directory, tmp_path)) or read_dir_entries(directory, temp_files)
+    ))
+    assert scan() == first
+    assert read == []
+    # A new note changes only its own directory's mtime; a note filled in place needs no listing.
+    (tmp_path / '04_Memory/AI/agents.md').write_text('filled')
+    (tmp_path / '03_Input/Articles/new.md').write_text('')
+    later = os.stat(tmp_path / '03_Input/Articles').st_mtime_ns + 10**9
+    os.utime(tmp_path / '03_Input/Articles', ns=(later, later))
+    assert scan() == ['03_Input/Articles/new.md', '03_Input/Articles/old.md', '04_Memory/AI/rag.md']
+    assert read == [os.path.join('03_Input', 'Articles')]
+
+
+def test_generation_cache_hits_misses_and_skips_reviews(tmp_path, monkeypatch):
+    calls = []
+
+    def generate_template(path):
+        calls.append(path.name)
+        return f'# {path.stem}\n'
+
+    def generate_weekly_review(path):
+        calls.append(path.name)
+        return f'# {path.stem}\n'
+
+    router = fill.GeneratorRouter()
+    router.register('06_Templates', generate_template)
+    router.register('02_Daily/Weekly-Reviews', generate_weekly_review)
+    monkeypatch.setattr(fill, 'ROUTER', router)
+    monkeypatch.setattr(fill, 'BASE_DIR', tmp_path)
+    cache = fill.GenerationCache(tmp_path / 'cache')
+    template = tmp_path / '06_Templates/tpl-daily.md'
+    review = tmp_path / '02_Daily/Weekly-Reviews/2025/2025-W02.md'
+    for _ in range(2):
+        assert fill.generate_content(template, cache) == '# tpl-daily\n'
+        assert fill.generate_content(review, cache) == '# 2025-W02\n'
+    assert calls == ['tpl-daily.md', '2025-W02.md', '2025-W02.md']
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+def test_generation_cache_evicts_least_recently_used_first(tmp_path):
+    cache = fill.GenerationCache(tmp_path, max_bytes=20)
+    for age, key in enumerate(('newest', 'middle', 'oldest')):
+        cache.put(key, 'x' * 10)
+        stamp = time.time() - 100 * (age + 1)
+        os.utime(tmp_path / key, (stamp, stamp))
+    # Reading an entry counts as a use, so the oldest write survives once it is read again.
+    assert cache.get('oldest') == 'x' * 10
+    cache.close()
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['newest', 'oldest']
+    assert cache.get('middle') is None
+    assert cache.summary() == 'Cache: 1 hits, 1 misses (50% hit rate)'
+
+
+def test_metrics_prometheus_text_format():
+    metrics = fill.RunMetrics()
+    metrics.record_render('generate_template', 0.5, 120)
+    metrics.record_write(0.25)
+    metrics.scan_seconds = 0.125
+    assert metrics.format_prometheus() == (
+        '# HELP fill_empty_files_render_seconds Time spent rendering notes, per generator.\n'
+        '# TYPE fill_empty_files_render_seconds summary\n'
+        'fill_empty_files_render_seconds{generator="generate_template",quantile="0.5"} 0.500000000\n'
+        'fill_empty_files_render_seconds{generator="generate_template",quantile="0.95"} 0.500000000\n'
+        'fill_empty_files_render_seconds{generator="generate_template",quantile="0.99"} 0.500000000\n'
+        'fill_empty_files_render_seconds_sum{generator="generate_template"} 0.500000000\n'
+        'fill_empty_files_render_seconds_count{generator="generate_template"} 1\n'
+        '# HELP fill_empty_files_rendered_bytes_total UTF-8 bytes produced, per generator.\n'
+        '# TYPE fill_empty_files_rendered_bytes_total counter\n'
+        'fill_empty_files_rendered_bytes_total{generator="generate_template"} 120\n'
+        '# HELP fill_empty_files_scan_seconds Time spent scanning the vault for candidates.\n'
+        '# TYPE fill_empty_files_scan_seconds gauge\n'
+        'fill_empty_files_scan_seconds 0.125000000\n'
+        '# HELP fill_empty_files_write_seconds Time spent writing notes.\n'
+        '# TYPE fill_empty_files_write_seconds gauge\n'
+        'fill_empty_files_write_seconds 0.250000000\n'
+        '# HELP fill_empty_files_writes Notes written.\n'
+        '# TYPE fill_empty_files_writes gauge\n'
+        'fill_empty_files_writes 1\n'
+    )
+
+
+def test_month_takes_only_its_own_days_from_a_straddling_week(tmp_path):
+    # ISO week 2025-W01 runs from Monday 2024-12-30 to Sunday 2025-01-05.
+    for day, text in (('2024-12-31', '- [x] close the year\n'), ('2025-01-02', '- [ ] plan the year\n')):
+        folder = tmp_path / '02_Daily' / day[:4] / day[:7] / day
+        folder.mkdir(parents=True)
+        (folder / 'Daily.md').write_text(text, encoding='utf-8')
+    summaries = fill.DailySummaries(tmp_path)
+    week = summaries.week(2025, 1)
+    assert (week.days, week.done_tasks, week.open_tasks) == (2, ['close the year'], ['plan the year'])
+    december = summaries.month(2024, 12)
+    january = summaries.month(2025, 1)
+    assert (december.days, december.done_tasks, december.open_tasks) == (1, ['close the year'], [])
+    assert (january.days, january.done_tasks, january.open_tasks) == (1, [], ['plan the year'])
+    assert january == summaries.span(date(2025, 1, 1), date(2025, 1, 31))
+
+
+def test_plan_writes_no_cache_files(tmp_path, monkeypatch, capsys):
+    note = tmp_path / '04_Memory/AI/prompt-engineering-basics.md'
+    note.parent.mkdir(parents=True)
+    note.write_text('')
+    monkeypatch.setattr(fill, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(fill, 'MANIFEST_PATH', tmp_path / '.cache' / 'fill_empty_files.json')
+    monkeypatch.setattr(fill, 'CACHE_DIR', tmp_path / '.cache' / 'generated')
+    monkeypatch.setattr(fill, 'CATALOG_CACHE_PATH', tmp_path / '.cache' / 'token_catalog.marshal')
+    monkeypatch.setattr(fill, '_catalog', None)
+    monkeypatch.setattr(fill, '_cache_writes', True)
+    monkeypatch.setattr(fill, 'iter_empty_files', lambda manifest=None, temp_files=None: iter([note]))
+    assert fill.main(['--plan', '--cache']) == 0
+    assert '"generator": "generate_memory_note"' in capsys.readouterr().out
+    assert note.read_text() == '' and not (tmp_path / '.cache').exists()
@@ -0,0 +1,51 @@
+import io
+
+from frontmatter_index import FrontmatterIndex, header_lines, parse_frontmatter, read_header
+
+
+def test_read_header_stops_at_the_closing_marker(tmp_path):
+    path = tmp_path / 'note.md'
+    path.write_bytes(b'---\ntitle: Plan\n---\nkey: not a field\n')
+    assert read_header(path) == {'title': 'Plan'}
+    path.write_bytes(b'# No header\n---\n')
+    assert read_header(path) == {}
+    path.write_bytes(b'---\ntitle: never closed\n')
+    assert read_header(path) == {}
+
+
+def test_header_lines_leave_the_handle_at_the_body():
+    handle = io.BytesIO(b'---\r\ntitle: Plan\r\n---\r\nBody\r\n')
+    assert header_lines(handle) == [b'---\r\n', b'title: Plan\r\n', b'---\r\n']
+    assert handle.read() == b'Body\r\n'
+    assert header_lines(io.BytesIO(b'# No header\n---\n')) == []
+
+
+def test_parse_frontmatter_reads_the_vault_yaml_subset():
+    fields, body_start = parse_frontmatter(['---', 'tags: [ai, "rag"]', 'year: 2025', 'aliases:', '  - RAG', '---', 'Body'])
+    assert fields == {'tags': ['ai', 'rag'], 'year': 2025, 'aliases': ['RAG']}
+    assert body_start == 6
+
+
+def test_queries_and_incremental_update(tmp_path):
+    notes = {
+        'a.md': '---\ntags: [done, ai]\nstart: 2025-01-10\n---\n',
+        'b.md': '---\nstatus: done\nstart: 2025-03-01\n---\n',
+        'c.md': 'No header.\n',
+    }
+    for rel, text in notes.items():
+        (tmp_path / rel).write_text(text, encoding='utf-8')
+    index = FrontmatterIndex(tmp_path, tmp_path / 'frontmatter.json')
+    assert index.update() == 3
+    assert index.equals('tags', 'done') == {0}
+    assert index.between('start', '2025-01-01', '2025-01-31') == {0}
+    assert index.with_key('status') == {1}
+    assert index.rows({1}, ['status']) == [{'path': 'b.md', 'status': 'done'}]
+    index.save()
+    reloaded = FrontmatterIndex(tmp_path, tmp_path / 'frontmatter.json')
+    assert reloaded.update() == 0
+    (tmp_path / 'c.md').write_text('---\nstatus: active\n---\n', encoding='utf-8')
+    (tmp_path / 'a.md').unlink()
+    assert reloaded.update() == 1
+    assert reloaded.paths == ['b.md', 'c.md']
+    assert reloaded.column('status') == ['done', 'active']
+    assert 'tags' not in reloaded.columns
@@ -0,0 +1,20 @@
+import fill_empty_files as fill
+from inbox_router import route_inbox
+
+
+def test_route_inbox_moves_and_relinks_without_a_second_walk(tmp_path, monkeypatch):
+    (tmp_path / '05_Output/Projects/@Active/Launch-Plan').mkdir(parents=True)
+    (tmp_path / '01_Inbox').mkdir()
+    (tmp_path / '01_Inbox/kickoff.md').write_text('---\nproject: "[[Launch-Plan]]"\n---\nAgenda\n', encoding='utf-8')
+    (tmp_path / 'index.md').write_text('[[01_Inbox/kickoff]]\n', encoding='utf-8')
+    notes = list(fill.iter_notes(tmp_path))
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError('route_inbox walked the vault again')
+
+    monkeypatch.setattr(fill, 'iter_notes', no_walk)
+    routes, moves, rewritten, failures = route_inbox(notes, ['01_Inbox/kickoff.md'], fill.NoteWriter(), tmp_path)
+    assert moves == {'01_Inbox/kickoff.md': '05_Output/Projects/@Active/Launch-Plan/kickoff.md'}
+    assert rewritten == ['index.md'] and failures == []
+    assert (tmp_path / 'index.md').read_text(encoding='utf-8') == '[[kickoff]]\n'
+    assert (tmp_path / '.cache/link_graph.json').exists()
@@ -0,0 +1,85 @@
+import fill_empty_files as fill
+from link_graph import LinkIndex, parse_links, relink
+
+
+def _vault(root, notes):
+    for rel, text in notes.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+
+def _move(root, moves):
+    # Index the vault as it was, move the notes, then let relink fix the links.
+    index = LinkIndex(root)
+    index.update()
+    writer = fill.NoteWriter()
+    for source, target in moves.items():
+        (root / target).parent.mkdir(parents=True, exist_ok=True)
+        writer.rename(root / source, root / target)
+    return sorted(relink(index, moves, writer))
+
+
+def test_code_is_never_rewritten(tmp_path):
+    _vault(tmp_path, {
+        'A/timeline.md': '# Timeline\n',
+        'B/plan.md': 'See [[A/timeline]] and `[[A/timeline]]`.\n```\n[[A/timeline]]\n```\n',
+    })
+    assert _move(tmp_path, {'A/timeline.md': 'Z/timeline.md'}) == ['B/plan.md']
+    text = (tmp_path / 'B/plan.md').read_text(encoding='utf-8')
+    assert text == 'See [[timeline]] and `[[A/timeline]]`.\n```\n[[A/timeline]]\n```\n'
+    assert parse_links(text.split('\n')) == ['timeline']
+
+
+def test_headings_aliases_and_embeds_survive(tmp_path):
+    _vault(tmp_path, {
+        'A/timeline.md': '# Timeline\n',
+        'B/plan.md': '[[A/timeline#Q3|the plan]] | ![[A/timeline^goals]] | [[A/timeline\\|table]]\n',
+    })
+    _move(tmp_path, {'A/timeline.md': 'Z/Y/X/timeline.md'})
+    text = (tmp_path / 'B/plan.md').read_text(encoding='utf-8')
+    assert text == '[[timeline#Q3|the plan]] | ![[timeline^goals]] | [[timeline\\|table]]\n'
+
+
+def test_ambiguous_names_get_the_full_path(tmp_path):
+    _vault(tmp_path, {
+        'B/plan.md': '# B\n',
+        'C/plan.md': '# C\n',
+        'B/notes.md': 'Next: [[plan]]\n',
+    })
+    assert _move(tmp_path, {'B/plan.md': 'Z/plan.md'}) == ['B/notes.md']
+    assert (tmp_path / 'B/notes.md').read_text(encoding='utf-8') == 'Next: [[Z/plan]]\n'
+
+
+def test_templates_and_other_vault_trees_are_left_alone(tmp_path):
+    _vault(tmp_path, {
+        'A/timeline.md': '# Timeline\n',
+        '06_Templates/Projects/overview.md': '[[Timeline]] [[A/timeline]]\n',
+        'Sample/06_Templates/Projects/overview.md': '[[Timeline]] [[A/timeline]]\n',
+        'Sample/04_Memory/notes.md': '[[A/timeline]] [[01_Inbox/idea]]\n',
+        'Sample/01_Inbox/idea.md': '# Idea\n',
+    })
+    moves = {'A/timeline.md': 'Z/Y/X/timeline.md', 'Sample/01_Inbox/idea.md': 'Sample/04_Memory/AI/idea.md'}
+    assert _move(tmp_path, moves) == ['Sample/04_Memory/notes.md']
+    for template in ('06_Templates/Projects/overview.md', 'Sample/06_Templates/Projects/overview.md'):
+        assert (tmp_path / template).read_text(encoding='utf-8') == '[[Timeline]] [[A/timeline]]\n'
+    # The nested vault cannot see A/timeline, but its own moved note is relinked.
+    assert (tmp_path / 'Sample/04_Memory/notes.md').read_text(encoding='utf-8') == '[[A/timeline]] [[idea]]\n'
+
+
+def test_build_reports_backlinks_broken_links_and_orphans(tmp_path):
+    _vault(tmp_path, {
+        'A/home.md': '[[plan]] [[./sub/deep|deep]] [[missing]] ![[diagram.png]] [[#Top]]\n',
+        'A/sub/deep.md': '[[../home]]\n',
+        'B/plan.md': '`[[ignored]]`\n',
+        'C/alone.md': 'No links.\n',
+    })
+    index = LinkIndex(tmp_path, tmp_path / 'links.json')
+    assert index.update() == 4
+    graph, broken = index.build()
+    assert graph.links('A/home.md') == ['A/sub/deep.md', 'B/plan.md']
+    assert graph.backlinks('A/home.md') == ['A/sub/deep.md']
+    assert [link.format() for link in broken] == ['A/home.md: [[missing]]']
+    assert graph.orphans() == ['C/alone.md']
+    index.save()
+    assert LinkIndex(tmp_path, tmp_path / 'links.json').update() == 0
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+import fill_empty_files as fill
+from link_graph import LinkIndex
+from materialize_dashboards import (
+    Evaluator,
+    NoteIndex,
+    input_digest,
+    load_dashboard,
+    parse_query,
+    render_rows,
+    render_section,
+)
+from task_index import TaskIndex, parse_tasks
+
+NOTES = {
+    'P/a.md': '---\nstatus: active\npriority: 2\n---\n- [ ] ship a\n',
+    'P/b.md': '---\nstatus: active\npriority: 1\n---\n- [x] done b\n',
+    'P/c.md': '---\nstatus: paused\npriority: 3\n---\n',
+    'Q/d.md': '---\nstatus: active\n---\n',
+}
+
+
+@pytest.fixture
+def evaluator(tmp_path):
+    for rel, text in NOTES.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text, encoding='utf-8')
+    listing = list(fill.iter_notes(tmp_path))
+    notes = NoteIndex(tmp_path, tmp_path / 'notes.json')
+    notes.update(listing)
+    tasks = TaskIndex(tmp_path / 'tasks.sqlite3', tmp_path)
+    tasks.update(listing)
+    yield Evaluator(notes, tasks, date(2026, 1, 1))
+    tasks.close()
+
+
+@pytest.mark.parametrize('text, expected', [
+    (
+        'TABLE priority FROM "P" WHERE status = "active" SORT priority ASC',
+        '| File | priority |\n|---|---|\n| [[P/b\\|b]] | 1 |\n| [[P/a\\|a]] | 2 |\n',
+    ),
+    ('TASK FROM "P" WHERE !completed', '- ☐ ship a ([[P/a|a]])\n'),
+    ('LIST FROM "P" LIMIT 1', '- [[P/a|a]]\n'),
+    ('LIST FROM "Z"', '_該当なし_\n'),
+])
+def test_queries_render_static_markdown(evaluator, text, expected):
+    query = parse_query(text)
+    assert render_rows(query, evaluator.run(query), evaluator) == expected
+
+
+def test_digest_follows_only_the_queried_folders(tmp_path):
+    dashboard_path = tmp_path / 'dash.md'
+    dashboard_path.write_text('# Projects\n```dataview\nLIST FROM "P"\n```\n', encoding='utf-8')
+    dashboard = load_dashboard(dashboard_path)
+    listing = [('P/a.md', 1, 10), ('Q/d.md', 1, 10)]
+    digest = input_digest(dashboard, listing, date(2026, 1, 1))
+    assert input_digest(dashboard, [('P/a.md', 1, 10), ('Q/d.md', 2, 12)], date(2026, 1, 1)) == digest
+    assert input_digest(dashboard, [('P/a.md', 2, 12), ('Q/d.md', 1, 10)], date(2026, 1, 1)) != digest
+    # Nothing in the query depends on the date, so the next day needs no re-render.
+    assert input_digest(dashboard, listing, date(2026, 1, 2)) == digest
+
+
+def test_only_queries_relative_to_today_follow_the_date(tmp_path, evaluator):
+    dashboard_path = tmp_path / 'dash.md'
+    dashboard_path.write_text(
+        '# Recent\n```dataview\nLIST FROM "P" WHERE file.mtime >= date(today) - dur(2 days)\n```\n'
+        '# All\n```dataview\nLIST FROM "Q"\n```\n',
+        encoding='utf-8',
+    )
+    dashboard = load_dashboard(dashboard_path)
+    listing = [('P/a.md', 1, 10)]
+    assert input_digest(dashboard, listing, date(2026, 1, 2)) != input_digest(dashboard, listing, date(2026, 1, 1))
+    section = render_section(dashboard, evaluator, 'digest', date(2026, 1, 1))
+    assert '### Recent (2026-01-01 時点)\n' in section and '### All\n' in section
+    assert '## 📴 オフライン版\n' in section
+
+
+def test_materialized_section_is_not_indexed_again(tmp_path, evaluator):
+    dashboard_path = tmp_path / 'D/home.md'
+    dashboard_path.parent.mkdir()
+    dashboard_path.write_text('# Home\n- [ ] own task #home\n```dataview\nTASK FROM "P"\n```\n', encoding='utf-8')
+    dashboard = load_dashboard(dashboard_path)
+    section = render_section(dashboard, evaluator, 'digest', date(2026, 1, 1))
+    dashboard_path.write_text(dashboard.body + '\n' + section + '- [ ] after the section\n', encoding='utf-8')
+    lines = dashboard_path.read_text(encoding='utf-8').splitlines()
+    assert [task.text for task in parse_tasks('D/home.md', lines)] == ['own task #home', 'after the section']
+    listing = list(fill.iter_notes(tmp_path))
+    links = LinkIndex(tmp_path, tmp_path / 'links.json')
+    links.update(listing)
+    assert links.notes['D/home.md'][2] == []
+    notes = NoteIndex(tmp_path, tmp_path / 'notes2.json')
+    notes.update(listing)
+    assert notes.notes['D/home.md'].tags == ['home']
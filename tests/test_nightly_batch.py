@@ -0,0 +1,61 @@
+from datetime import date
+
+import nightly_batch
+from nightly_batch import NightlyBatch, extract_sections, run, stage_fill
+
+DAILY = """---
+date: 2025-11-04
+---
+## 💡 Ideas
+- Batch the inbox on Wednesdays
+- [ ] a task stays in the daily note
+## 📚 What I Learned
+- Header-only reads are cheap
+  - nested detail stays behind
+## 🗓 Schedule
+- 10:00 standup
+"""
+
+
+def test_extract_sections_keeps_top_level_bullets_only():
+    assert extract_sections(DAILY.splitlines()) == {
+        '💡 重要なアイデア': ['Batch the inbox on Wednesdays'],
+        '📝 学んだこと': ['Header-only reads are cheap'],
+    }
+
+
+def test_run_extracts_and_isolates_a_failing_stage(tmp_path, monkeypatch):
+    today = date(2025, 11, 4)
+    daily = tmp_path / '02_Daily/2025/2025-11/2025-11-04/2025-11-04-Daily.md'
+    daily.parent.mkdir(parents=True)
+    daily.write_text(DAILY, encoding='utf-8')
+
+    def broken(batch, notes):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(nightly_batch, 'STAGES', (('inbox', broken),) + nightly_batch.STAGES[2:3])
+    reports = run(NightlyBatch(today, tmp_path))
+    assert [(report.name, report.failed) for report in reports] == [('walk', 0), ('inbox', 1), ('extract', 0)]
+    assert reports[1].warnings == ['Failed stage inbox: boom']
+    extract = (tmp_path / '01_Inbox/2025-11-04-Nightly-Extract.md').read_text(encoding='utf-8')
+    assert '- Batch the inbox on Wednesdays ([[2025-11-04-Daily]])' in extract
+    assert 'standup' not in extract and 'a task' not in extract
+    # A second run finds the extract up to date and leaves it alone.
+    assert run(NightlyBatch(today, tmp_path))[-1].summary.endswith('already in 01_Inbox/2025-11-04-Nightly-Extract.md')
+
+
+def test_fill_renders_open_reviews_unless_asked_to_skip_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(nightly_batch.fill, 'BASE_DIR', tmp_path)
+    today = date(2025, 1, 15)
+    review = '02_Daily/Weekly-Reviews/2025/2025-W03.md'
+    (tmp_path / review).parent.mkdir(parents=True)
+    (tmp_path / review).write_text('')
+    notes = [(review, 0, 0)]
+    batch = NightlyBatch(today, tmp_path, skip_open_reviews=True)
+    _, summary, failed, warnings = stage_fill(batch, notes)
+    assert (summary, failed) == ('0 filled, 0 without a generator, 1 open reviews skipped', 0)
+    assert warnings == [f'Skipped {review}: period ends 2025-01-19']
+    assert (tmp_path / review).read_text() == ''
+    _, summary, failed, warnings = stage_fill(NightlyBatch(today, tmp_path), notes)
+    assert (summary, failed, warnings) == ('1 filled, 0 without a generator', 0, [])
+    assert (tmp_path / review).stat().st_size > 0
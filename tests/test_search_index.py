@@ -0,0 +1,35 @@
+from search_index import SearchBuilder, tokenize
+
+
+def test_tokenize_splits_cjk_into_bigrams():
+    assert tokenize('Prompting 生成AI') == ['prompt', '生成', 'ai']
+    assert tokenize('議事録') == ['議事', '事録']
+
+
+def test_search_ranks_and_updates_incrementally(tmp_path):
+    vault = tmp_path / 'vault'
+    notes = {
+        'rag.md': 'RAG retrieval with a vector database. Retrieval quality matters.',
+        'prompt.md': 'Prompt engineering basics for retrieval.',
+        'meeting.md': '週次ミーティングの議事録',
+        'other.md': 'Nothing relevant here.',
+    }
+    for rel, text in notes.items():
+        (vault / rel).parent.mkdir(parents=True, exist_ok=True)
+        (vault / rel).write_text(text, encoding='utf-8')
+    builder = SearchBuilder(vault, tmp_path / 'search')
+    assert builder.update() == (4, 0)
+    assert builder.update() == (0, 0)
+    index = builder.open()
+    try:
+        hits = index.search('retrieval vector', limit=10)
+        assert [hit.path for hit in hits] == ['rag.md', 'prompt.md']
+        # Pruned top-k agrees with the exhaustive ranking.
+        assert [hit.path for hit in index.search('retrieval vector', limit=1)] == ['rag.md']
+        assert [hit.path for hit in index.search('議事録')] == ['meeting.md']
+        assert index.search('absent') == []
+        assert index.search('retrieval', limit=0) == []
+    finally:
+        index.close()
+    (vault / 'other.md').unlink()
+    assert builder.update() == (0, 1)
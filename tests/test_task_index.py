@@ -0,0 +1,41 @@
+from datetime import date
+
+from task_index import TaskIndex, parse_tasks
+
+
+def test_parse_tasks_skips_frontmatter_and_code():
+    lines = [
+        '---',
+        'tags: [daily]',
+        '---',
+        '- [ ] Draft outline #writing 📅 2025-11-04',
+        '```',
+        '- [ ] example inside a code block',
+        '```',
+        '- [x] Send invoice [due:: 2025-11-01] #work/billing',
+    ]
+    tasks = list(parse_tasks('02_Daily/day.md', lines))
+    assert [(task.line, task.done, task.due, task.tags) for task in tasks] == [
+        (4, False, '2025-11-04', ('writing',)),
+        (8, True, '2025-11-01', ('work/billing',)),
+    ]
+
+
+def test_update_reindexes_only_changed_notes(tmp_path):
+    (tmp_path / 'A').mkdir()
+    (tmp_path / 'B').mkdir()
+    (tmp_path / 'A/one.md').write_text('- [ ] first #work\n', encoding='utf-8')
+    (tmp_path / 'B/two.md').write_text('- [ ] second 📅 2025-01-02\n', encoding='utf-8')
+    index = TaskIndex(tmp_path / 'tasks.sqlite3', tmp_path)
+    try:
+        assert index.update() == (2, 0)
+        assert index.update() == (0, 0)
+        (tmp_path / 'A/one.md').write_text('- [x] first #work/deep\n- [ ] third\n', encoding='utf-8')
+        (tmp_path / 'B/two.md').unlink()
+        assert index.update() == (1, 1)
+        assert [task.text for task in index.query(tag='work')] == ['first #work/deep']
+        assert [task.text for task in index.query(done=False, prefix='A')] == ['third']
+        assert index.query(due_before=date(2026, 1, 1)) == []
+        assert index.counts() == {'tasks': 2, 'done': 1, 'open': 1}
+    finally:
+        index.close()